@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    # 여러 앱이 공유하는 미들웨어, 스로틀, 관리 명령어
+    name = 'api.core'
+
+    def ready(self):
+        from . import checks  # noqa: F401 (시스템 검사 등록)
@@ -0,0 +1,25 @@
+"""
+감사 로그
+
+요청 스레드에서는 기록만 큐에 넣고, 백그라운드 작업이 모아서
+'api.audit' 로거에 JSON 한 줄씩 남깁니다.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from .tasks import background
+
+logger = logging.getLogger('api.audit')
+
+
+def write_audit_records(records):
+    for record in records:
+        logger.info(json.dumps(record, default=str, ensure_ascii=False))
+
+
+def audit(event, **fields):
+    background.submit_batch(write_audit_records, {
+        'at': datetime.now(timezone.utc).isoformat(),
+        'event': event,
+        **fields,
+    })
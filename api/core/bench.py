@@ -0,0 +1,388 @@
+"""
+HTTP 벤치마크 도구
+
+모든 users/posts 엔드포인트를 실제 HTTP 로 호출해 처리량과 지연 시간
+백분위를 측정하고, JSON 기준값(baseline)과 비교합니다.
+`python manage.py bench` 로 실행합니다.
+"""
+import base64
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlencode
+
+
+def percentile(sorted_values, p):
+    """정렬된 값 목록의 p 백분위 (선형 보간)"""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100
+    lower = math.floor(k)
+    upper = math.ceil(k)
+    if lower == upper:
+        return sorted_values[int(k)]
+    return sorted_values[lower] * (upper - k) \
+        + sorted_values[upper] * (k - lower)
+
+
+def summarize(name, latencies, statuses, elapsed, expected_status):
+    latencies = sorted(latencies)
+    ok = sum(1 for status in statuses if status == expected_status)
+    return {
+        'endpoint': name,
+        'requests': len(statuses),
+        'errors': len(statuses) - ok,
+        'throttled': statuses.count(429),
+        'throughput': round(len(statuses) / elapsed, 2) if elapsed else 0,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def compare(baseline, current, tolerance):
+    """
+    기준값 대비 p95 가 tolerance 비율 이상 느려졌거나, 처리량이
+    tolerance 비율 이상 줄어든 엔드포인트 목록 반환
+    """
+    baseline = {item['endpoint']: item for item in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        base = baseline.get(result['endpoint'])
+        if base is None:
+            continue
+        if base['p95_ms'] and result['p95_ms'] is not None \
+                and result['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{result['endpoint']}: p95 {base['p95_ms']}ms -> "
+                f"{result['p95_ms']}ms"
+            )
+        if base['throughput'] and \
+                result['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(
+                f"{result['endpoint']}: throughput {base['throughput']}/s "
+                f"-> {result['throughput']}/s"
+            )
+    return regressions
+
+
+class HTTPClient:
+    """스레드별 keep-alive 연결을 재사용하는 최소 JSON HTTP 클라이언트"""
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.https = parts.scheme == 'https'
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self.https \
+                else http.client.HTTPConnection
+            conn = self._local.conn = conn_class(self.host, self.port,
+                                                 timeout=self.timeout)
+        return conn
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+        conn = self._connection()
+        try:
+            conn.request(method, self.prefix + path, payload, headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+        if response.getheader('Connection', '').lower() == 'close':
+            conn.close()
+            self._local.conn = None
+        if data and response.getheader('Content-Type', '').startswith(
+                'application/json'):
+            return response.status, json.loads(data)
+        return response.status, None
+
+
+class BenchmarkRunner:
+    """
+    엔드포인트를 정해진 순서로 실행합니다. 앞 단계에서 만든 사용자,
+    토큰, 게시글을 뒤 단계(로그아웃, 삭제 등)가 소비하므로 순서가
+    고정되어 있습니다.
+    예상과 다른 응답(429 등)이 하나라도 있으면 측정값이 그 응답의 지연
+    시간이 되므로 RuntimeError 로 중단합니다. 모든 로그인이 한 IP 에서
+    오므로 대상 서버는 THROTTLES_DISABLED=1 로 실행해야 합니다.
+    """
+    # 측정 이름 -> URL 이름 (api/users/urls.py, api/posts/urls.py 의 모든
+    # 라우트가 포함되어야 함)
+    ROUTES = {
+        'users.signup': 'signup',
+        'users.login': 'login',
+        'users.refresh': 'refresh',
+        'posts.create': 'posts',
+        'posts.list': 'posts',
+        'posts.list_by_author': 'posts',
+        'posts.list_by_tags': 'posts',
+        'posts.detail': 'post-detail',
+        'posts.batch': 'post-batch',
+        'posts.trending': 'post-trending',
+        'posts.tags': 'post-tag-counts',
+        'posts.update': 'post-detail',
+        'posts.revisions': 'post-revisions',
+        'posts.revision': 'post-revision',
+        'posts.delete': 'post-detail',
+        'users.logout': 'logout',
+        'users.logout_all': 'logout-all',
+    }
+    ENDPOINTS = list(ROUTES)
+    # 수정 이력이 있어야 조회할 수 있는 엔드포인트
+    REVISION_ENDPOINTS = {'posts.revisions', 'posts.revision'}
+    TAGS = [f'bench-{i}' for i in range(10)]
+
+    def __init__(self, client, requests=200, concurrency=8,
+                 dataset_posts=0, seed=0, log=print):
+        self.client = client
+        self.requests = requests
+        self.concurrency = concurrency
+        self.dataset_posts = dataset_posts
+        self.random = random.Random(seed)
+        self.log = log
+        self.run_id = f'{int(time.time())}{self.random.randrange(10**6)}'
+        self.users = []
+        self.sessions = []
+        self.post_ids = []
+
+    def _measure(self, name, expected_status, calls):
+        """calls: 인자 없는 함수 목록. 각 함수는 (status, body) 반환"""
+        def timed(call):
+            start = time.perf_counter()
+            try:
+                status, body = call()
+            except (http.client.HTTPException, OSError):
+                status, body = 0, None
+            return time.perf_counter() - start, status, body
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            outcomes = list(executor.map(timed, calls))
+        elapsed = time.perf_counter() - start
+
+        statuses = [item[1] for item in outcomes]
+        result = summarize(name, [item[0] for item in outcomes], statuses,
+                           elapsed, expected_status)
+        self.log(result)
+        if result['errors']:
+            unexpected = Counter(status for status in statuses
+                                 if status != expected_status)
+            hint = ' (대상 서버를 THROTTLES_DISABLED=1 로 실행하세요)' \
+                if 429 in unexpected else ''
+            raise RuntimeError(
+                f'{name}: 예상({expected_status})과 다른 응답 '
+                f'{dict(unexpected)}{hint}'
+            )
+        return result, [item[2] for item in outcomes]
+
+    def _pick(self, items):
+        return items[self.random.randrange(len(items))]
+
+    def run(self, endpoints=None):
+        endpoints = set(endpoints or self.ENDPOINTS)
+        results = []
+        n = self.requests
+        request = self.client.request
+
+        # 회원가입 -> 로그인 순서로 이후 단계에서 쓸 세션을 만듦
+        self.users = [{'email': f'bench-{self.run_id}-{i}@example.com',
+                       'password': f'bench-password-{i}'}
+                      for i in range(n)]
+        result, _ = self._measure('users.signup', 201, [
+            (lambda user=user: request('POST', '/users/signup', user))
+            for user in self.users
+        ])
+        results.append(result)
+
+        result, bodies = self._measure('users.login', 200, [
+            (lambda user=user: request('POST', '/users/login', user))
+            for user in self.users
+        ])
+        results.append(result)
+        self.sessions = bodies
+
+        if 'users.refresh' in endpoints:
+            # 갱신하면 이전 리프레시 토큰은 삭제되므로 세션마다 한 번씩
+            # 갱신하고 이후 단계(로그아웃)는 새 토큰을 사용
+            result, self.sessions = self._measure('users.refresh', 200, [
+                (lambda s=s: request('POST', '/users/refresh',
+                                     {'refresh_token': s['refresh_token']}))
+                for s in self.sessions
+            ])
+            results.append(result)
+
+        if self.dataset_posts:
+            self.log(f'데이터셋 게시글 {self.dataset_posts}개 생성 중')
+            self._measure('setup.posts', 201, [
+                self._create_post_call(i)
+                for i in range(self.dataset_posts)
+            ])
+
+        result, bodies = self._measure('posts.create', 201, [
+            self._create_post_call(i) for i in range(n)
+        ])
+        results.append(result)
+        self.post_ids = [body['id'] for body in bodies if body]
+
+        if 'posts.list' in endpoints:
+            _, first_page = request('GET', '/posts/')
+            pages = max(1, min(10, math.ceil(
+                (first_page or {}).get('count', 0) / 10)))
+            result, _ = self._measure('posts.list', 200, [
+                (lambda page=page: request(
+                    'GET', '/posts/?' + urlencode({'page': page})))
+                for page in (self.random.randint(1, pages)
+                             for _ in range(n))
+            ])
+            results.append(result)
+
+        if 'posts.list_by_author' in endpoints:
+            result, _ = self._measure('posts.list_by_author', 200, [
+                (lambda author_id=author_id: request(
+                    'GET', '/posts/?' + urlencode({'author_id': author_id})))
+                for author_id in (
+                    self._user_id(self._pick(self.sessions))
+                    for _ in range(n)
+                )
+            ])
+            results.append(result)
+
+        if 'posts.list_by_tags' in endpoints:
+            result, _ = self._measure('posts.list_by_tags', 200, [
+                (lambda tag=tag: request(
+                    'GET', '/posts/?' + urlencode({'tags': tag})))
+                for tag in (self._pick(self.TAGS) for _ in range(n))
+            ])
+            results.append(result)
+
+        if self.post_ids and 'posts.detail' in endpoints:
+            result, _ = self._measure('posts.detail', 200, [
+                (lambda post_id=post_id: request('GET',
+                                                 f'/posts/{post_id}'))
+                for post_id in (self._pick(self.post_ids)
+                                for _ in range(n))
+            ])
+            results.append(result)
+
+        if self.post_ids and 'posts.batch' in endpoints:
+            result, _ = self._measure('posts.batch', 200, [
+                (lambda ids=ids: request(
+                    'GET', '/posts/batch?' + urlencode({'ids': ids})))
+                for ids in (','.join(self._pick(self.post_ids)
+                                     for _ in range(10))
+                            for _ in range(n))
+            ])
+            results.append(result)
+
+        for name, path in (('posts.trending', '/posts/trending'),
+                           ('posts.tags', '/posts/tags')):
+            if name in endpoints:
+                result, _ = self._measure(name, 200, [
+                    (lambda path=path: request('GET', path))
+                    for _ in range(n)
+                ])
+                results.append(result)
+
+        if self.post_ids and ('posts.update' in endpoints
+                              or endpoints & self.REVISION_ENDPOINTS):
+            # 같은 게시글을 동시에 수정하면 409 가 나므로 게시글마다 한 번씩
+            # (수정 이력 조회에 필요한 리비전 1 도 여기서 생김)
+            result, _ = self._measure('posts.update', 200, [
+                (lambda post_id=post_id, s=self._pick(self.sessions):
+                    request('PUT', f'/posts/{post_id}',
+                            {'title': 'bench title updated'},
+                            token=s['access_token']))
+                for post_id in self.post_ids
+            ])
+            results.append(result)
+
+        if self.post_ids and 'posts.revisions' in endpoints:
+            result, _ = self._measure('posts.revisions', 200, [
+                (lambda post_id=post_id: request(
+                    'GET', f'/posts/{post_id}/revisions'))
+                for post_id in (self._pick(self.post_ids)
+                                for _ in range(n))
+            ])
+            results.append(result)
+
+        if self.post_ids and 'posts.revision' in endpoints:
+            result, _ = self._measure('posts.revision', 200, [
+                (lambda post_id=post_id: request(
+                    'GET', f'/posts/{post_id}/revisions/1'))
+                for post_id in (self._pick(self.post_ids)
+                                for _ in range(n))
+            ])
+            results.append(result)
+
+        # 이후 단계는 앞에서 만든 자원을 하나씩 소비
+        if 'posts.delete' in endpoints:
+            result, _ = self._measure('posts.delete', 204, [
+                (lambda post_id=post_id, s=self._pick(self.sessions):
+                    request('DELETE', f'/posts/{post_id}',
+                            token=s['access_token']))
+                for post_id in self.post_ids
+            ])
+            results.append(result)
+
+        if 'users.logout' in endpoints:
+            result, _ = self._measure('users.logout', 200, [
+                (lambda s=s: request('POST', '/users/logout',
+                                     {'refresh_token': s['refresh_token']}))
+                for s in self.sessions
+            ])
+            results.append(result)
+
+        if 'users.logout_all' in endpoints:
+            result, _ = self._measure('users.logout_all', 200, [
+                (lambda s=s: request('POST', '/users/logout-all',
+                                     token=s['access_token']))
+                for s in self.sessions
+            ])
+            results.append(result)
+
+        return {
+            'run_id': self.run_id,
+            'requests': self.requests,
+            'concurrency': self.concurrency,
+            'dataset_posts': self.dataset_posts,
+            'results': [result for result in results
+                        if result['endpoint'] in endpoints],
+        }
+
+    def _create_post_call(self, i):
+        session = self.sessions[i % len(self.sessions)]
+        return lambda: self.client.request(
+            'POST', '/posts/',
+            {'title': f'bench title {i}',
+             'content': 'bench content ' * self.random.randint(1, 50),
+             'tags': [self.TAGS[i % len(self.TAGS)]]},
+            token=session['access_token']
+        )
+
+    @staticmethod
+    def _user_id(session):
+        """access_token 페이로드에서 user_id 추출 (서명 검증 없음)"""
+        payload = session['access_token'].split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))['user_id']
@@ -0,0 +1,101 @@
+"""
+엔드포인트별 DB 호출 예산
+
+view 클래스에 method 별 예산을 선언합니다.
+
+    class PostAPIView(APIView):
+        query_budgets = {
+            'GET': QueryBudget(mysql=0, mongo=2),
+        }
+
+테스트에서는 assert_query_budget 으로, DEBUG 환경에서는
+QueryBudgetMiddleware 로 초과 여부를 확인합니다.
+"""
+import logging
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+budget_violations = metrics.registry.register(metrics.Counter(
+    'query_budget_violations_total', 'DB 호출 예산 초과 요청 수',
+    ('view', 'method', 'store')
+))
+
+
+class QueryBudget:
+    __slots__ = ('mysql', 'mongo')
+
+    def __init__(self, mysql=0, mongo=0):
+        self.mysql = mysql
+        self.mongo = mongo
+
+    def violations(self, stats):
+        """예산을 넘긴 저장소별 (이름, 사용량, 예산) 목록"""
+        result = []
+        if stats.mysql_count > self.mysql:
+            result.append(('mysql', stats.mysql_count, self.mysql))
+        if stats.mongo_count > self.mongo:
+            result.append(('mongo', stats.mongo_count, self.mongo))
+        return result
+
+    def __repr__(self):
+        return f'QueryBudget(mysql={self.mysql}, mongo={self.mongo})'
+
+
+def get_query_budget(view_class, method):
+    budgets = getattr(view_class, 'query_budgets', None) or {}
+    return budgets.get(method.upper())
+
+
+@contextmanager
+def assert_query_budget(testcase, view_class, method):
+    """
+    블록 안의 DB 호출이 view_class 에 선언된 method 예산 이내인지 검사
+
+        with assert_query_budget(self, PostAPIView, 'GET'):
+            self.client.get(self.post_url)
+    """
+    budget = get_query_budget(view_class, method)
+    testcase.assertIsNotNone(
+        budget, f'{view_class.__name__}.{method} 에 예산이 선언되지 않았습니다.'
+    )
+    with metrics.record_queries() as stats:
+        yield stats
+    testcase.assertFalse(
+        budget.violations(stats),
+        f'{view_class.__name__}.{method} 예산 초과: '
+        f'mysql={stats.mysql_count}/{budget.mysql}, '
+        f'mongo={stats.mongo_count}/{budget.mongo}'
+    )
+
+
+class QueryBudgetMiddleware:
+    """
+    선언된 예산을 넘긴 요청을 경고 로그로 기록 (DEBUG 또는
+    QUERY_BUDGET_ENFORCE 일 때만 활성화)
+    """
+    def __init__(self, get_response):
+        if not (settings.DEBUG or getattr(settings, 'QUERY_BUDGET_ENFORCE',
+                                          False)):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with metrics.record_queries() as stats:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view_class = getattr(match.func, 'view_class', None) \
+            if match else None
+        budget = get_query_budget(view_class, request.method) \
+            if view_class else None
+        if budget is not None:
+            for store, used, allowed in budget.violations(stats):
+                budget_violations.inc((match.view_name, request.method,
+                                       store))
+                logger.warning('%s %s %s 예산 초과: %d/%d', match.view_name,
+                               request.method, store, used, allowed)
+        return response
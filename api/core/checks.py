@@ -0,0 +1,51 @@
+"""
+기동 시 설정 검사
+
+manage.py 명령(migrate, runserver 등)은 시스템 검사로, gunicorn 은 워밍업
+(prime_application)에서 실행합니다.
+"""
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+
+# 프로세스 안에서만 보이는(또는 저장하지 않는) 캐시 백엔드
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def shared_cache_features():
+    """워커 간에 공유되는 default 캐시가 필요한 기능 목록"""
+    # 토큰 세대: 다른 워커도 로그아웃/세션 무효화를 바로 반영해야 함
+    features = ['토큰 세대']
+    # 스로틀 카운터: 워커별로 세면 한도가 워커 수만큼 늘어남
+    rates = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})
+    if any(rate is not None for rate in rates.values()):
+        features.append('스로틀 카운터')
+    return features
+
+
+def require_shared_cache(features=None):
+    """
+    default 캐시가 프로세스 로컬이면 ImproperlyConfigured
+    (features 를 주지 않으면 shared_cache_features())
+    """
+    features = shared_cache_features() if features is None else features
+    backend = settings.CACHES['default']['BACKEND']
+    if features and backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f'{", ".join(features)} 에는 워커 간에 공유되는 캐시가 '
+            f'필요합니다. (현재 {backend})'
+        )
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    try:
+        require_shared_cache()
+    except ImproperlyConfigured as error:
+        return [checks.Error(str(error), hint='CACHES 를 Redis 등 공유 캐시로 '
+                                              '설정하세요.',
+                             id='core.E001')]
+    return []
@@ -0,0 +1,219 @@
+"""
+적응형 동시 처리 제한 (load shedding)
+
+view 에 선언한 부하 등급(load_classes)별로 처리 중인 요청 수와 최근 지연
+시간을 추적하고, AIMD 로 동시 처리 한도를 조정합니다.
+
+- 지연 시간이 target_ms 를 넘거나 5xx 가 나면 한도를 backoff 배로 감소
+  (cooldown 동안 한 번만)
+- 한도를 거의 다 쓰면서 빠르게 처리되면 한도를 조금씩 증가
+- 한도를 넘는 요청은 view 실행 전에 바로 503 + Retry-After 로 응답
+
+등급별 share 는 프로세스 전체 한도(CONCURRENCY_GLOBAL_LIMIT) 중 해당
+등급이 사용할 수 있는 비율입니다. bulk(일괄 조회) 처럼 share 가 작은
+등급은 부하가 오르면 먼저 거절되어 가벼운 조회가 우선 처리됩니다.
+한도는 프로세스(워커)별로 적용됩니다.
+
+CONCURRENCY_QUEUE_TIME_HEADER 를 설정하면 지연 시간을 프록시가 요청을 받은
+시각(X-Request-Start)부터 재므로 gunicorn 에서 스레드를 기다린 시간도
+포함됩니다. 클라이언트가 보낸 값을 프록시가 덮어쓸 때만 설정해야 합니다.
+
+    class PostAPIView(APIView):
+        load_classes = {'GET': 'post_read', 'POST': 'post_write'}
+"""
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
+from . import metrics
+
+shed_requests = metrics.registry.register(metrics.Counter(
+    'load_shed_requests_total', '동시 처리 한도 초과로 거절한 요청 수',
+    ('load_class', 'reason')
+))
+
+
+class AIMDLimiter:
+    def __init__(self, initial=8, minimum=1, maximum=64, target_ms=500,
+                 backoff=0.9, cooldown=1.0, share=1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target_ms / 1000
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.share = share
+        self.inflight = 0
+        self.latency = None
+        self._last_decrease = float('-inf')
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.inflight >= int(self.limit):
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self, latency, failed=False, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            saturated = self.inflight >= int(self.limit) * 0.8
+            self.inflight -= 1
+            self.latency = latency if self.latency is None \
+                else self.latency * 0.8 + latency * 0.2
+
+            if failed or latency > self.target:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._last_decrease = now
+            elif saturated:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def retry_after(self):
+        """최근 지연 시간 기준 재시도 대기(초)"""
+        return max(1, math.ceil(self.latency or 0))
+
+
+class ConcurrencyLimiter:
+    """등급별 AIMDLimiter 와 프로세스 전체 처리 중 요청 수"""
+    def __init__(self, classes, global_limit):
+        self.limiters = {name: AIMDLimiter(**options)
+                         for name, options in classes.items()}
+        self.global_limit = global_limit
+        self.inflight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, load_class):
+        """허용되면 None, 거절되면 사유 반환"""
+        limiter = self.limiters[load_class]
+        with self._lock:
+            if self.inflight >= self.global_limit * limiter.share:
+                return 'priority'
+            self.inflight += 1
+        if not limiter.try_acquire():
+            with self._lock:
+                self.inflight -= 1
+            return 'limit'
+        return None
+
+    def release(self, load_class, latency, failed=False):
+        self.limiters[load_class].release(latency, failed)
+        with self._lock:
+            self.inflight -= 1
+
+    def snapshot(self):
+        return {
+            name: {
+                'limit': limiter.limit,
+                'inflight': limiter.inflight,
+                'latency': limiter.latency,
+            } for name, limiter in self.limiters.items()
+        }
+
+
+def queue_time(request, now=None):
+    """
+    X-Request-Start(t=초/밀리초/마이크로초)부터 지금까지 기다린 시간(초)
+    헤더가 없거나 해석할 수 없거나, 미래이거나
+    CONCURRENCY_MAX_QUEUE_SECONDS 보다 길면 0
+    """
+    header = getattr(settings, 'CONCURRENCY_QUEUE_TIME_HEADER', None)
+    value = request.META.get(header) if header else None
+    if not value:
+        return 0.0
+    try:
+        started = float(value.strip().removeprefix('t='))
+    except ValueError:
+        return 0.0
+    # nginx 는 초(소수), 일부 로드 밸런서는 밀리초/마이크로초 정수로 보냄
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    now = time.time() if now is None else now
+    waited = now - started
+    if not 0 < waited <= getattr(settings, 'CONCURRENCY_MAX_QUEUE_SECONDS',
+                                 30):
+        return 0.0
+    return waited
+
+
+def get_load_class(view_class, method):
+    classes = getattr(view_class, 'load_classes', None) or {}
+    return classes.get(method.upper())
+
+
+_limiter = None
+
+
+def get_concurrency_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = ConcurrencyLimiter(settings.CONCURRENCY_LIMITS,
+                                      settings.CONCURRENCY_GLOBAL_LIMIT)
+    return _limiter
+
+
+@metrics.registry.register_collector
+def collect_concurrency():
+    if _limiter is None:
+        return
+    snapshot = _limiter.snapshot()
+    for name, doc, key in (
+            ('concurrency_limit', '등급별 현재 동시 처리 한도', 'limit'),
+            ('concurrency_inflight', '등급별 처리 중인 요청 수', 'inflight'),
+            ('concurrency_latency_seconds', '등급별 최근 지연 시간(EWMA)',
+             'latency')):
+        yield f'# HELP {name} {doc}'
+        yield f'# TYPE {name} gauge'
+        for load_class, values in snapshot.items():
+            if values[key] is not None:
+                yield f'{name}{{load_class="{load_class}"}} {values[key]:g}'
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    load_classes 를 선언한 view 에만 적용
+    CONCURRENCY_LIMIT_ENABLED 가 False 이면 미들웨어 체인에서 제외됩니다.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'CONCURRENCY_LIMIT_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        load_class = getattr(request, '_load_class', None)
+        if load_class is not None:
+            get_concurrency_limiter().release(
+                load_class, time.perf_counter() - request._load_started,
+                failed=response.status_code >= 500
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        load_class = get_load_class(view_class, request.method) \
+            if view_class else None
+        if load_class is None:
+            return None
+
+        limiter = get_concurrency_limiter()
+        reason = limiter.try_acquire(load_class)
+        if reason is not None:
+            shed_requests.inc((load_class, reason))
+            response = JsonResponse(
+                {'msg': '요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.'},
+                status=503, json_dumps_params={'ensure_ascii': False}
+            )
+            response['Retry-After'] = str(
+                limiter.limiters[load_class].retry_after()
+            )
+            return response
+
+        request._load_class = load_class
+        request._load_started = time.perf_counter() - queue_time(request)
+        return None
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from api.core.bench import BenchmarkRunner, HTTPClient, compare
+
+
+class Command(BaseCommand):
+    help = ('실행 중인 서버의 모든 users/posts 엔드포인트를 호출해 처리량과 '
+            'p50/p95/p99 지연 시간을 측정합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://localhost:8000',
+                            help='대상 서버 주소')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='엔드포인트별 요청 수 (생성되는 사용자 수)')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='동시 요청 수')
+        parser.add_argument('--dataset-posts', type=int, default=0,
+                            help='측정 전에 추가로 생성할 게시글 수')
+        parser.add_argument('--endpoints', nargs='*', default=None,
+                            choices=BenchmarkRunner.ENDPOINTS,
+                            help='측정할 엔드포인트 (기본: 전체)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='요청 대상 선택에 사용할 난수 시드')
+        parser.add_argument('--save', default=None,
+                            help='결과를 저장할 JSON 경로')
+        parser.add_argument('--baseline', default=None,
+                            help='비교할 기준 JSON 경로')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='허용 성능 저하 비율 (기본: 0.2 = 20%%)')
+
+    def handle(self, *args, **options):
+        runner = BenchmarkRunner(
+            HTTPClient(options['base_url']),
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            dataset_posts=options['dataset_posts'],
+            seed=options['seed'],
+            log=lambda message: self.stderr.write(str(message)),
+        )
+        try:
+            report = runner.run(options['endpoints'])
+        except (RuntimeError, OSError) as e:
+            raise CommandError(f'벤치마크 실행 실패: {e}')
+
+        self.stdout.write(self._format_table(report['results']))
+        if options['save']:
+            path = Path(options['save'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(f'결과를 {path} 에 저장했습니다.')
+
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())
+            regressions = compare(baseline, report, options['tolerance'])
+            if regressions:
+                raise CommandError('성능 저하 감지:\n' +
+                                   '\n'.join(regressions))
+            self.stdout.write('기준값 대비 성능 저하가 없습니다.')
+
+    @staticmethod
+    def _format_table(results):
+        columns = ['endpoint', 'requests', 'errors', 'throttled',
+                   'throughput', 'p50_ms', 'p95_ms', 'p99_ms']
+        rows = [columns] + [[str(result[column]) for column in columns]
+                            for result in results]
+        widths = [max(len(row[i]) for row in rows)
+                  for i in range(len(columns))]
+        return '\n'.join('  '.join(value.ljust(width)
+                                   for value, width in zip(row, widths))
+                         for row in rows)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from backend.swagger import write_schema
+
+
+class Command(BaseCommand):
+    help = ('OpenAPI 스키마를 JSON/YAML 파일로 생성합니다. '
+            '이미지 빌드/배포 때마다 실행해 항상 현재 코드로 다시 만듭니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir',
+                            default=str(settings.OPENAPI_SCHEMA_DIR),
+                            help='출력 디렉터리 (기본: OPENAPI_SCHEMA_DIR)')
+
+    def handle(self, *args, **options):
+        _, meta = write_schema(options['output_dir'])
+        self.stdout.write(
+            f'OpenAPI 스키마를 생성했습니다: {options["output_dir"]} '
+            f'(json etag={meta["etags"]["json"][:12]})'
+        )
@@ -0,0 +1,125 @@
+import math
+import random
+import time
+from bisect import bisect
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import accumulate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from api.posts.documents import Post
+from api.users.models import User
+
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do '
+         'eiusmod tempor incididunt ut labore et dolore magna aliqua '
+         '게시글 내용 테스트 데이터 성능 측정 서버 사용자 댓글 공지').split()
+
+
+class Command(BaseCommand):
+    help = ('성능 측정용 사용자/게시글 데이터를 생성합니다. '
+            '같은 --seed 로 실행하면 같은 데이터가 생성됩니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000,
+                            help='생성할 사용자 수 (0: 기존 사용자 사용)')
+        parser.add_argument('--posts', type=int, default=100000,
+                            help='생성할 게시글 수')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='난수 시드')
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='insert_many 한 번에 넣을 게시글 수')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='병렬로 생성/삽입할 배치 수')
+        parser.add_argument('--zipf-s', type=float, default=1.1,
+                            help='작성자별 게시글 수 Zipf 분포 지수')
+        parser.add_argument('--days', type=int, default=365,
+                            help='created_at 분포 범위(일)')
+        parser.add_argument('--until', type=datetime.fromisoformat,
+                            default=None,
+                            help='created_at 의 기준 시각 (기본: 오늘 0시)')
+        parser.add_argument('--password', default='seed_password',
+                            help='생성되는 사용자의 비밀번호')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        author_ids = self.seed_users(options)
+        if not author_ids:
+            raise CommandError('게시글 작성자로 사용할 사용자가 없습니다.')
+        self.stdout.write(f'사용자 {len(author_ids)}명 준비 '
+                          f'({time.perf_counter() - start:.1f}s)')
+
+        start = time.perf_counter()
+        inserted = self.seed_posts(author_ids, options)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'게시글 {inserted}개 생성 ({elapsed:.1f}s, '
+                          f'{inserted / max(elapsed, 1e-9):.0f} docs/s)')
+
+    def seed_users(self, options):
+        prefix = f"seed{options['seed']}-"
+        if options['users']:
+            # PBKDF2 는 한 번만 계산해 모든 사용자가 같은 해시를 공유
+            password = make_password(options['password'])
+            User.objects.bulk_create(
+                (User(email=f'{prefix}{i}@example.com', password=password)
+                 for i in range(options['users'])),
+                batch_size=5000, ignore_conflicts=True
+            )
+            users = User.objects.filter(email__startswith=prefix)
+        else:
+            users = User.objects.all()
+        return list(users.order_by('id').values_list('id', flat=True))
+
+    def seed_posts(self, author_ids, options):
+        rng = random.Random(options['seed'])
+        # Zipf: 순위 k 작성자의 가중치 1/k^s, 순위는 시드로 섞어서 배정
+        ranked = list(author_ids)
+        rng.shuffle(ranked)
+        cum_weights = list(accumulate(
+            1 / (rank ** options['zipf_s'])
+            for rank in range(1, len(ranked) + 1)
+        ))
+        corpus = ' '.join(rng.choice(WORDS) for _ in range(20000))
+
+        total = options['posts']
+        batch_size = options['batch_size']
+        now = options['until'] or datetime.now().replace(
+            hour=0, minute=0, second=0, microsecond=0)
+        collection = Post._get_collection()
+
+        def insert_batch(index):
+            # 배치마다 독립된 시드를 사용해 병렬 실행 순서와 무관하게 결정적
+            batch_rng = random.Random(options['seed'] * 1_000_003 + index)
+            count = min(batch_size, total - index * batch_size)
+            documents = [
+                self._make_post(batch_rng, ranked, cum_weights, corpus,
+                                now, options['days'])
+                for _ in range(count)
+            ]
+            collection.insert_many(documents, ordered=False)
+            return count
+
+        batches = math.ceil(total / batch_size)
+        inserted = 0
+        with ThreadPoolExecutor(options['workers']) as executor:
+            for count in executor.map(insert_batch, range(batches)):
+                inserted += count
+        return inserted
+
+    @staticmethod
+    def _make_post(rng, ranked, cum_weights, corpus, now, days):
+        author_id = ranked[bisect(cum_weights,
+                                  rng.random() * cum_weights[-1])]
+        # 본문 길이: 중앙값 약 400자의 로그정규 분포
+        length = min(max(int(rng.lognormvariate(math.log(400), 1.0)), 20),
+                     len(corpus) - 1)
+        offset = rng.randrange(len(corpus) - length)
+        title_length = rng.randint(10, 60)
+        title_offset = rng.randrange(len(corpus) - title_length)
+        # 최근 게시글이 더 많도록 제곱 분포로 과거 시점 선택
+        age = timedelta(days=days * rng.random() ** 2)
+        return {
+            'title': corpus[title_offset:title_offset + title_length],
+            'content': corpus[offset:offset + length],
+            'author_id': author_id,
+            'created_at': now - age,
+        }
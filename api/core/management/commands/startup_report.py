@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api.core.startup import IMPORT_TARGETS, group_by_package, measure_startup
+
+
+class Command(BaseCommand):
+    help = ('새 인터프리터에서 앱을 로드하며 모듈별 import 비용을 측정합니다. '
+            '(워커 기동/콜드 스타트 분석용)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', default='urls',
+                            choices=sorted(IMPORT_TARGETS),
+                            help='측정 범위 (setup: django.setup, '
+                                 'wsgi: WSGI 앱 로드, urls: URLconf 까지)')
+        parser.add_argument('--sort', default='cumulative',
+                            choices=['self', 'cumulative'],
+                            help='정렬 기준')
+        parser.add_argument('--limit', type=int, default=30,
+                            help='출력할 모듈 수')
+        parser.add_argument('--group', action='store_true',
+                            help='최상위 패키지별 self 시간 합계로 출력')
+
+    def handle(self, *args, **options):
+        try:
+            wall_ms, modules = measure_startup(
+                options['target'], settings.SETTINGS_MODULE
+            )
+        except RuntimeError as e:
+            raise CommandError(f'기동 측정 실패: {e}')
+
+        total_ms = sum(module['self_ms'] for module in modules)
+        self.stdout.write(
+            f'target={options["target"]} wall={wall_ms:.1f}ms '
+            f'import={total_ms:.1f}ms modules={len(modules)}'
+        )
+
+        if options['group']:
+            self.stdout.write(f'{"self(ms)":>10}  package')
+            for package, self_ms in group_by_package(modules)[
+                    :options['limit']]:
+                self.stdout.write(f'{self_ms:>10.1f}  {package}')
+            return
+
+        key = f'{options["sort"]}_ms'
+        modules.sort(key=lambda module: module[key], reverse=True)
+        self.stdout.write(f'{"self(ms)":>10} {"cumul(ms)":>10}  module')
+        for module in modules[:options['limit']]:
+            self.stdout.write(
+                f'{module["self_ms"]:>10.1f} '
+                f'{module["cumulative_ms"]:>10.1f}  {module["module"]}'
+            )
@@ -0,0 +1,276 @@
+"""
+요청 단위 지표 수집
+
+- 지연 시간/응답 크기 히스토그램
+- MySQL 쿼리 수/시간 (Django execute_wrapper)
+- Mongo 커맨드 수/시간 (pymongo CommandListener)
+
+지표는 프로세스 메모리에 쌓이고 /metrics 에서 Prometheus text 형식으로
+노출됩니다. 이 모듈은 settings 에서도 import 되므로 Django 설정에
+의존하는 코드를 모듈 최상단에 두지 않습니다.
+"""
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"') \
+        .replace('\n', r'\n')
+
+
+def _format_labels(labelnames, labels, extra=()):
+    pairs = list(zip(labelnames, labels)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"'
+                          for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def collect(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} counter'
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield '{}{} {}'.format(
+                self.name, _format_labels(self.labelnames, labels),
+                _format_value(value)
+            )
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._lock = threading.Lock()
+        # labels -> [bucket counts..., sum, count]
+        self._values = {}
+
+    def observe(self, labels, value):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = \
+                    [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def collect(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        with self._lock:
+            values = [(labels, list(state))
+                      for labels, state in self._values.items()]
+        for labels, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield '{}_bucket{} {}'.format(
+                    self.name,
+                    _format_labels(self.labelnames, labels,
+                                   [('le', _format_value(bound))]),
+                    cumulative
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label_text} {_format_value(state[-2])}'
+            yield f'{self.name}_count{label_text} {state[-1]}'
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """
+        렌더링 시점에 Prometheus text 라인을 생성하는 함수 등록
+        (다른 모듈이 가진 카운터를 그대로 노출할 때 사용)
+        """
+        self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        for metric in self._metrics:
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+REQUEST_LABELS = ('view', 'method')
+
+request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', '요청 처리 시간',
+    REQUEST_LABELS
+))
+requests_total = registry.register(Counter(
+    'http_requests_total', '처리한 요청 수',
+    REQUEST_LABELS + ('status',)
+))
+response_size = registry.register(Histogram(
+    'http_response_size_bytes', '응답 본문 크기',
+    REQUEST_LABELS, buckets=SIZE_BUCKETS
+))
+mysql_queries = registry.register(Counter(
+    'http_mysql_queries_total', '요청 중 실행한 MySQL 쿼리 수',
+    REQUEST_LABELS
+))
+mysql_seconds = registry.register(Counter(
+    'http_mysql_seconds_total', '요청 중 MySQL 쿼리에 사용한 시간',
+    REQUEST_LABELS
+))
+mongo_commands = registry.register(Counter(
+    'http_mongo_commands_total', '요청 중 실행한 Mongo 커맨드 수',
+    REQUEST_LABELS
+))
+mongo_seconds = registry.register(Counter(
+    'http_mongo_seconds_total', '요청 중 Mongo 커맨드에 사용한 시간',
+    REQUEST_LABELS
+))
+
+
+class RequestStats:
+    """
+    현재 요청에서 실행된 DB 호출 집계
+    record_queries 가 중첩되면 바깥 집계에도 함께 더해집니다.
+    """
+    __slots__ = ('mysql_count', 'mysql_time', 'mongo_count', 'mongo_time',
+                 'parent')
+
+    def __init__(self, parent=None):
+        self.mysql_count = 0
+        self.mysql_time = 0.0
+        self.mongo_count = 0
+        self.mongo_time = 0.0
+        self.parent = parent
+
+    def add_mysql(self, elapsed):
+        stats = self
+        while stats is not None:
+            stats.mysql_count += 1
+            stats.mysql_time += elapsed
+            stats = stats.parent
+
+    def add_mongo(self, elapsed):
+        stats = self
+        while stats is not None:
+            stats.mongo_count += 1
+            stats.mongo_time += elapsed
+            stats = stats.parent
+
+
+current_request_stats = ContextVar('current_request_stats', default=None)
+
+
+def mysql_execute_wrapper(execute, sql, params, many, context):
+    """
+    connection.execute_wrapper 에 등록해 쿼리 수/시간을 집계
+    """
+    stats = current_request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_mysql(time.perf_counter() - start)
+
+
+@contextmanager
+def record_queries():
+    """
+    블록 안에서 실행된 MySQL 쿼리/Mongo 커맨드를 RequestStats 로 집계
+    (Mongo 는 MongoCommandMetrics 리스너가 등록되어 있어야 집계됩니다.)
+    """
+    from django.db import connections
+
+    stats = RequestStats(parent=current_request_stats.get())
+    token = current_request_stats.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                # 바깥 블록에서 이미 등록했다면 중복 집계되지 않도록 생략
+                if mysql_execute_wrapper not in connection.execute_wrappers:
+                    stack.enter_context(
+                        connection.execute_wrapper(mysql_execute_wrapper)
+                    )
+            yield stats
+    finally:
+        current_request_stats.reset(token)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    pymongo 커맨드 이벤트는 호출한 스레드에서 동기적으로 발생하므로
+    ContextVar 로 현재 요청에 귀속시킬 수 있습니다.
+    """
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.add_mongo(event.duration_micros / 1e6)
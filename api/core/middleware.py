@@ -0,0 +1,42 @@
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from . import metrics
+
+
+def resolve_view_name(request):
+    """URL 이름 기준 view 라벨 (라벨 종류가 URL 패턴 수로 제한되도록)"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+class MetricsMiddleware:
+    """
+    view/method 별 지연 시간, DB 호출 수/시간, 응답 크기 기록
+    METRICS_ENABLED 가 False 이면 미들웨어 체인에서 제외됩니다.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with metrics.record_queries() as stats:
+            response = self.get_response(request)
+
+        labels = (resolve_view_name(request), request.method)
+        metrics.request_duration.observe(labels,
+                                         time.perf_counter() - start)
+        metrics.requests_total.inc(labels + (str(response.status_code),))
+        if not response.streaming:
+            metrics.response_size.observe(labels, len(response.content))
+        if stats.mysql_count:
+            metrics.mysql_queries.inc(labels, stats.mysql_count)
+            metrics.mysql_seconds.inc(labels, stats.mysql_time)
+        if stats.mongo_count:
+            metrics.mongo_commands.inc(labels, stats.mongo_count)
+            metrics.mongo_seconds.inc(labels, stats.mongo_time)
+        return response
@@ -0,0 +1,197 @@
+"""
+요청 단위 온디맨드 프로파일링
+
+관리자(is_staff) 토큰으로 `X-Profile: 1` 헤더 또는 `?_profile=1` 쿼리를
+보내면 해당 요청만 cProfile 과 스택 샘플러로 실행합니다.
+
+- <PROFILE_DIR>/<id>.prof      : cProfile 통계 (snakeviz, pstats)
+- <PROFILE_DIR>/<id>.collapsed : collapsed stack (flamegraph.pl, speedscope)
+- <PROFILE_DIR>/<id>.json      : 단계별 시간 요약
+
+응답에는 X-Profile-Id 와 Server-Timing(auth, view, db, render) 헤더가
+추가되고, `X-Profile: inline` 이면 응답 본문 대신 요약 JSON 을 반환합니다.
+플래그가 없으면 헤더/쿼리 확인 외에는 아무 작업도 하지 않습니다.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
+from . import metrics
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_QUERY_PARAM = '_profile'
+# 프로파일을 요청하는 헤더 값 (inline 은 요약 JSON 으로 응답)
+PROFILE_VALUES = ('1', 'inline')
+
+# 단계 -> cProfile 에서 누적 시간을 읽어올 함수 (파일 경로 끝, 함수 이름)
+PHASE_FUNCTIONS = {
+    'auth': ('rest_framework/views.py', 'perform_authentication'),
+    'dispatch': ('rest_framework/views.py', 'dispatch'),
+    'render': ('rest_framework/response.py', 'rendered_content'),
+}
+
+
+class StackSampler:
+    """
+    대상 스레드의 콜 스택을 interval 초마다 수집해 collapsed stack 생성
+    cProfile 은 호출 관계를 한 단계만 기록하므로 flamegraph 용 전체
+    스택은 샘플링으로 얻습니다.
+    """
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='profile-sampler')
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:'
+                             f'{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n'
+                       for stack, count in self.samples.most_common())
+
+
+def phase_times(stats):
+    """pstats 에서 단계별 누적 시간(초) 추출"""
+    result = dict.fromkeys(PHASE_FUNCTIONS, 0.0)
+    for (filename, _, funcname), row in stats.stats.items():
+        for phase, (suffix, name) in PHASE_FUNCTIONS.items():
+            if funcname == name and filename.replace('\\', '/') \
+                    .endswith(suffix):
+                # row: (primitive calls, calls, tottime, cumtime, callers)
+                result[phase] = max(result[phase], row[3])
+    return result
+
+
+def is_profiling_requested(request):
+    """헤더 값이 1/inline 이거나 쿼리 파라미터가 1 일 때만 (0/false 는 제외)"""
+    return request.META.get(PROFILE_HEADER) in PROFILE_VALUES \
+        or request.GET.get(PROFILE_QUERY_PARAM) == '1'
+
+
+def is_staff_request(request):
+    """DRF 인증 전이므로 JWT 를 직접 검증해 관리자 여부 확인"""
+    from rest_framework.exceptions import APIException
+    from api.users.authentication import GenerationJWTAuthentication
+
+    try:
+        result = GenerationJWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return bool(result and result[0].is_staff)
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_profiling_requested(request) \
+                or not is_staff_request(request):
+            return self.get_response(request)
+        return self.profile(request)
+
+    def profile(self, request):
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with metrics.record_queries() as db_stats, \
+                StackSampler(threading.get_ident()) as sampler:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        total = time.perf_counter() - start
+
+        stats = pstats.Stats(profiler)
+        phases = phase_times(stats)
+        db = db_stats.mysql_time + db_stats.mongo_time
+        timings = {
+            'total': total,
+            'auth': phases['auth'],
+            # dispatch 에는 인증과 view 내부 DB 호출이 포함되어 있음
+            'view': max(phases['dispatch'] - phases['auth'] - db, 0.0),
+            'db': db,
+            'render': phases['render'],
+        }
+
+        profile_id = f'{time.strftime("%Y%m%d-%H%M%S")}-' \
+                     f'{uuid.uuid4().hex[:8]}'
+        summary = {
+            'id': profile_id,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'timings_ms': {name: round(value * 1000, 3)
+                           for name, value in timings.items()},
+            'mysql_queries': db_stats.mysql_count,
+            'mongo_commands': db_stats.mongo_count,
+            'files': self.save(profile_id, stats, sampler),
+        }
+        summary['files']['summary'] = str(
+            self.profile_dir() / f'{profile_id}.json'
+        )
+        (self.profile_dir() / f'{profile_id}.json').write_text(
+            json.dumps(summary, indent=2, ensure_ascii=False)
+        )
+
+        if request.META.get(PROFILE_HEADER) == 'inline':
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output) \
+                .sort_stats('cumulative').print_stats(30)
+            summary['top_functions'] = output.getvalue()
+            response = JsonResponse(summary,
+                                    json_dumps_params={'ensure_ascii': False})
+
+        response['X-Profile-Id'] = profile_id
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={value * 1000:.3f}'
+            for name, value in timings.items()
+        )
+        return response
+
+    @staticmethod
+    def profile_dir():
+        path = Path(getattr(settings, 'PROFILE_DIR',
+                            settings.BASE_DIR / 'profiles'))
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def save(self, profile_id, stats, sampler):
+        directory = self.profile_dir()
+        prof_path = directory / f'{profile_id}.prof'
+        collapsed_path = directory / f'{profile_id}.collapsed'
+        stats.dump_stats(prof_path)
+        collapsed_path.write_text(sampler.collapsed())
+        return {'prof': str(prof_path), 'collapsed': str(collapsed_path)}
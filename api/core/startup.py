@@ -0,0 +1,71 @@
+"""
+프로세스 기동 비용 측정 (`python -X importtime`)
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# 측정 대상별로 새 인터프리터에서 실행할 코드
+IMPORT_TARGETS = {
+    'setup': 'import django; django.setup()',
+    'wsgi': 'import backend.wsgi',
+    'urls': ('import backend.wsgi\n'
+             'from django.urls import get_resolver\n'
+             'get_resolver().url_patterns'),
+}
+
+_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+{code}
+wall_ms = (time.perf_counter() - start) * 1000
+sys.stdout.write(json.dumps({{'wall_ms': wall_ms}}))
+'''
+
+_LINE = re.compile(
+    r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$'
+)
+
+
+def parse_importtime(text):
+    """`-X importtime` stderr 를 모듈별 self/cumulative(ms) 목록으로 변환"""
+    modules = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append({
+            'module': name,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'depth': max(len(indent) - 1, 0) // 2,
+        })
+    return modules
+
+
+def group_by_package(modules):
+    """최상위 패키지별 self 시간 합계 (내림차순)"""
+    totals = defaultdict(float)
+    for module in modules:
+        totals[module['module'].split('.')[0]] += module['self_ms']
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def measure_startup(target, settings_module=None):
+    """새 프로세스에서 target 을 실행해 (wall_ms, modules) 반환"""
+    env = dict(os.environ)
+    if settings_module:
+        env['DJANGO_SETTINGS_MODULE'] = settings_module
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         _SCRIPT.format(code=IMPORT_TARGETS[target])],
+        capture_output=True, text=True, env=env, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    wall_ms = json.loads(result.stdout.strip().splitlines()[-1])['wall_ms']
+    return wall_ms, parse_importtime(result.stderr)
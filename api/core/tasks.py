@@ -0,0 +1,204 @@
+"""
+요청 응답에 필요 없는 부가 작업을 프로세스 안 스레드 풀에서 실행
+
+    from api.core.tasks import background
+
+    background.submit(send_audit_log, event)          # 개별 작업
+    background.submit_batch(insert_rows, row)         # 같은 함수끼리 모아 실행
+
+- 큐가 가득 차면 작업을 버리지 않고 호출한 스레드에서 바로 실행합니다.
+- submit_batch 작업은 batch_wait 동안 모인 항목(최대 batch_size)을
+  batch_fn(items) 한 번으로 처리합니다.
+- drain() 으로 지금까지 제출된 작업이 끝날 때까지 기다릴 수 있고,
+  shutdown() 은 워커 종료 시 남은 작업을 모두 처리한 뒤 멈춥니다.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+task_results = metrics.registry.register(metrics.Counter(
+    'background_tasks_total', '백그라운드 작업 처리 결과',
+    ('task', 'result')
+))
+task_duration = metrics.registry.register(metrics.Histogram(
+    'background_task_duration_seconds', '백그라운드 작업(배치) 처리 시간',
+    ('task',)
+))
+
+_STOP = object()
+
+
+def _task_name(fn):
+    return f'{fn.__module__}.{fn.__qualname__}'
+
+
+class BackgroundExecutor:
+    def __init__(self, workers=2, max_queue=1000, batch_size=100,
+                 batch_wait=0.02):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._pid = None
+        self._closed = False
+
+    def submit(self, fn, *args, **kwargs):
+        self._put((fn, False, (args, kwargs)))
+
+    def submit_batch(self, batch_fn, item):
+        self._put((batch_fn, True, item))
+
+    def pending(self):
+        return self._queue.unfinished_tasks
+
+    def drain(self, timeout=None):
+        """제출된 작업이 모두 끝나면 True"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = (None if deadline is None
+                             else deadline - time.monotonic())
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=30):
+        """새 작업은 호출 스레드에서 실행하고, 남은 작업을 처리한 뒤 종료"""
+        with self._lock:
+            self._closed = True
+            threads = self._threads if self._pid == os.getpid() else []
+            self._threads = []
+        if not threads:
+            # 워커가 없거나 (fork 이전 스레드) 처리할 스레드가 없으면 직접 처리
+            self._run_pending_inline()
+            return True
+        drained = self.drain(timeout)
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join(timeout=1)
+        return drained
+
+    def _put(self, task):
+        if self._closed or not self._ensure_workers():
+            self._run([task])
+            return
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            # 유실 대신 요청 스레드에서 실행 (부하 시 자연스러운 역압)
+            task_results.inc((_task_name(task[0]), 'inline'))
+            self._run([task])
+
+    def _ensure_workers(self):
+        if self.workers <= 0:
+            return False
+        if self._pid == os.getpid() and self._threads:
+            return True
+        with self._lock:
+            if self._closed:
+                return False
+            if self._pid != os.getpid():
+                # fork 된 프로세스는 부모의 스레드를 물려받지 못함
+                self._threads = []
+                self._pid = os.getpid()
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f'background-{len(self._threads)}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        return True
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            if task is _STOP:
+                self._queue.task_done()
+                return
+            batch, others = [task], []
+            if task[1]:
+                self._collect_batch(task[0], batch, others)
+            # 모으는 중 꺼낸 다른 작업은 큐에 되돌리지 않고 배치 다음에 처리
+            for tasks in [batch] + [[other] for other in others]:
+                if tasks[0] is _STOP:
+                    self._queue.task_done()
+                    self._queue.put(_STOP)
+                    continue
+                try:
+                    self._run(tasks)
+                finally:
+                    for _ in tasks:
+                        self._queue.task_done()
+
+    def _collect_batch(self, batch_fn, batch, others):
+        """batch_wait 동안 같은 batch_fn 작업을 최대 batch_size 개까지 모음"""
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                task = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if task is not _STOP and task[1] and task[0] == batch_fn:
+                batch.append(task)
+            else:
+                others.append(task)
+                if task is _STOP:
+                    return
+
+    def _run(self, tasks):
+        fn, batched, _ = tasks[0]
+        name = _task_name(fn)
+        close_old_connections()
+        start = time.perf_counter()
+        try:
+            if batched:
+                fn([payload for _, _, payload in tasks])
+            else:
+                args, kwargs = tasks[0][2]
+                fn(*args, **kwargs)
+        except Exception:
+            task_results.inc((name, 'error'), len(tasks))
+            logger.exception('백그라운드 작업 실패: %s (%d건)', name,
+                             len(tasks))
+        else:
+            task_results.inc((name, 'ok'), len(tasks))
+        finally:
+            task_duration.observe((name,), time.perf_counter() - start)
+            close_old_connections()
+
+    def _run_pending_inline(self):
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if task is not _STOP:
+                    self._run([task])
+            finally:
+                self._queue.task_done()
+
+
+background = BackgroundExecutor(
+    workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+    max_queue=getattr(settings, 'BACKGROUND_TASK_QUEUE_SIZE', 1000),
+    batch_size=getattr(settings, 'BACKGROUND_TASK_BATCH_SIZE', 100),
+    batch_wait=getattr(settings, 'BACKGROUND_TASK_BATCH_WAIT', 0.02),
+)
+atexit.register(background.shutdown)
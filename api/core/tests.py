@@ -0,0 +1,533 @@
+import base64
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, override_settings
+from django.urls import reverse
+from api.posts.documents import Post
+from api.users.models import User
+from backend import swagger
+from django.contrib.auth.hashers import make_password
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import metrics
+from .bench import BenchmarkRunner, compare, percentile
+from .profiling import phase_times
+from .startup import group_by_package, parse_importtime
+from .tasks import BackgroundExecutor, background, task_results
+from . import concurrency
+from .concurrency import AIMDLimiter, ConcurrencyLimiter, queue_time
+from backend import settings as deployed_settings
+from api.posts import urls as posts_urls
+from api.users import urls as users_urls
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        metrics.registry.reset()
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+
+    def test_metrics_records_request(self):
+        """
+        요청 처리 후 지연 시간, MySQL 쿼리 수가 /metrics 에 노출되는지 테스트
+        """
+        self.client.post(reverse('signup'), {
+            'email': 'test@example.com',
+            'password': 'test_password'
+        }, content_type='application/json')
+
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn(
+            'http_request_duration_seconds_count'
+            '{view="signup",method="POST"} 1', body
+        )
+        self.assertIn(
+            'http_requests_total{view="signup",method="POST",status="400"} 1',
+            body
+        )
+        self.assertEqual(
+            metrics.mysql_queries.value(('signup', 'POST')), 1
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        """
+        히스토그램 버킷이 누적 값으로 렌더링되는지 테스트
+        """
+        histogram = metrics.Histogram('test_seconds', 'test', ('view',),
+                                      buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(('a',), value)
+        lines = list(histogram.collect())
+        self.assertIn('test_seconds_bucket{view="a",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{view="a",le="1.0"} 2', lines)
+        self.assertIn('test_seconds_bucket{view="a",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{view="a"} 3', lines)
+
+
+class BenchmarkReportTestCase(unittest.TestCase):
+    def test_percentile(self):
+        """
+        선형 보간 백분위 계산 테스트
+        """
+        values = [1, 2, 3, 4]
+        self.assertEqual(percentile(values, 50), 2.5)
+        self.assertEqual(percentile(values, 100), 4)
+        self.assertIsNone(percentile([], 50))
+
+    def test_compare_detects_regression(self):
+        """
+        허용 비율을 넘는 p95 증가와 처리량 감소만 성능 저하로 판정하는지 테스트
+        """
+        baseline = {'results': [
+            {'endpoint': 'posts.list', 'p95_ms': 10.0, 'throughput': 100},
+            {'endpoint': 'users.login', 'p95_ms': 50.0, 'throughput': 20},
+        ]}
+        current = {'results': [
+            {'endpoint': 'posts.list', 'p95_ms': 11.0, 'throughput': 95},
+            {'endpoint': 'users.login', 'p95_ms': 80.0, 'throughput': 12},
+        ]}
+        regressions = compare(baseline, current, tolerance=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(item.startswith('users.login')
+                            for item in regressions))
+
+    def test_unexpected_status_fails_run(self):
+        """
+        스로틀된(429) 응답이 섞이면 측정을 중단하는지 테스트
+        """
+        class ThrottledLoginClient:
+            def request(self, method, path, body=None, token=None):
+                if path == '/users/signup':
+                    return 201, {}
+                return 429, {'msg': '로그인 시도가 너무 많습니다.'}
+
+        runner = BenchmarkRunner(ThrottledLoginClient(), requests=3,
+                                 concurrency=1, log=lambda message: None)
+        with self.assertRaisesRegex(RuntimeError,
+                                    'users.login.*429.*THROTTLES_DISABLED'):
+            runner.run()
+
+    def test_routes_cover_every_url(self):
+        """
+        users/posts URLconf 의 모든 라우트가 벤치마크 대상인지 테스트
+        """
+        names = {pattern.name for pattern in
+                 users_urls.urlpatterns + posts_urls.urlpatterns}
+        self.assertEqual(names - set(BenchmarkRunner.ROUTES.values()),
+                         set())
+
+    def test_run_measures_every_endpoint(self):
+        class RecordingClient:
+            def __init__(self):
+                self.paths = set()
+                self.posts = 0
+
+            def request(self, method, path, body=None, token=None):
+                self.paths.add(f'{method} {path.split("?")[0]}')
+                if path == '/users/signup':
+                    return 201, {}
+                if path in ('/users/login', '/users/refresh'):
+                    payload = base64.urlsafe_b64encode(
+                        json.dumps({'user_id': 1}).encode()
+                    ).decode().rstrip('=')
+                    return 200, {'access_token': f'header.{payload}.sig',
+                                 'refresh_token': 'refresh'}
+                if (method, path) == ('POST', '/posts/'):
+                    self.posts += 1
+                    return 201, {'id': f'{self.posts:024x}'}
+                if method == 'DELETE':
+                    return 204, None
+                return 200, {'count': 3}
+
+        client = RecordingClient()
+        report = BenchmarkRunner(client, requests=3, concurrency=1,
+                                 log=lambda message: None).run()
+        self.assertEqual([result['endpoint'] for result in report['results']],
+                         BenchmarkRunner.ENDPOINTS)
+        for path in ('GET /posts/batch', 'GET /posts/trending',
+                     'GET /posts/tags'):
+            self.assertIn(path, client.paths)
+        for suffix in ('/revisions', '/revisions/1'):
+            self.assertTrue(any(path.endswith(suffix)
+                                for path in client.paths), suffix)
+
+
+class SeedCommandTestCase(unittest.TestCase):
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        Post.objects.delete()
+
+    def _seed(self):
+        call_command('seed', users=20, posts=500, batch_size=64, seed=7,
+                     stdout=StringIO())
+        return Counter(
+            (post.author_id, post.title) for post in Post.objects()
+        )
+
+    def test_seed_is_deterministic_and_skewed(self):
+        """
+        같은 시드로 같은 데이터가 생성되고, 작성자 분포가 치우치는지 테스트
+        """
+        first = self._seed()
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Post.objects.count(), 500)
+
+        Post.objects.delete()
+        self.assertEqual(self._seed(), first)
+
+        per_author = Counter(author_id for author_id, _ in first.elements())
+        counts = sorted(per_author.values(), reverse=True)
+        self.assertGreater(counts[0], 500 / 20 * 3)
+
+
+class ProfilingMiddlewareTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.profile_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            PROFILE_DIR=Path(self.profile_dir)
+        )
+        self.settings_override.enable()
+        self.staff = User.objects.create(
+            email='staff@example.com',
+            password=make_password('test_password'),
+            is_staff=True
+        )
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.profile_dir)
+        User.objects.all().delete()
+        background.drain()
+        cache.clear()
+
+    def _authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer '
+            f'{RefreshToken.for_user(user).access_token}'
+        )
+
+    def test_staff_request_is_profiled(self):
+        """
+        관리자 요청에 프로파일 파일과 Server-Timing 헤더가 생성되는지 테스트
+        """
+        self._authenticate(self.staff)
+        response = self.client.get(reverse('throttle-stats'),
+                                   HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('X-Profile-Id', response)
+        self.assertIn('auth;dur=', response['Server-Timing'])
+        files = sorted(os.listdir(self.profile_dir))
+        self.assertEqual([os.path.splitext(name)[1] for name in files],
+                         ['.collapsed', '.json', '.prof'])
+
+    def test_non_staff_request_is_not_profiled(self):
+        """
+        일반 사용자 요청은 플래그가 있어도 프로파일하지 않는지 테스트
+        """
+        self._authenticate(self.user)
+        response = self.client.get(reverse('posts'), {'_profile': '1'})
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_disabled_flag_is_not_profiled(self):
+        """
+        플래그 값이 0 이면 관리자 요청도 인증 확인 없이 그대로 처리하는지 테스트
+        """
+        self._authenticate(self.staff)
+        with patch('api.core.profiling.is_staff_request') as is_staff:
+            response = self.client.get(reverse('throttle-stats'),
+                                       {'_profile': '0'}, HTTP_X_PROFILE='0')
+        is_staff.assert_not_called()
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_phase_times(self):
+        """
+        pstats 에서 단계 함수의 누적 시간을 읽는지 테스트
+        """
+        stats = SimpleNamespace(stats={
+            ('/x/rest_framework/views.py', 1, 'perform_authentication'):
+                (1, 1, 0.001, 0.004, {}),
+            ('/x/rest_framework/views.py', 2, 'dispatch'):
+                (1, 1, 0.001, 0.010, {}),
+            ('/x/other.py', 3, 'dispatch'): (1, 1, 0.5, 0.9, {}),
+        })
+        self.assertEqual(phase_times(stats), {
+            'auth': 0.004, 'dispatch': 0.010, 'render': 0.0
+        })
+
+
+class WarmupTestCase(unittest.TestCase):
+    def test_prime_application_loads_all_routes(self):
+        from backend.warmup import iter_routes, prime_application
+        from django.urls import get_resolver
+
+        prime_application()
+        routes = [route for route, _ in
+                  iter_routes(get_resolver().url_patterns)]
+        self.assertIn('users/login', routes)
+        self.assertIn('posts/<str:post_id>', routes)
+
+
+class StartupReportTestCase(unittest.TestCase):
+    def test_parse_importtime(self):
+        modules = parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |     django.utils\n'
+            'import time:      2000 |       2120 |   django\n'
+            'import time:       500 |        500 | pymongo\n'
+        )
+        self.assertEqual([m['module'] for m in modules],
+                         ['django.utils', 'django', 'pymongo'])
+        self.assertEqual(modules[1]['cumulative_ms'], 2.12)
+        self.assertEqual(modules[0]['depth'], 2)
+        self.assertEqual(group_by_package(modules),
+                         [('django', 2.12), ('pymongo', 0.5)])
+
+
+class OpenAPISchemaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.settings = override_settings(OPENAPI_SCHEMA_DIR=self.directory)
+        self.settings.enable()
+        swagger.load_schema.cache_clear()
+
+    def tearDown(self):
+        swagger.load_schema.cache_clear()
+        self.settings.disable()
+        shutil.rmtree(self.directory)
+
+    def test_build_always_regenerates(self):
+        """
+        URLconf 가 같아도 명령은 항상 다시 생성하고, 서버는 있는 파일을
+        그대로 사용하는지 테스트
+        """
+        out = StringIO()
+        call_command('build_openapi_schema', stdout=out)
+        self.assertIn('생성했습니다', out.getvalue())
+        path = Path(self.directory) / 'openapi.json'
+        schema = path.read_bytes()
+
+        # serializer 필드 변경 등 URLconf 로 알 수 없는 변경
+        path.write_bytes(b'{}')
+        call_command('build_openapi_schema', stdout=StringIO())
+        self.assertEqual(path.read_bytes(), schema)
+
+        with patch.object(swagger, 'build_schema') as build:
+            swagger.load_schema()
+        build.assert_not_called()
+
+    def test_schema_served_with_etag(self):
+        client = Client()
+        response = client.get('/swagger.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/posts/', response.json()['paths'])
+        self.assertIn('max-age=', response['Cache-Control'])
+        etag = response['ETag']
+
+        response = client.get('/swagger.json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = client.get('/swagger.yaml')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+def _fail(items):
+    raise RuntimeError('boom')
+
+
+class BackgroundExecutorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.executor = BackgroundExecutor(workers=1, max_queue=10,
+                                           batch_size=10, batch_wait=0.2)
+
+    def tearDown(self):
+        self.executor.shutdown(timeout=5)
+
+    def test_batches_similar_tasks(self):
+        calls = []
+        for i in range(5):
+            self.executor.submit_batch(calls.append, i)
+        self.assertTrue(self.executor.drain(timeout=5))
+        self.assertEqual(calls, [[0, 1, 2, 3, 4]])
+
+    def test_failures_are_counted(self):
+        before = task_results.value((f'{__name__}._fail', 'error'))
+        with self.assertLogs('api.core.tasks', 'ERROR'):
+            self.executor.submit_batch(_fail, 1)
+            self.executor.submit_batch(_fail, 2)
+            self.assertTrue(self.executor.drain(timeout=5))
+        self.assertEqual(
+            task_results.value((f'{__name__}._fail', 'error')), before + 2
+        )
+
+    def test_full_queue_runs_inline(self):
+        executor = BackgroundExecutor(workers=1, max_queue=1)
+        started, release = threading.Event(), threading.Event()
+        threads = []
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        executor.submit(block)
+        started.wait(5)
+        executor.submit(threads.append, 'queued')
+        executor.submit(
+            lambda: threads.append(threading.current_thread().name)
+        )
+        self.assertEqual(threads, [threading.current_thread().name])
+        release.set()
+        self.assertTrue(executor.shutdown(timeout=5))
+        self.assertEqual(threads[-1], 'queued')
+
+    def test_shutdown_drains_pending_tasks(self):
+        done = []
+        for i in range(3):
+            self.executor.submit(done.append, i)
+        self.assertTrue(self.executor.shutdown(timeout=5))
+        self.assertEqual(sorted(done), [0, 1, 2])
+        # 종료 후 제출한 작업은 호출 스레드에서 실행
+        self.executor.submit(done.append, 3)
+        self.assertEqual(done[-1], 3)
+
+
+class ConcurrencyLimitTestCase(unittest.TestCase):
+    def tearDown(self):
+        concurrency._limiter = None
+
+    def test_aimd_limit(self):
+        limiter = AIMDLimiter(initial=4, minimum=1, maximum=6,
+                              target_ms=100, backoff=0.5, cooldown=1)
+        for _ in range(4):
+            self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+
+        # 느린 응답이 연속돼도 cooldown 동안 한 번만 감소
+        limiter.release(0.5, now=10)
+        limiter.release(0.5, now=10.5)
+        self.assertEqual(limiter.limit, 2)
+
+        # 한도를 다 쓰며 빠르게 처리되면 증가
+        limiter.release(0.01, now=11)
+        limiter.release(0.01, now=11)
+        self.assertEqual(limiter.inflight, 0)
+        for _ in range(2):
+            limiter.try_acquire()
+        limiter.release(0.01, now=12)
+        self.assertGreater(limiter.limit, 2)
+
+        limiter.release(0.01, failed=True, now=13)
+        self.assertLess(limiter.limit, 2)
+
+    def test_low_priority_class_is_shed_first(self):
+        limiter = ConcurrencyLimiter({
+            'read': {'initial': 10, 'share': 1.0},
+            'bulk': {'initial': 10, 'share': 0.5},
+        }, global_limit=4)
+        self.assertIsNone(limiter.try_acquire('read'))
+        self.assertIsNone(limiter.try_acquire('bulk'))
+        self.assertEqual(limiter.try_acquire('bulk'), 'priority')
+        self.assertIsNone(limiter.try_acquire('read'))
+        self.assertIsNone(limiter.try_acquire('read'))
+        self.assertEqual(limiter.try_acquire('read'), 'priority')
+
+    def test_middleware_sheds_with_retry_after(self):
+        limiter = concurrency.get_concurrency_limiter()
+        read = limiter.limiters['post_read']
+        read.limit = 1
+        read.inflight = 1
+        try:
+            response = Client().get(reverse('posts'))
+        finally:
+            read.inflight = 0
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+        response = Client().get(reverse('posts'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(read.inflight, 0)
+
+    def test_deployed_limits_bind_within_worker_threads(self):
+        """
+        배포 설정의 한도가 gunicorn 스레드 수 안에서 실제로 걸리는지 테스트
+        """
+        threads = deployed_settings.WORKER_THREADS
+        limiter = ConcurrencyLimiter(
+            deployed_settings.CONCURRENCY_LIMITS,
+            deployed_settings.CONCURRENCY_GLOBAL_LIMIT
+        )
+        for name, options in deployed_settings.CONCURRENCY_LIMITS.items():
+            self.assertLessEqual(options['maximum'], threads, name)
+
+        # 스레드를 모두 쓰기 전에 낮은 등급부터 거절
+        admitted = Counter()
+        for load_class in ('bulk', 'bulk', 'bulk', 'post_write',
+                           'post_write', 'post_write', 'post_read'):
+            if limiter.try_acquire(load_class) is None:
+                admitted[load_class] += 1
+        self.assertLess(admitted['bulk'], threads)
+        self.assertEqual(limiter.try_acquire('post_read'), 'priority')
+        self.assertLessEqual(limiter.inflight, threads)
+
+    @override_settings(CONCURRENCY_QUEUE_TIME_HEADER='HTTP_X_REQUEST_START')
+    def test_queue_time_from_request_start(self):
+        now = 1700000000.0
+        request = SimpleNamespace(META={})
+        self.assertEqual(queue_time(request, now=now), 0.0)
+        # 초(nginx), 밀리초, 마이크로초
+        for value in ('t=1699999998.5', '1699999998500',
+                      '1699999998500000'):
+            request.META['HTTP_X_REQUEST_START'] = value
+            self.assertAlmostEqual(queue_time(request, now=now), 1.5,
+                                   places=3)
+        # 해석할 수 없거나 미래이거나 너무 오래된 값은 무시
+        for value in ('invalid', f't={now + 5}', 't=0', f't={now - 3600}'):
+            request.META['HTTP_X_REQUEST_START'] = value
+            self.assertEqual(queue_time(request, now=now), 0.0)
+
+    def test_queue_time_header_is_opt_in(self):
+        """
+        설정하지 않으면 클라이언트가 보낸 X-Request-Start 를 무시하는지 테스트
+        """
+        self.assertIsNone(deployed_settings.CONCURRENCY_QUEUE_TIME_HEADER)
+        request = SimpleNamespace(META={'HTTP_X_REQUEST_START': 't=0'})
+        with override_settings(CONCURRENCY_QUEUE_TIME_HEADER=None):
+            self.assertEqual(queue_time(request), 0.0)
+
+    @override_settings(CONCURRENCY_QUEUE_TIME_HEADER='HTTP_X_REQUEST_START')
+    def test_queue_time_counts_toward_latency(self):
+        limiter = concurrency.get_concurrency_limiter()
+        read = limiter.limiters['post_read']
+        Client().get(reverse('posts'),
+                     HTTP_X_REQUEST_START=f't={time.time() - 2:.3f}')
+        self.assertGreaterEqual(read.latency, 2)
@@ -0,0 +1,125 @@
+import hashlib
+import threading
+from django.core.cache import cache as default_cache
+from rest_framework.throttling import SimpleRateThrottle
+from .metrics import registry
+
+
+class SlidingWindowCounter:
+    """
+    Sliding window counter
+
+    현재/직전 고정 윈도우 두 개의 카운터만 유지하고, 직전 윈도우 값은
+    지나간 비율만큼 가중치를 줄여 합산합니다. 요청 타임스탬프 목록을
+    저장하는 방식과 달리 키 하나당 정수 두 개만 필요합니다.
+    현재 윈도우 카운터를 먼저 incr 하고 판단하므로 공유 캐시(Redis)에서
+    동시에 들어온 요청이 같은 값을 읽고 함께 허용되지 않습니다.
+    """
+    def __init__(self, cache, limit, window):
+        self.cache = cache
+        self.limit = limit
+        self.window = window
+
+    def hit(self, key, now):
+        """
+        요청 1건을 기록하고 (허용 여부, 재시도까지 남은 초) 반환
+        """
+        index = int(now // self.window)
+        elapsed = now - index * self.window
+        current_key = f'{key}:{index}'
+        previous_key = f'{key}:{index - 1}'
+        # 윈도우 두 개 길이만큼만 유지되면 충분
+        timeout = int(self.window * 2) + 1
+        self.cache.add(current_key, 0, timeout=timeout)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # add 와 incr 사이에 키가 만료된 경우
+            self.cache.set(current_key, 1, timeout=timeout)
+            current = 1
+        previous = self.cache.get(previous_key, 0)
+
+        weight = 1 - elapsed / self.window
+        if previous * weight + current > self.limit:
+            # 거절한 요청은 횟수에서 제외
+            try:
+                self.cache.decr(current_key)
+            except ValueError:
+                pass
+            return False, self._wait(current - 1, previous, elapsed)
+        return True, None
+
+    def _wait(self, current, previous, elapsed):
+        if current >= self.limit or not previous:
+            return self.window - elapsed
+        # previous * (1 - (elapsed + t) / window) + current < limit
+        wait = self.window * (1 - (self.limit - current) / previous) \
+            - elapsed
+        return max(wait, 0.0) + 0.001
+
+
+class ThrottleStats:
+    """
+    스코프별 허용/거부 횟수 (프로세스 단위)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, scope, allowed):
+        with self._lock:
+            counts = self._counts.setdefault(
+                scope, {'allowed': 0, 'rejected': 0}
+            )
+            counts['allowed' if allowed else 'rejected'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {scope: dict(counts)
+                    for scope, counts in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+throttle_stats = ThrottleStats()
+
+
+@registry.register_collector
+def collect_throttle_stats():
+    yield '# HELP throttle_requests_total 스로틀 검사 결과'
+    yield '# TYPE throttle_requests_total counter'
+    for scope, counts in throttle_stats.snapshot().items():
+        for result, value in counts.items():
+            yield f'throttle_requests_total{{scope="{scope}",' \
+                  f'result="{result}"}} {value}'
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    DEFAULT_THROTTLE_RATES 의 scope 비율을 sliding window 로 적용하는 스로틀
+    """
+    cache = default_cache
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        counter = SlidingWindowCounter(self.cache, self.num_requests,
+                                       self.duration)
+        allowed, self._wait = counter.hit(self.key, self.timer())
+        throttle_stats.record(self.scope, allowed)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+    @staticmethod
+    def hash_ident(value):
+        """캐시 키에 사용할 수 있도록 임의 문자열을 고정 길이로 변환"""
+        return hashlib.sha256(value.encode()).hexdigest()[:32]
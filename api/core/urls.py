@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import ThrottleStatsAPIView, metrics_view
+
+urlpatterns = [
+    path('throttle-stats', ThrottleStatsAPIView.as_view(),
+         name='throttle-stats'),
+    path('metrics', metrics_view, name='metrics'),
+]
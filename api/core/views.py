@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from rest_framework import status
+from . import metrics
+from .throttling import throttle_stats
+
+
+class ThrottleStatsAPIView(APIView):
+    """
+    스로틀 스코프별 설정 비율과 허용/거부 횟수 조회 API (관리자 전용)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        counts = throttle_stats.snapshot()
+        return Response({
+            scope: {
+                'rate': rates.get(scope),
+                **counts.get(scope, {'allowed': 0, 'rejected': 0})
+            } for scope in set(rates) | set(counts)
+        }, status=status.HTTP_200_OK)
+
+
+def metrics_view(request):
+    """
+    Prometheus text 형식 지표 (METRICS_ENABLED 일 때만 노출)
+    """
+    if not getattr(settings, 'METRICS_ENABLED', False):
+        raise Http404
+    return HttpResponse(metrics.registry.render(),
+                        content_type=metrics.CONTENT_TYPE)
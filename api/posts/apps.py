@@ -6,3 +6,6 @@ class PostsConfig(AppConfig):
 
     # 디렉토리 구조 변경에 의한 변경
     name = 'api.posts'
+
+    def ready(self):
+        from . import signals  # noqa: F401
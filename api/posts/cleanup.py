@@ -0,0 +1,78 @@
+"""
+탈퇴한 사용자(MySQL)의 게시글(Mongo) 정리
+
+- 사용자 삭제 시: post_delete 신호가 pending_author_purges 컬렉션에 작성자
+  id 만 기록 (api.posts.signals)
+  요청을 처리하는 스레드/백그라운드 풀에서는 삭제하지 않습니다.
+- purge_orphan_posts 명령이 기록된 작성자의 게시글을 먼저 삭제하고,
+  작성자 id 를 배치로 순회하며 MySQL 에 없는 작성자의 게시글을 삭제
+"""
+import time
+from datetime import datetime
+from django.conf import settings
+from mongoengine.connection import get_db
+from api.posts.storage import get_post_repository
+from api.users.models import User
+
+PENDING_PURGE_COLLECTION = 'pending_author_purges'
+
+
+class OpsRateLimiter:
+    """초당 ops_per_sec 회를 넘지 않도록 대기 (0 이하면 제한 없음)"""
+    def __init__(self, ops_per_sec, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1 / ops_per_sec if ops_per_sec > 0 else 0
+        self._clock = clock
+        self._sleep = sleep
+        self._next = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = self._clock()
+        if self._next is not None and now < self._next:
+            self._sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+
+def delete_author_posts(author_id, chunk_size=None, limiter=None):
+    """
+    작성자의 게시글을 chunk_size 개씩 삭제하고 전체 삭제 수를 반환
+    (예약된 사이 같은 id 의 사용자가 있으면 삭제하지 않음)
+    """
+    if User.objects.filter(pk=author_id).exists():
+        return 0
+    chunk_size = chunk_size or settings.ORPHAN_POSTS_CHUNK_SIZE
+    limiter = limiter or OpsRateLimiter(settings.ORPHAN_POSTS_OPS_PER_SEC)
+    repository = get_post_repository()
+    deleted = 0
+    while True:
+        limiter.wait()
+        count = repository.delete_by_author(author_id, limit=chunk_size)
+        deleted += count
+        if count == 0:
+            return deleted
+
+
+def queue_author_purge(author_id):
+    """작성자의 게시글 삭제를 purge_orphan_posts 가 처리하도록 기록"""
+    get_db()[PENDING_PURGE_COLLECTION].update_one(
+        {'_id': author_id},
+        {'$setOnInsert': {'requested_at': datetime.now()}},
+        upsert=True
+    )
+
+
+def purge_pending_authors(chunk_size=None, limiter=None):
+    """
+    기록된 작성자의 게시글을 삭제하고 (작성자 수, 삭제 수) 반환
+    삭제를 마친 작성자만 기록에서 지우므로 중단되어도 다시 처리합니다.
+    """
+    collection = get_db()[PENDING_PURGE_COLLECTION]
+    authors = deleted = 0
+    for row in collection.find().sort('requested_at', 1):
+        deleted += delete_author_posts(row['_id'], chunk_size=chunk_size,
+                                       limiter=limiter)
+        collection.delete_one({'_id': row['_id']})
+        authors += 1
+    return authors, deleted
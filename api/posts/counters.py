@@ -0,0 +1,101 @@
+"""
+게시글 조회수 버퍼
+
+상세 조회마다 Mongo 에 쓰지 않고 프로세스 안에서 게시글 id 별로 합산한 뒤
+flush_interval 마다 한 번의 unordered bulk_write($inc)로 반영합니다.
+조회수는 최대 flush_interval 만큼 늦게 보일 수 있습니다.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+from django.conf import settings
+from api.core import metrics
+
+logger = logging.getLogger(__name__)
+
+view_flushes = metrics.registry.register(metrics.Counter(
+    'post_view_flushes_total', '조회수 flush 횟수', ('result',)
+))
+view_flushed_posts = metrics.registry.register(metrics.Counter(
+    'post_view_flushed_posts_total', 'flush 로 갱신한 게시글 수'
+))
+
+
+class ViewCounter:
+    def __init__(self, flush_interval=5.0, repository=None):
+        self.flush_interval = flush_interval
+        self._repository = repository
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = Counter()
+        self._worker = None
+        self._stop = threading.Event()
+        self._pid = os.getpid()
+
+    @property
+    def repository(self):
+        if self._repository is None:
+            from api.posts.storage import get_post_repository
+            return get_post_repository()
+        return self._repository
+
+    def incr(self, post_id, amount=1):
+        with self._lock:
+            self._pending[post_id] += amount
+        self._ensure_worker()
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self):
+        """모인 증가분을 반영하고 갱신한 게시글 수를 반환"""
+        with self._flush_lock:
+            with self._lock:
+                counts, self._pending = self._pending, Counter()
+            if not counts:
+                return 0
+            try:
+                self.repository.increment_views(counts)
+            except Exception:
+                # 다음 flush 에서 다시 시도하도록 되돌림
+                with self._lock:
+                    self._pending.update(counts)
+                view_flushes.inc(('error',))
+                logger.exception('조회수 flush 실패 (%d건)', len(counts))
+                return 0
+            view_flushes.inc(('ok',))
+            view_flushed_posts.inc(amount=len(counts))
+            return len(counts)
+
+    def stop(self):
+        """워커 종료 시 남은 증가분 반영"""
+        self._stop.set()
+        self.flush()
+
+    def _ensure_worker(self):
+        # fork 된 워커는 부모의 스레드를 물려받지 못하므로 pid 로 확인
+        if (self._worker is not None and self._pid == os.getpid()
+                and self._worker.is_alive()):
+            return
+        with self._lock:
+            if (self._worker is None or self._pid != os.getpid()
+                    or not self._worker.is_alive()):
+                self._pid = os.getpid()
+                self._stop = threading.Event()
+                self._worker = threading.Thread(
+                    target=self._run, name='post-view-flush', daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+view_counter = ViewCounter(
+    flush_interval=getattr(settings, 'POST_VIEW_FLUSH_INTERVAL', 5.0)
+)
+atexit.register(view_counter.stop)
@@ -1,11 +1,123 @@
-from mongoengine import Document, StringField, IntField, DateTimeField
+from mongoengine import (Document, StringField, IntField, DateTimeField,
+                         FloatField, DictField, ListField, BooleanField,
+                         DynamicField, ObjectIdField)
 from datetime import datetime
 
 
-class Post(Document):
+class BasePost(Document):
     title = StringField(required=True, max_length=255)
     content = StringField(required=True)
     author_id = IntField(required=True)
     created_at = DateTimeField(default=datetime.now)
+    # 조회수 (api.posts.counters 가 주기적으로 $inc 로 반영)
+    views = IntField(default=0)
+    tags = ListField(StringField(max_length=50))
+    # 수정 횟수 (마지막 리비전 번호, api.posts.revisions)
+    revision = IntField(default=0)
 
-    meta = {'collection': 'posts'}
+    meta = {'abstract': True}
+
+
+class Post(BasePost):
+    meta = {
+        'collection': 'posts',
+        'indexes': [
+            # 인기 게시글 집계의 최근 게시글 범위 조회
+            'created_at',
+            # 작성자별 목록과 고아 게시글 정리(작성자 id 순회)
+            ('author_id', 'created_at'),
+            # 태그별 목록 (multikey, created_at 이 같으면 _id 순 keyset)
+            ('tags', 'created_at', 'id'),
+        ],
+    }
+
+
+class ArchivedPost(BasePost):
+    """
+    오래된 게시글 (archive_posts 명령이 posts 에서 옮김)
+    _id 는 원본 게시글 id 와 같습니다.
+    """
+    meta = {
+        'collection': 'posts_archive',
+        'indexes': [
+            ('author_id', 'created_at'),
+            ('tags', 'created_at', 'id'),
+        ],
+    }
+
+
+class PostRevision(Document):
+    """
+    게시글 수정 이력 (api.posts.revisions)
+    snapshot 이면 content, 아니면 다음 리비전으로부터의 delta 를 가집니다.
+    """
+    post_id = ObjectIdField(required=True)
+    number = IntField(required=True)
+    created_at = DateTimeField(default=datetime.now)
+    editor_id = IntField()
+    title = StringField()
+    length = IntField()
+    snapshot = BooleanField(default=False)
+    content = StringField()
+    delta = ListField(DynamicField())
+
+    meta = {
+        'collection': 'post_revisions',
+        'indexes': [
+            {'fields': ['post_id', '-number'], 'unique': True},
+        ],
+    }
+
+
+class TrendingPost(Document):
+    """
+    인기 게시글 (refresh_trending 명령이 $merge 로 갱신)
+    _id 는 원본 게시글 id 와 같습니다.
+    """
+    title = StringField()
+    author_id = IntField()
+    created_at = DateTimeField()
+    views = IntField(default=0)
+    score = FloatField()
+    refreshed_at = DateTimeField()
+
+    meta = {
+        'collection': 'posts_trending',
+        'indexes': ['-score'],
+    }
+
+
+class PostTagCount(Document):
+    """태그별 게시글 수 (게시글 작성/수정/삭제 시 $inc 로 갱신)"""
+    tag = StringField(primary_key=True)
+    count = IntField(default=0)
+
+    meta = {
+        'collection': 'post_tag_counts',
+        'indexes': ['-count'],
+    }
+
+
+class IdempotencyRecord(Document):
+    """
+    Idempotency-Key 로 처리한 게시글 생성 요청 (api.posts.idempotency)
+    (user_id, key) 는 유일하며 expires_at 이 지나면 TTL 인덱스로 삭제됩니다.
+    시각은 모두 UTC 입니다.
+    """
+    user_id = IntField(required=True)
+    key = StringField(required=True, max_length=255)
+    fingerprint = StringField(required=True)
+    # pending: 처리 중, done: 응답 저장 완료
+    status = StringField(required=True, choices=('pending', 'done'))
+    locked_at = DateTimeField(required=True)
+    expires_at = DateTimeField(required=True)
+    response_status = IntField()
+    response_body = DictField()
+
+    meta = {
+        'collection': 'posts_idempotency',
+        'indexes': [
+            {'fields': ['user_id', 'key'], 'unique': True},
+            {'fields': ['expires_at'], 'expireAfterSeconds': 0},
+        ],
+    }
@@ -0,0 +1,88 @@
+"""
+게시글 생성 Idempotency-Key
+
+(user, key) 별 첫 요청만 실제로 처리하고 응답을 posts_idempotency 에 저장합니다.
+- 같은 키로 다시 오면 저장된 응답을 그대로 반환 (posts 는 건드리지 않음)
+- 첫 요청이 아직 처리 중이면 IdempotencyInProgress (409)
+- 같은 키로 본문이 다른 요청이면 IdempotencyMismatch (422)
+- 처리 중 기록이 IDEMPOTENCY_LOCK_TIMEOUT 이상 지나면 (워커 종료 등)
+  다음 요청이 이어받아 다시 처리합니다.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from mongoengine.errors import NotUniqueError
+from rest_framework.utils.encoders import JSONEncoder
+from api.posts.documents import IdempotencyRecord
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyInProgress(Exception):
+    """같은 키의 요청이 아직 처리 중"""
+
+
+class IdempotencyMismatch(Exception):
+    """같은 키로 다른 본문의 요청"""
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def request_fingerprint(data):
+    body = json.dumps(data, sort_keys=True, cls=JSONEncoder)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def begin(user_id, key, fingerprint):
+    """
+    요청 처리 시작
+
+    처리 권한을 얻으면 status='pending' 기록을, 이미 완료된 요청이면
+    저장된 응답을 가진 status='done' 기록을 반환합니다.
+    """
+    now = _utcnow()
+    ttl = timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    try:
+        return IdempotencyRecord(
+            user_id=user_id, key=key, fingerprint=fingerprint,
+            status='pending', locked_at=now, expires_at=now + ttl
+        ).save(force_insert=True)
+    except NotUniqueError:
+        pass
+
+    record = IdempotencyRecord.objects(user_id=user_id, key=key).first()
+    if record is None:
+        # 그 사이 만료/삭제된 경우 처음부터 다시 시도
+        return begin(user_id, key, fingerprint)
+    if record.fingerprint != fingerprint:
+        raise IdempotencyMismatch(key)
+    if record.status == 'done':
+        return record
+
+    lock_timeout = timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+    if now - record.locked_at < lock_timeout:
+        raise IdempotencyInProgress(key)
+    # 오래된 pending 기록은 locked_at 을 바꾼 한 요청만 이어받음
+    taken = IdempotencyRecord.objects(
+        id=record.id, status='pending', locked_at=record.locked_at
+    ).modify(set__locked_at=now, set__expires_at=now + ttl, new=True)
+    if taken is None:
+        raise IdempotencyInProgress(key)
+    return taken
+
+
+def complete(record, status_code, body):
+    """응답 저장 (JSON 으로 직렬화 가능한 형태로 변환)"""
+    record.modify(
+        set__status='done', set__response_status=status_code,
+        set__response_body=json.loads(json.dumps(body, cls=JSONEncoder))
+    )
+
+
+def release(record):
+    """서버 오류 등으로 응답을 저장하지 않을 때 키를 풀어 재시도 허용"""
+    IdempotencyRecord.objects(id=record.id, status='pending').delete()
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.posts.cleanup import OpsRateLimiter
+from api.posts.storage import get_post_repository
+
+
+class Command(BaseCommand):
+    help = ('오래된 게시글을 posts_archive 로 옮깁니다. 복사 후 삭제하므로 '
+            '중단되면 다시 실행해 이어서 옮길 수 있습니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int,
+                            default=settings.POSTS_ARCHIVE_AFTER_DAYS,
+                            help='작성 후 이 일 수가 지난 게시글을 보관')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.POSTS_ARCHIVE_BATCH_SIZE,
+                            help='한 번에 옮길 최대 게시글 수')
+        parser.add_argument('--ops-per-sec', type=float,
+                            default=settings.POSTS_ARCHIVE_OPS_PER_SEC,
+                            help='초당 최대 배치 수 (0: 제한 없음)')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='실행할 최대 배치 수 (기본: 끝까지)')
+
+    def handle(self, *args, **options):
+        before = datetime.now() - timedelta(days=options['older_than_days'])
+        repository = get_post_repository()
+        limiter = OpsRateLimiter(options['ops_per_sec'])
+        moved = batches = 0
+
+        while options['max_batches'] is None \
+                or batches < options['max_batches']:
+            limiter.wait()
+            count = repository.archive(before, limit=options['batch_size'])
+            moved += count
+            if count:
+                batches += 1
+            if count < options['batch_size']:
+                break
+
+        self.stdout.write(
+            f'{before:%Y-%m-%d %H:%M} 이전 게시글 {moved}개를 보관했습니다. '
+            f'({batches} batches)'
+        )
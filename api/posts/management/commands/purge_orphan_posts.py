@@ -0,0 +1,99 @@
+from datetime import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from mongoengine.connection import get_db
+from api.posts.cleanup import (OpsRateLimiter, delete_author_posts,
+                               purge_pending_authors)
+from api.posts.storage import get_post_repository
+from api.users.models import User
+
+CHECKPOINT_COLLECTION = 'maintenance_checkpoints'
+CHECKPOINT_ID = 'purge_orphan_posts'
+
+
+class Command(BaseCommand):
+    help = ('MySQL 에 없는 작성자의 게시글을 삭제합니다. 사용자 삭제 시 '
+            '기록된 작성자를 먼저 처리한 뒤 작성자 id 를 배치로 순회하며, '
+            '중단되면 마지막 위치부터 이어서 실행합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='한 번에 MySQL 에서 확인할 작성자 수')
+        parser.add_argument('--chunk-size', type=int,
+                            default=settings.ORPHAN_POSTS_CHUNK_SIZE,
+                            help='한 번의 delete_many 로 지울 최대 게시글 수')
+        parser.add_argument('--ops-per-sec', type=float,
+                            default=settings.ORPHAN_POSTS_OPS_PER_SEC,
+                            help='초당 최대 Mongo 작업 수 (0: 제한 없음)')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='실행할 최대 배치 수 (기본: 끝까지)')
+        parser.add_argument('--restart', action='store_true',
+                            help='저장된 위치를 무시하고 처음부터 실행')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='삭제하지 않고 고아 작성자만 출력')
+        parser.add_argument('--pending-only', action='store_true',
+                            help='사용자 삭제 시 기록된 작성자만 처리')
+
+    def handle(self, *args, **options):
+        limiter = OpsRateLimiter(options['ops_per_sec'])
+        if not options['dry_run']:
+            pending, deleted = purge_pending_authors(
+                chunk_size=options['chunk_size'], limiter=limiter
+            )
+            self.stdout.write(
+                f'삭제된 사용자 {pending}명의 게시글 {deleted}개를 삭제했습니다.'
+            )
+        if options['pending_only']:
+            return
+
+        checkpoints = get_db()[CHECKPOINT_COLLECTION]
+        checkpoint = None if options['restart'] else \
+            checkpoints.find_one({'_id': CHECKPOINT_ID})
+        after = checkpoint['last_author_id'] if checkpoint else None
+        if after is not None:
+            self.stdout.write(f'작성자 id {after} 다음부터 이어서 실행합니다.')
+
+        repository = get_post_repository()
+        authors = orphans = deleted = batches = 0
+
+        while options['max_batches'] is None \
+                or batches < options['max_batches']:
+            # 작성자마다 seek 하므로 읽기마다 속도 제한
+            author_ids = repository.author_ids(after=after,
+                                               limit=options['batch_size'],
+                                               wait=limiter.wait)
+            if not author_ids:
+                # 끝까지 순회했으면 다음 실행은 처음부터
+                if not options['dry_run']:
+                    checkpoints.delete_one({'_id': CHECKPOINT_ID})
+                break
+
+            existing = set(User.objects.filter(
+                id__in=author_ids
+            ).values_list('id', flat=True))
+            missing = [author_id for author_id in author_ids
+                       if author_id not in existing]
+            for author_id in missing:
+                if options['dry_run']:
+                    self.stdout.write(f'고아 작성자: {author_id}')
+                    continue
+                deleted += delete_author_posts(
+                    author_id, chunk_size=options['chunk_size'],
+                    limiter=limiter
+                )
+
+            authors += len(author_ids)
+            orphans += len(missing)
+            batches += 1
+            after = author_ids[-1]
+            if not options['dry_run']:
+                checkpoints.replace_one(
+                    {'_id': CHECKPOINT_ID},
+                    {'last_author_id': after, 'updated_at': datetime.now()},
+                    upsert=True
+                )
+
+        self.stdout.write(
+            f'작성자 {authors}명 중 {orphans}명의 게시글 {deleted}개를 '
+            f'삭제했습니다. ({batches} batches)'
+        )
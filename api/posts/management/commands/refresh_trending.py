@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from api.posts.storage import get_post_repository
+
+
+class Command(BaseCommand):
+    help = ('최근 게시글의 인기 점수를 다시 계산해 posts_trending 을 갱신합니다. '
+            '(cron 등으로 주기 실행하거나 --interval 로 반복 실행)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='N초마다 반복 실행 (기본: 한 번만 실행)')
+
+    def handle(self, *args, **options):
+        repository = get_post_repository()
+        while True:
+            start = time.perf_counter()
+            count = repository.refresh_trending()
+            self.stdout.write(
+                f'인기 게시글 {count}건 갱신 '
+                f'({(time.perf_counter() - start) * 1000:.1f}ms)'
+            )
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
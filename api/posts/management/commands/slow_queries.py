@@ -0,0 +1,64 @@
+import json
+from datetime import datetime, timedelta, timezone
+from django.core.management.base import BaseCommand
+from mongoengine.connection import get_db
+from api.posts.slowlog import SLOW_LOG_COLLECTION
+
+
+class Command(BaseCommand):
+    help = 'posts 컬렉션의 느린 커맨드 기록을 쿼리 shape 별로 조회합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=int, default=60,
+                            help='최근 N분 동안의 기록만 조회 (기본: 60)')
+        parser.add_argument('--command', default=None,
+                            help='커맨드 이름으로 필터 (find, count, ...)')
+        parser.add_argument('--limit', type=int, default=20,
+                            help='출력할 shape 수 (기본: 20)')
+        parser.add_argument('--raw', action='store_true',
+                            help='shape 별 집계 대신 개별 기록 출력')
+
+    def handle(self, *args, **options):
+        collection = get_db()[SLOW_LOG_COLLECTION]
+        match = {'at': {'$gte': datetime.now(timezone.utc)
+                        - timedelta(minutes=options['since'])}}
+        if options['command']:
+            match['command'] = options['command']
+
+        if options['raw']:
+            cursor = collection.find(match, {'_id': 0}) \
+                .sort('$natural', -1).limit(options['limit'])
+            for record in cursor:
+                self.stdout.write(json.dumps(record, default=str,
+                                             ensure_ascii=False))
+            return
+
+        pipeline = [
+            {'$match': match},
+            {'$sort': {'at': 1}},
+            {'$group': {
+                '_id': '$shape_key',
+                'command': {'$last': '$command'},
+                'filter_shape': {'$last': '$filter_shape'},
+                'sort': {'$last': '$sort'},
+                'count': {'$sum': 1},
+                'avg_ms': {'$avg': '$duration_ms'},
+                'max_ms': {'$max': '$duration_ms'},
+                'last_at': {'$last': '$at'},
+                'explains': {'$push': '$explain'},
+            }},
+            {'$sort': {'count': -1, 'max_ms': -1}},
+            {'$limit': options['limit']},
+        ]
+        for group in collection.aggregate(pipeline):
+            explains = [item for item in group['explains'] if item]
+            self.stdout.write(json.dumps({
+                'command': group['command'],
+                'filter_shape': group['filter_shape'],
+                'sort': group['sort'],
+                'count': group['count'],
+                'avg_ms': round(group['avg_ms'], 2),
+                'max_ms': round(group['max_ms'], 2),
+                'last_at': group['last_at'],
+                'explain': explains[-1] if explains else None,
+            }, default=str, ensure_ascii=False))
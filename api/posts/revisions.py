@@ -0,0 +1,116 @@
+"""
+게시글 수정 이력
+
+게시글을 수정할 때마다 덮어쓰기 전 내용을 리비전으로 남깁니다.
+(리비전 n 은 n 번째 수정 직전의 내용, 현재 게시글은 post.revision + 1)
+
+- 리비전 번호가 POST_REVISION_SNAPSHOT_INTERVAL 의 배수면 전체 내용(snapshot),
+  나머지는 바로 다음 리비전(또는 현재 게시글) 내용으로부터 되돌리는
+  역방향 delta 만 저장합니다.
+- delta 는 수정 시점에 이미 가진 새/이전 내용만으로 계산하므로 추가 조회가
+  없고, 리비전 m 은 m 이상 가장 가까운 snapshot(없으면 현재 게시글)부터
+  delta 를 거꾸로 적용해 복원합니다. 범위 조회 한 번에 최대
+  POST_REVISION_SNAPSHOT_INTERVAL 개의 문서만 읽습니다.
+"""
+from datetime import datetime
+from difflib import SequenceMatcher
+from django.conf import settings
+
+
+class RevisionConflict(Exception):
+    """같은 리비전 번호로 동시에 수정된 경우"""
+
+
+def snapshot_interval():
+    return max(settings.POST_REVISION_SNAPSHOT_INTERVAL, 1)
+
+
+def make_delta(source, target):
+    """
+    source 를 target 으로 바꾸는 줄 단위 delta
+    [시작, 끝] 은 source 의 해당 줄 범위 복사, 문자열은 그대로 삽입
+    """
+    source_lines = source.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = SequenceMatcher(None, source_lines, target_lines,
+                              autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j1 < j2:
+            ops.append(''.join(target_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(source, ops):
+    source_lines = source.splitlines(keepends=True)
+    return ''.join(op if isinstance(op, str)
+                   else ''.join(source_lines[op[0]:op[1]])
+                   for op in ops)
+
+
+def build_revision(post_id, number, old, new, editor_id=None, now=None):
+    """
+    old(수정 전 title/content)를 리비전 number 로 저장할 문서
+    new 는 수정 후 내용 (delta 의 기준)
+    """
+    revision = {
+        'post_id': post_id,
+        'number': number,
+        'created_at': now or datetime.now(),
+        'editor_id': editor_id,
+        'title': old['title'],
+        'length': len(old['content']),
+    }
+    if number % snapshot_interval() == 0:
+        revision['snapshot'] = True
+        revision['content'] = old['content']
+    else:
+        revision['snapshot'] = False
+        revision['delta'] = make_delta(new['content'], old['content'])
+    return revision
+
+
+def revision_range(number, latest):
+    """
+    리비전 number 복원에 필요한 리비전 번호 범위 (number, 끝)
+    끝은 number 이상 가장 가까운 snapshot, 없으면 마지막 리비전 latest
+    """
+    interval = snapshot_interval()
+    snapshot = -(-number // interval) * interval
+    return number, min(snapshot, latest)
+
+
+def reconstruct(number, revisions, current_content):
+    """
+    revision_range 범위의 리비전 문서로 리비전 number 를 복원
+    (범위 끝이 snapshot 이 아니면 현재 게시글 내용부터 되돌림)
+    """
+    revisions = sorted(revisions, key=lambda revision: revision['number'],
+                       reverse=True)
+    content = current_content
+    for revision in revisions:
+        if revision['snapshot']:
+            content = revision['content']
+        else:
+            content = apply_delta(content, revision['delta'])
+    target = revisions[-1]
+    return {
+        'number': number,
+        'title': target['title'],
+        'content': content,
+        'created_at': target['created_at'],
+        'editor_id': target['editor_id'],
+    }
+
+
+def summarize(revision):
+    """본문 없이 목록에 보여줄 리비전 정보"""
+    return {
+        'number': revision['number'],
+        'title': revision['title'],
+        'length': revision['length'],
+        'created_at': revision['created_at'],
+        'editor_id': revision['editor_id'],
+    }
@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from api.users.models import User
+from .cleanup import queue_author_purge
+
+
+@receiver(post_delete, sender=User,
+          dispatch_uid='api.posts.delete_author_posts')
+def schedule_author_posts_cleanup(sender, instance, **kwargs):
+    """
+    사용자 삭제가 커밋된 뒤 게시글 삭제를 기록
+    (실제 삭제는 purge_orphan_posts 명령이 속도를 제한하며 실행)
+    """
+    author_id = instance.pk
+    transaction.on_commit(lambda: queue_author_purge(author_id))
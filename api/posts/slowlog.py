@@ -0,0 +1,225 @@
+"""
+posts 컬렉션 느린 커맨드 기록
+
+커맨드 시작 시에는 참조만 보관하고, 임계값을 넘긴 커맨드만 쿼리 shape 을
+계산해 기록합니다. explain 실행과 저장은 요청 스레드를 막지 않도록
+별도 스레드에서 처리합니다. settings 에서 import 되므로 Django 설정에
+의존하지 않습니다.
+"""
+import json
+import logging
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from pymongo import monitoring
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+SLOW_LOG_COLLECTION = 'posts_slow_log'
+SLOW_LOG_SIZE = 64 * 1024 * 1024
+
+# 커맨드 이름 -> 필터가 들어있는 위치
+FILTER_KEYS = {
+    'find': 'filter',
+    'count': 'query',
+    'distinct': 'query',
+    'findAndModify': 'query',
+}
+WRITE_COMMANDS = {'update': 'updates', 'delete': 'deletes'}
+EXPLAINABLE_COMMANDS = {'find', 'aggregate', 'count', 'distinct'}
+# explain 에 그대로 넘기면 안 되는 세션/드라이버 필드
+DRIVER_FIELDS = {'lsid', 'txnNumber', 'readPreference', 'readConcern',
+                 'writeConcern', 'cursor', 'batchSize'}
+
+
+def query_shape(value):
+    """
+    값은 타입 이름으로 바꾸고 필드/연산자 구조만 남긴 쿼리 shape
+    {'author_id': 3, 'created_at': {'$gt': dt}}
+        -> {'author_id': 'int', 'created_at': {'$gt': 'datetime'}}
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $in 등 값 목록은 길이와 상관없이 같은 shape 으로 취급
+        shapes = []
+        for item in value:
+            shape = query_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return type(value).__name__
+
+
+def extract_query(command_name, command):
+    """커맨드 문서에서 (filter, sort, projection) 추출"""
+    if command_name in FILTER_KEYS:
+        return (command.get(FILTER_KEYS[command_name]),
+                command.get('sort'),
+                command.get('projection') or command.get('fields'))
+    if command_name in WRITE_COMMANDS:
+        statements = command.get(WRITE_COMMANDS[command_name]) or [{}]
+        return statements[0].get('q'), None, None
+    if command_name == 'aggregate':
+        pipeline = command.get('pipeline') or []
+        stages = {key: stage[key] for stage in pipeline for key in stage}
+        return (stages.get('$match'), stages.get('$sort'),
+                stages.get('$project'))
+    return None, None, None
+
+
+def summarize_explain(explain):
+    """
+    explain(executionStats) 결과에서 winning plan 단계와 검사/반환 비율 요약
+    """
+    planner = explain.get('queryPlanner', {})
+    plan = planner.get('winningPlan', {})
+    # SBE 엔진은 winningPlan.queryPlan 아래에 단계가 들어있음
+    plan = plan.get('queryPlan', plan)
+    stages = []
+    while plan:
+        stage = plan.get('stage', '?')
+        if plan.get('indexName'):
+            stage = f"{stage}({plan['indexName']})"
+        stages.append(stage)
+        plan = plan.get('inputStage') or \
+            (plan.get('inputStages') or [None])[0]
+
+    stats = explain.get('executionStats', {})
+    returned = stats.get('nReturned', 0)
+    docs = stats.get('totalDocsExamined', 0)
+    keys = stats.get('totalKeysExamined', 0)
+    return {
+        'winning_plan': ' <- '.join(stages),
+        'n_returned': returned,
+        'docs_examined': docs,
+        'keys_examined': keys,
+        'docs_examined_per_returned': round(docs / max(returned, 1), 2),
+        'execution_ms': stats.get('executionTimeMillis'),
+    }
+
+
+class SlowCommandListener(monitoring.CommandListener):
+    """
+    collection 에 대한 커맨드 중 threshold_ms 이상 걸린 것을 기록
+    explain_sample_rate 비율만큼 explain(executionStats) 결과를 첨부합니다.
+    """
+    def __init__(self, threshold_ms=100, explain_sample_rate=0.1,
+                 collection='posts', max_queue=100):
+        self.threshold_micros = threshold_ms * 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.collection = collection
+        self.dropped = 0
+        self._pending = {}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._collection_ready = False
+
+    def started(self, event):
+        if event.command.get(event.command_name) != self.collection:
+            return
+        self._pending[(event.connection_id, event.request_id)] = \
+            event.command
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed=False):
+        command = self._pending.pop(
+            (event.connection_id, event.request_id), None
+        )
+        if command is None or event.duration_micros < self.threshold_micros:
+            return
+
+        query, sort, projection = extract_query(event.command_name,
+                                                command)
+        record = {
+            'at': datetime.now(timezone.utc),
+            'database': event.database_name,
+            'collection': self.collection,
+            'command': event.command_name,
+            'filter_shape': query_shape(query or {}),
+            'sort': sort,
+            'projection': projection,
+            'duration_ms': event.duration_micros / 1000,
+            'failed': failed,
+        }
+        record['shape_key'] = json.dumps(
+            [record['command'], record['filter_shape'], sort],
+            sort_keys=True, default=str
+        )
+        explain_command = None
+        if (event.command_name in EXPLAINABLE_COMMANDS
+                and random.random() < self.explain_sample_rate):
+            explain_command = {key: value for key, value in command.items()
+                               if not key.startswith('$')
+                               and key not in DRIVER_FIELDS}
+        try:
+            self._queue.put_nowait((record, explain_command))
+        except queue.Full:
+            self.dropped += 1
+            return
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='mongo-slowlog', daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            record, explain_command = self._queue.get()
+            try:
+                self.write(record, explain_command)
+            except Exception:
+                logger.exception('느린 커맨드 기록 실패')
+            finally:
+                self._queue.task_done()
+
+    def write(self, record, explain_command=None):
+        """
+        explain 첨부 후 구조화 로그와 capped 컬렉션에 기록
+        ($merge aggregate 처럼 explain 할 수 없는 커맨드도 오류만 남기고 기록)
+        """
+        from mongoengine.connection import get_db
+
+        db = get_db()
+        if explain_command is not None:
+            try:
+                explain = db.command('explain', explain_command,
+                                     verbosity='executionStats')
+            except PyMongoError as error:
+                record['explain'] = None
+                record['explain_error'] = str(error)
+            else:
+                record['explain'] = summarize_explain(explain)
+
+        logger.warning(json.dumps(record, default=str, ensure_ascii=False))
+        if not self._collection_ready:
+            ensure_slow_log_collection(db)
+            self._collection_ready = True
+        db[SLOW_LOG_COLLECTION].insert_one(record)
+
+
+def ensure_slow_log_collection(db):
+    """오래된 기록이 자동으로 밀려나도록 capped 컬렉션으로 생성"""
+    if SLOW_LOG_COLLECTION in db.list_collection_names(
+            filter={'name': SLOW_LOG_COLLECTION}):
+        return
+    try:
+        db.create_collection(SLOW_LOG_COLLECTION, capped=True,
+                             size=SLOW_LOG_SIZE)
+    except CollectionInvalid:
+        # 다른 워커가 먼저 생성한 경우
+        pass
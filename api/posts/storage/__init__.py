@@ -0,0 +1,32 @@
+"""
+게시글 저장소
+
+settings.POSTS_STORAGE_BACKEND 로 선택합니다.
+- 'mongo': mongoengine Post Document (기본)
+- 'memory': 프로세스 메모리 (MongoDB 없이 view/직렬화 비용 측정용)
+"""
+from django.conf import settings
+from django.utils.module_loading import import_string
+from .base import PostNotFound, PostRepository, RevisionNotFound
+
+BACKENDS = {
+    'mongo': 'api.posts.storage.mongo.MongoPostRepository',
+    'memory': 'api.posts.storage.memory.MemoryPostRepository',
+}
+
+_repositories = {}
+
+
+def get_post_repository():
+    """설정된 백엔드의 저장소 (프로세스당 하나)"""
+    backend = getattr(settings, 'POSTS_STORAGE_BACKEND', 'mongo')
+    repository = _repositories.get(backend)
+    if repository is None:
+        repository = _repositories.setdefault(
+            backend, import_string(BACKENDS[backend])()
+        )
+    return repository
+
+
+__all__ = ['PostNotFound', 'PostRepository', 'RevisionNotFound',
+           'get_post_repository']
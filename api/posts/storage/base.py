@@ -0,0 +1,125 @@
+from django.core.exceptions import ValidationError
+
+
+class PostNotFound(Exception):
+    """존재하지 않거나 형식이 잘못된 게시글 id"""
+
+
+class RevisionNotFound(Exception):
+    """게시글에 없는 리비전 번호"""
+
+
+def clean_author_id(author_id):
+    """
+    filter(author_id=...) 로 받은 값을 정수로 변환
+    (형식이 잘못되면 두 백엔드 모두 view 가 400 으로 응답하는 ValidationError)
+    """
+    try:
+        return int(author_id)
+    except (TypeError, ValueError):
+        raise ValidationError({'author_id': ['정수여야 합니다.']})
+
+
+class PostRepository:
+    """
+    게시글 저장소 인터페이스
+
+    반환되는 게시글 객체는 id, title, content, author_id, created_at, views,
+    tags, revision(수정 횟수) 속성을 가집니다. filter 결과는 count() 와 slicing 을 지원해
+    PageNumberPagination 에 그대로 넘길 수 있습니다.
+    """
+    def create(self, title, content, author_id, tags=()):
+        """tags 는 normalize_tags 로 정규화된 목록"""
+        raise NotImplementedError
+
+    def get(self, post_id):
+        """없으면 PostNotFound"""
+        raise NotImplementedError
+
+    def get_many(self, post_ids):
+        """
+        유효한 ObjectId 문자열 목록을 한 번에 조회
+        {id 문자열: 게시글} 반환 (없는 id 는 포함되지 않음)
+        """
+        raise NotImplementedError
+
+    def filter(self, author_id=None):
+        """
+        작성 순서(created_at 오름차순)로 정렬된 게시글 목록
+        author_id 가 정수가 아니면 ValidationError (clean_author_id)
+        """
+        raise NotImplementedError
+
+    def filter_by_tags(self, tags, match='any', after=None, limit=10):
+        """
+        tags 중 하나(any) 또는 전부(all)를 가진 게시글을
+        (created_at, id) 오름차순으로 after 다음부터 limit 개
+        """
+        raise NotImplementedError
+
+    def update(self, post, editor_id=None, **fields):
+        """
+        title/content 가 바뀌면 수정 전 내용을 리비전으로 같은 쓰기에 남기고
+        (같은 리비전으로 동시에 수정되면 RevisionConflict),
+        tags 가 바뀌면 태그별 게시글 수도 함께 갱신
+        """
+        raise NotImplementedError
+
+    def revisions(self, post, before=None, limit=20):
+        """
+        리비전 번호 before 미만의 리비전을 최신순으로 limit 개
+        본문 없이 api.posts.revisions.summarize 형식으로 반환
+        """
+        raise NotImplementedError
+
+    def revision(self, post, number):
+        """리비전 number 의 내용 (없으면 RevisionNotFound)"""
+        raise NotImplementedError
+
+    def delete(self, post):
+        raise NotImplementedError
+
+    def increment_views(self, counts):
+        """{게시글 id: 증가량} 을 한 번에 반영 (없는 게시글은 무시)"""
+        raise NotImplementedError
+
+    def refresh_trending(self, now=None):
+        """인기 게시글을 다시 계산하고 항목 수를 반환"""
+        raise NotImplementedError
+
+    def trending(self, limit):
+        """
+        점수 내림차순 인기 게시글
+        (게시글 속성과 score 를 가지며 refresh_trending 시점 기준)
+        """
+        raise NotImplementedError
+
+    def author_ids(self, after=None, limit=1000, wait=None):
+        """
+        게시글이 있는 작성자 id 를 after 다음부터 오름차순으로 limit 개
+        wait 를 주면 저장소 읽기 작업마다 먼저 호출합니다. (속도 제한)
+        """
+        raise NotImplementedError
+
+    def delete_by_author(self, author_id, limit=1000):
+        """
+        작성자의 게시글을 최대 limit 개 삭제하고 삭제한 수를 반환
+        (0 을 반환할 때까지 반복 호출)
+        """
+        raise NotImplementedError
+
+    def tag_counts(self, limit=100):
+        """게시글 수 내림차순 [(태그, 게시글 수)]"""
+        raise NotImplementedError
+
+    def archive(self, before, limit=1000):
+        """
+        created_at 이 before 이전인 게시글을 오래된 순으로 최대 limit 개
+        보관 저장소로 옮기고 옮긴 수를 반환 (0 을 반환할 때까지 반복 호출)
+        옮긴 게시글도 get/filter 등 조회 결과에는 그대로 나타납니다.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """모든 게시글 삭제 (테스트용)"""
+        raise NotImplementedError
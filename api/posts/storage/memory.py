@@ -0,0 +1,287 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import datetime
+from itertools import count
+from bson import ObjectId
+from bson.errors import InvalidId
+from api.posts.revisions import (build_revision, reconstruct,
+                                 revision_range, summarize)
+from api.posts.tags import tag_deltas
+from api.posts.trending import trending_options, trending_score
+from .base import (PostNotFound, PostRepository, RevisionNotFound,
+                   clean_author_id)
+
+
+class MemoryPost:
+    __slots__ = ('id', 'title', 'content', 'author_id', 'created_at',
+                 'views', 'tags', 'revision', 'sort_key')
+
+    def __init__(self, id, title, content, author_id, created_at, sort_key,
+                 tags=()):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.author_id = author_id
+        self.created_at = created_at
+        self.views = 0
+        self.tags = list(tags)
+        self.revision = 0
+        self.sort_key = sort_key
+
+
+class MemoryTrendingPost:
+    __slots__ = ('id', 'title', 'author_id', 'created_at', 'views', 'score')
+
+    def __init__(self, post, score):
+        self.id = post.id
+        self.title = post.title
+        self.author_id = post.author_id
+        self.created_at = post.created_at
+        self.views = post.views
+        self.score = score
+
+
+class MemoryQuery:
+    """
+    정렬된 인덱스 위의 지연 조회 결과
+    count() 는 O(1), slicing 은 필요한 구간만 게시글로 변환합니다.
+    """
+    def __init__(self, repository, index):
+        self._repository = repository
+        self._index = index
+
+    def count(self):
+        return len(self._index)
+
+    __len__ = count
+
+    def __getitem__(self, item):
+        with self._repository.lock:
+            keys = self._index[item]
+            posts = self._repository.posts
+            if isinstance(item, slice):
+                return [posts[key[-1]] for key in keys]
+            return posts[keys[-1]]
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+class MemoryPostRepository(PostRepository):
+    """
+    MongoDB 없이 API 를 실행/프로파일링하기 위한 프로세스 메모리 저장소
+    created_at 전체 인덱스와 author_id 별 인덱스를 (created_at, seq, id)
+    정렬 리스트로 유지합니다.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.posts = {}
+        self._by_created = []
+        self._by_author = {}
+        self._by_tag = {}
+        self._tag_counts = Counter()
+        # 보관된 게시글 id (메모리 저장소는 조회 경로가 같아 표시만 함)
+        self._archived = set()
+        # 게시글 id -> 리비전 목록 (번호 순)
+        self._revisions = {}
+        self._trending = []
+        self._seq = count()
+
+    def create(self, title, content, author_id, tags=()):
+        created_at = datetime.now()
+        post_id = ObjectId()
+        key = (created_at, next(self._seq), post_id)
+        post = MemoryPost(post_id, title, content, author_id, created_at,
+                          key, tags)
+        with self.lock:
+            self.posts[post_id] = post
+            insort(self._by_created, key)
+            insort(self._by_author.setdefault(author_id, []), key)
+            self._index_tags(post, tag_deltas((), post.tags))
+        return post
+
+    def get(self, post_id):
+        try:
+            return self.posts[ObjectId(post_id)]
+        except (KeyError, TypeError, InvalidId):
+            raise PostNotFound(post_id)
+
+    def get_many(self, post_ids):
+        with self.lock:
+            posts = (self.posts.get(ObjectId(post_id))
+                     for post_id in post_ids)
+            return {str(post.id): post for post in posts
+                    if post is not None}
+
+    def filter(self, author_id=None):
+        if author_id:
+            return MemoryQuery(
+                self, self._by_author.get(clean_author_id(author_id), [])
+            )
+        return MemoryQuery(self, self._by_created)
+
+    def filter_by_tags(self, tags, match='any', after=None, limit=10):
+        with self.lock:
+            start = ()
+            if after is not None:
+                created_at, post_id = after
+                post = self.posts.get(post_id)
+                start = post.sort_key if post is not None \
+                    else (created_at, float('inf'))
+            indexes = [self._by_tag.get(tag, []) for tag in tags]
+            if match == 'all':
+                # 가장 작은 인덱스만 순회하며 나머지 태그를 확인
+                candidates = min(indexes, key=len)
+                required = set(tags)
+            else:
+                candidates = heapq.merge(*indexes)
+                required = set()
+
+            posts = []
+            previous = None
+            for key in candidates:
+                if key <= start or key == previous:
+                    continue
+                previous = key
+                post = self.posts[key[-1]]
+                if required <= set(post.tags):
+                    posts.append(post)
+                    if len(posts) == limit:
+                        break
+            return posts
+
+    def update(self, post, editor_id=None, **fields):
+        with self.lock:
+            old = {'title': post.title, 'content': post.content}
+            old_tags = list(post.tags)
+            for name, value in fields.items():
+                setattr(post, name, value)
+            new = {'title': post.title, 'content': post.content}
+            if new != old:
+                post.revision += 1
+                self._revisions.setdefault(post.id, []).append(
+                    build_revision(post.id, post.revision, old, new,
+                                   editor_id)
+                )
+            self._index_tags(post, tag_deltas(old_tags, post.tags))
+        return post
+
+    def revisions(self, post, before=None, limit=20):
+        with self.lock:
+            revisions = self._revisions.get(post.id, [])
+            end = len(revisions) if before is None \
+                else max(min(before - 1, len(revisions)), 0)
+            return [summarize(revision) for revision in
+                    reversed(revisions[max(end - limit, 0):end])]
+
+    def revision(self, post, number):
+        with self.lock:
+            if not 1 <= number <= post.revision:
+                raise RevisionNotFound(number)
+            low, high = revision_range(number, post.revision)
+            revisions = self._revisions.get(post.id, [])[low - 1:high]
+            return reconstruct(number, revisions, post.content)
+
+    def delete(self, post):
+        with self.lock:
+            if self.posts.pop(post.id, None) is None:
+                return
+            self._remove(self._by_created, post.sort_key)
+            author_index = self._by_author[post.author_id]
+            self._remove(author_index, post.sort_key)
+            if not author_index:
+                del self._by_author[post.author_id]
+            self._index_tags(post, tag_deltas(post.tags, ()))
+            self._archived.discard(post.id)
+            self._revisions.pop(post.id, None)
+
+    def increment_views(self, counts):
+        with self.lock:
+            for post_id, amount in counts.items():
+                post = self.posts.get(ObjectId(post_id))
+                if post is not None:
+                    post.views += amount
+
+    def refresh_trending(self, now=None):
+        now = now or datetime.now()
+        options = trending_options()
+        with self.lock:
+            start = bisect_left(self._by_created,
+                                (now - options['window'],))
+            recent = [self.posts[key[-1]]
+                      for key in self._by_created[start:]]
+        trending = sorted(
+            (MemoryTrendingPost(post, trending_score(
+                post.views, (now - post.created_at).total_seconds(),
+                options['gravity']))
+             for post in recent),
+            key=lambda item: item.score, reverse=True
+        )[:options['size']]
+        self._trending = trending
+        return len(trending)
+
+    def trending(self, limit):
+        return self._trending[:limit]
+
+    def author_ids(self, after=None, limit=1000, wait=None):
+        if wait is not None:
+            wait()
+        with self.lock:
+            authors = sorted(self._by_author)
+        start = 0 if after is None else bisect_right(authors, after)
+        return authors[start:start + limit]
+
+    def delete_by_author(self, author_id, limit=1000):
+        with self.lock:
+            keys = self._by_author.get(author_id, [])[:limit]
+            posts = [self.posts[key[-1]] for key in keys]
+            for post in posts:
+                self.delete(post)
+            deleted = {post.id for post in posts}
+            self._trending = [item for item in self._trending
+                              if item.id not in deleted]
+        return len(posts)
+
+    def tag_counts(self, limit=100):
+        with self.lock:
+            return self._tag_counts.most_common(limit)
+
+    def archive(self, before, limit=1000):
+        with self.lock:
+            end = bisect_left(self._by_created, (before,))
+            ids = [key[-1] for key in self._by_created[:end]
+                   if key[-1] not in self._archived][:limit]
+            self._archived.update(ids)
+        return len(ids)
+
+    def _index_tags(self, post, deltas):
+        for tag, delta in deltas.items():
+            index = self._by_tag.setdefault(tag, [])
+            if delta > 0:
+                insort(index, post.sort_key)
+            else:
+                self._remove(index, post.sort_key)
+                if not index:
+                    del self._by_tag[tag]
+            self._tag_counts[tag] += delta
+            if self._tag_counts[tag] <= 0:
+                del self._tag_counts[tag]
+
+    def clear(self):
+        with self.lock:
+            self._trending = []
+            self._by_tag.clear()
+            self._tag_counts.clear()
+            self._archived.clear()
+            self._revisions.clear()
+            self.posts.clear()
+            self._by_created.clear()
+            self._by_author.clear()
+
+    @staticmethod
+    def _remove(index, key):
+        position = bisect_left(index, key)
+        if position < len(index) and index[position] == key:
+            del index[position]
@@ -0,0 +1,441 @@
+import uuid
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
+from django.core.cache import cache
+from mongoengine.connection import get_db
+from pymongo import InsertOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import (ClientBulkWriteException, DuplicateKeyError,
+                            InvalidOperation)
+from api.posts.documents import (ArchivedPost, Post, PostRevision,
+                                 PostTagCount, TrendingPost)
+from api.posts.revisions import (RevisionConflict, build_revision,
+                                 reconstruct, revision_range, summarize)
+from api.posts.tags import tag_deltas
+from api.posts.trending import trending_options, trending_pipeline
+from .base import (PostNotFound, PostRepository, RevisionNotFound,
+                   clean_author_id)
+
+# 보관 경계: created_at 이 watermark 이하인 게시글은 모두 posts_archive 에 있음
+WATERMARK_COLLECTION = 'maintenance_checkpoints'
+WATERMARK_ID = 'archive_posts'
+WATERMARK_CACHE_KEY = 'posts:archive_watermark'
+# posts_archive count 캐시 (보관/삭제 시 보관 경계 문서의 version 을 바꿔
+# 다른 프로세스의 캐시도 한 번에 무효화)
+ARCHIVE_COUNT_CACHE_KEY = 'posts:archive_count:{}:{}'
+
+
+class TieredQuerySet:
+    """
+    posts_archive(오래된 게시글) 뒤에 posts 를 이어 붙인 조회 결과
+    보관된 게시글이 모두 더 오래되었으므로 작성 순서가 유지되며,
+    slicing 은 요청 구간이 걸친 컬렉션만 조회합니다.
+    archived_count 를 주면 posts_archive count 대신 사용합니다. (캐시된 값)
+    """
+    def __init__(self, archived, hot, archived_count=None):
+        self._archived = archived
+        self._hot = hot
+        self._archived_count = archived_count
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            if self._archived_count is None:
+                self._archived_count = self._archived.count()
+            self._count = self._archived_count + self._hot.count()
+        return self._count
+
+    __len__ = count
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start, stop, _ = item.indices(self.count())
+        archived = self._archived_count
+        posts = []
+        if start < archived:
+            posts += list(self._archived[start:min(stop, archived)])
+        if stop > archived:
+            posts += list(self._hot[max(start - archived, 0):
+                                    stop - archived])
+        return posts
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+class MongoPostRepository(PostRepository):
+    """
+    mongoengine Post Document 기반 저장소
+    archive 로 옮긴 오래된 게시글은 조회 범위가 보관 경계(watermark)
+    이전에 걸칠 때만 posts_archive 에서 이어서 조회합니다.
+    id 로 찾는 조회는 posts 에 없으면 보관 경계와 관계없이 posts_archive 를
+    확인합니다. (다른 프로세스가 방금 옮긴 게시글도 찾도록)
+    """
+    # MongoClient.bulk_write (MongoDB 8.0+) 사용 가능 여부
+    client_bulk_write = True
+
+    def create(self, title, content, author_id, tags=()):
+        post = Post(title=title, content=content, author_id=author_id,
+                    tags=list(tags))
+        post.save()
+        self._inc_tag_counts(tag_deltas((), post.tags))
+        return post
+
+    def get(self, post_id):
+        try:
+            object_id = ObjectId(post_id)
+        except (InvalidId, TypeError):
+            raise PostNotFound(post_id)
+        post = Post.objects(id=object_id).first()
+        if post is None:
+            post = ArchivedPost.objects(id=object_id).first()
+        if post is None:
+            raise PostNotFound(post_id)
+        return post
+
+    def get_many(self, post_ids):
+        object_ids = [ObjectId(post_id) for post_id in post_ids]
+        fields = ('title', 'content', 'author_id', 'created_at', 'views',
+                  'tags')
+        posts = {str(post.id): post for post in
+                 Post.objects(id__in=object_ids).only(*fields)}
+        missing = [object_id for object_id in object_ids
+                   if str(object_id) not in posts]
+        if missing:
+            posts.update((str(post.id), post) for post in
+                         ArchivedPost.objects(id__in=missing).only(*fields))
+        return posts
+
+    def filter(self, author_id=None):
+        query = {'author_id': clean_author_id(author_id)} if author_id \
+            else {}
+        # count 캐시 키의 version 을 위해 보관 경계를 캐시 없이 조회
+        checkpoint = get_db()[WATERMARK_COLLECTION].find_one(
+            {'_id': WATERMARK_ID}
+        )
+        if checkpoint is None:
+            return Post.objects(**query)
+        watermark = checkpoint['watermark']
+        cache.set(WATERMARK_CACHE_KEY, watermark,
+                  settings.POSTS_ARCHIVE_WATERMARK_CACHE_SECONDS)
+        return TieredQuerySet(
+            ArchivedPost.objects(**query),
+            Post.objects(created_at__gt=watermark, **query),
+            archived_count=self._archived_count(
+                query, checkpoint.get('version', '')
+            )
+        )
+
+    def filter_by_tags(self, tags, match='any', after=None, limit=10):
+        watermark = self._watermark()
+        if watermark is None or (after is not None and after[0] > watermark):
+            return self._tag_page(Post, tags, match, after, limit)
+
+        posts = self._tag_page(ArchivedPost, tags, match, after, limit)
+        if len(posts) < limit:
+            posts += self._tag_page(Post, tags, match, None,
+                                    limit - len(posts), newer=watermark)
+        return posts
+
+    def update(self, post, editor_id=None, **fields):
+        old = {'title': post.title, 'content': post.content}
+        old_tags = list(post.tags)
+        for name, value in fields.items():
+            setattr(post, name, value)
+        new = {'title': post.title, 'content': post.content}
+        revision = None
+        if new != old:
+            revision = build_revision(post.pk, post.revision + 1, old, new,
+                                      editor_id)
+            post.revision += 1
+        post.validate()
+        try:
+            previous_tags = self._write_update(post, revision,
+                                               post.tags != old_tags)
+        except RevisionConflict:
+            post.revision -= 1
+            raise
+        if previous_tags is not None:
+            self._inc_tag_counts(tag_deltas(previous_tags, post.tags))
+        return post
+
+    def revisions(self, post, before=None, limit=20):
+        query = {'post_id': post.pk}
+        if before is not None:
+            query['number'] = {'$lt': before}
+        rows = PostRevision._get_collection().find(
+            query, {'content': 0, 'delta': 0}
+        ).sort('number', -1).limit(limit)
+        return [summarize(row) for row in rows]
+
+    def revision(self, post, number):
+        if not 1 <= number <= post.revision:
+            raise RevisionNotFound(number)
+        low, high = revision_range(number, post.revision)
+        rows = list(PostRevision._get_collection().find(
+            {'post_id': post.pk, 'number': {'$gte': low, '$lte': high}}
+        ))
+        if len(rows) != high - low + 1:
+            raise RevisionNotFound(number)
+        return reconstruct(number, rows, post.content)
+
+    def delete(self, post):
+        post.delete()
+        PostRevision._get_collection().delete_many({'post_id': post.pk})
+        self._inc_tag_counts(tag_deltas(post.tags, ()))
+        if isinstance(post, ArchivedPost):
+            self._invalidate_archived_counts()
+
+    def increment_views(self, counts):
+        operations = [
+            UpdateOne({'_id': ObjectId(post_id)}, {'$inc': {'views': amount}})
+            for post_id, amount in counts.items()
+        ]
+        if not operations:
+            return
+        result = Post._get_collection().bulk_write(operations, ordered=False)
+        if result.matched_count < len(operations):
+            ArchivedPost._get_collection().bulk_write(operations,
+                                                      ordered=False)
+
+    def refresh_trending(self, now=None):
+        now = now or datetime.now()
+        TrendingPost.ensure_indexes()
+        Post._get_collection().aggregate(
+            trending_pipeline(now, **trending_options())
+        )
+        collection = TrendingPost._get_collection()
+        collection.delete_many({'refreshed_at': {'$lt': now}})
+        return collection.estimated_document_count()
+
+    def trending(self, limit):
+        return list(TrendingPost.objects.order_by('-score')[:limit])
+
+    def author_ids(self, after=None, limit=1000, wait=None):
+        author_ids = set()
+        for document in self._documents():
+            collection = document._get_collection()
+            last = after
+            # (author_id, created_at) 인덱스에서 다음 작성자 id 로 한 번씩
+            # seek 하므로 배치마다 limit 개의 인덱스 항목만 읽음
+            for _ in range(limit):
+                if wait is not None:
+                    wait()
+                query = {} if last is None else {'author_id': {'$gt': last}}
+                row = collection.find_one(query, {'_id': 0, 'author_id': 1},
+                                          sort=[('author_id', 1)])
+                if row is None:
+                    break
+                last = row['author_id']
+                author_ids.add(last)
+        return sorted(author_ids)[:limit]
+
+    def delete_by_author(self, author_id, limit=1000):
+        # posts 에 남은 게시글이 limit 보다 적으면 posts_archive 에서 채움
+        deleted = 0
+        deltas = {}
+        for document in self._documents():
+            if deleted >= limit:
+                break
+            collection = document._get_collection()
+            rows = list(collection.find(
+                {'author_id': author_id}, {'_id': 1, 'tags': 1}
+            ).limit(limit - deleted))
+            if not rows:
+                continue
+            ids = [row['_id'] for row in rows]
+            TrendingPost._get_collection().delete_many({'_id': {'$in': ids}})
+            PostRevision._get_collection().delete_many(
+                {'post_id': {'$in': ids}}
+            )
+            deleted += collection.delete_many(
+                {'_id': {'$in': ids}}
+            ).deleted_count
+            if document is ArchivedPost:
+                self._invalidate_archived_counts()
+            for row in rows:
+                for tag in row.get('tags', ()):
+                    deltas[tag] = deltas.get(tag, 0) - 1
+        self._inc_tag_counts(deltas)
+        return deleted
+
+    def tag_counts(self, limit=100):
+        return [(row.tag, row.count) for row in
+                PostTagCount.objects(count__gt=0).order_by('-count')[:limit]]
+
+    def archive(self, before, limit=1000):
+        """
+        복사 후 삭제: posts_archive 에 upsert → 보관 경계 갱신 → posts 에서
+        삭제 순서라 어느 단계에서 중단되어도 다시 실행하면 이어서 옮깁니다.
+        (경계 이하의 게시글은 posts 에 남아 있어도 조회에서 제외됨)
+        """
+        collection = Post._get_collection()
+        rows = list(collection.find({'created_at': {'$lt': before}})
+                    .sort([('created_at', 1), ('_id', 1)]).limit(limit))
+        if not rows:
+            return 0
+        ids = [row['_id'] for row in rows]
+        if len(rows) == limit:
+            # 경계와 created_at 이 같은 게시글은 같은 배치로 옮김
+            rows += collection.find({'created_at': rows[-1]['created_at'],
+                                     '_id': {'$nin': ids}})
+            ids = [row['_id'] for row in rows]
+
+        ArchivedPost._get_collection().bulk_write([
+            ReplaceOne({'_id': row['_id']}, row, upsert=True) for row in rows
+        ], ordered=False)
+        self._advance_watermark(rows[-1]['created_at'])
+        TrendingPost._get_collection().delete_many({'_id': {'$in': ids}})
+        collection.delete_many({'_id': {'$in': ids}})
+        return len(rows)
+
+    def _write_update(self, post, revision, tags_changed):
+        """
+        (리비전 insert 와) 게시글 update
+        리비전을 먼저 쓰므로 같은 번호로 동시에 수정되면 (post_id, number)
+        유일 인덱스에 걸려 게시글은 바뀌지 않습니다.
+        태그를 바꾸면 수정 직전 문서의 태그를 받아와 반환합니다. (태그 수
+        증감을 메모리의 이전 값이 아닌 실제로 덮어쓴 값으로 계산)
+        태그를 바꾸지 않으면 리비전 insert 와 게시글 update 를
+        MongoClient.bulk_write 한 번으로 실행합니다.
+        (MongoDB 8.0 미만 등 지원하지 않으면 같은 순서로 나눠 씀)
+        """
+        collection = post._get_collection()
+        revisions = PostRevision._get_collection()
+        update = post._get_update_doc()
+        if not update:
+            return None
+        client = collection.database.client
+        # 클라이언트 속성 접근은 데이터베이스를 반환하므로 클래스에서 확인
+        if revision is not None and not tags_changed \
+                and self.client_bulk_write \
+                and hasattr(type(client), 'bulk_write'):
+            try:
+                client.bulk_write([
+                    InsertOne(revision, namespace=revisions.full_name),
+                    UpdateOne({'_id': post.pk}, update,
+                              namespace=collection.full_name),
+                ])
+                post._clear_changed_fields()
+                return None
+            except ClientBulkWriteException as e:
+                if any(error.get('code') == 11000
+                       for error in e.write_errors or ()):
+                    raise RevisionConflict(post.pk)
+                raise
+            except InvalidOperation:
+                # MongoDB 8.0 미만: 컬렉션별로 나눠 씀
+                type(self).client_bulk_write = False
+        if revision is not None:
+            try:
+                revisions.insert_one(revision)
+            except DuplicateKeyError:
+                raise RevisionConflict(post.pk)
+        previous_tags = None
+        if tags_changed:
+            row = collection.find_one_and_update(
+                {'_id': post.pk}, update, projection={'tags': 1},
+                return_document=ReturnDocument.BEFORE
+            )
+            # 그 사이 삭제된 게시글이면 태그 수를 바꾸지 않음
+            if row is not None:
+                previous_tags = row.get('tags', [])
+        else:
+            collection.update_one({'_id': post.pk}, update)
+        post._clear_changed_fields()
+        return previous_tags
+
+    def _documents(self):
+        if self._watermark() is None:
+            return (Post,)
+        return (Post, ArchivedPost)
+
+    def _tag_page(self, document, tags, match, after, limit, newer=None):
+        query = {'tags': {'$all' if match == 'all' else '$in': list(tags)}}
+        # (tags, created_at, _id) 인덱스 범위를 created_at 으로 제한하고
+        # 같은 created_at 은 _id 로 이어서 조회
+        created = {}
+        if after is not None:
+            created_at, post_id = after
+            created['$gte'] = created_at
+            query['$or'] = [
+                {'created_at': {'$gt': created_at}},
+                {'_id': {'$gt': post_id}},
+            ]
+        if newer is not None:
+            created['$gt'] = newer
+        if created:
+            query['created_at'] = created
+        return list(document.objects(__raw__=query)
+                    .order_by('created_at', 'id').limit(limit))
+
+    def _watermark(self):
+        """
+        보관 경계 (보관된 게시글이 없으면 None)
+        None 은 캐시하지 않으므로 다른 프로세스에서 처음 보관한 뒤에도
+        바로 posts_archive 를 조회합니다.
+        """
+        watermark = cache.get(WATERMARK_CACHE_KEY)
+        if watermark is None:
+            row = get_db()[WATERMARK_COLLECTION].find_one(
+                {'_id': WATERMARK_ID}
+            )
+            if row is None:
+                return None
+            watermark = row['watermark']
+            cache.set(WATERMARK_CACHE_KEY, watermark,
+                      settings.POSTS_ARCHIVE_WATERMARK_CACHE_SECONDS)
+        return watermark
+
+    def _advance_watermark(self, created_at):
+        collection = get_db()[WATERMARK_COLLECTION]
+        collection.update_one({'_id': WATERMARK_ID},
+                              {'$max': {'watermark': created_at},
+                               '$set': {'version': uuid.uuid4().hex}},
+                              upsert=True)
+        row = collection.find_one({'_id': WATERMARK_ID})
+        cache.set(WATERMARK_CACHE_KEY, row['watermark'],
+                  settings.POSTS_ARCHIVE_WATERMARK_CACHE_SECONDS)
+
+    def _archived_count(self, query, version):
+        """
+        posts_archive count (보관/삭제할 때만 바뀌므로 보관 경계 문서의
+        version 별로 캐시)
+        """
+        key = ARCHIVE_COUNT_CACHE_KEY.format(version,
+                                             query.get('author_id', ''))
+        count = cache.get(key)
+        if count is None:
+            count = ArchivedPost.objects(**query).count()
+            cache.set(key, count,
+                      settings.POSTS_ARCHIVE_COUNT_CACHE_SECONDS)
+        return count
+
+    def _invalidate_archived_counts(self):
+        get_db()[WATERMARK_COLLECTION].update_one(
+            {'_id': WATERMARK_ID}, {'$set': {'version': uuid.uuid4().hex}}
+        )
+
+    def _inc_tag_counts(self, deltas):
+        if not deltas:
+            return
+        collection = PostTagCount._get_collection()
+        collection.bulk_write([
+            UpdateOne({'_id': tag}, {'$inc': {'count': delta}}, upsert=True)
+            for tag, delta in deltas.items()
+        ], ordered=False)
+        decreased = [tag for tag, delta in deltas.items() if delta < 0]
+        if decreased:
+            collection.delete_many({'_id': {'$in': decreased},
+                                    'count': {'$lte': 0}})
+
+    def clear(self):
+        Post.objects.delete()
+        ArchivedPost.objects.delete()
+        TrendingPost.objects.delete()
+        PostTagCount.objects.delete()
+        PostRevision.objects.delete()
+        get_db()[WATERMARK_COLLECTION].delete_one({'_id': WATERMARK_ID})
+        cache.delete(WATERMARK_CACHE_KEY)
@@ -0,0 +1,65 @@
+"""
+게시글 태그
+
+- 태그는 앞뒤 공백을 제거한 소문자로 저장하며 중복은 제거합니다.
+- 태그별 게시글 수는 post_tag_counts 에 작성/수정/삭제 시 $inc 로 반영해
+  집계 없이 조회합니다.
+- 태그 목록 조회는 (created_at, _id) keyset 커서로 페이지를 넘깁니다.
+"""
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+
+MAX_TAGS = 10
+MAX_TAG_LENGTH = 50
+MATCH_MODES = ('any', 'all')
+
+
+class InvalidTags(ValueError):
+    pass
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def normalize_tags(tags):
+    """태그 목록 검증/정규화 (잘못되면 InvalidTags)"""
+    if tags is None:
+        return []
+    if not isinstance(tags, list) or \
+            not all(isinstance(tag, str) for tag in tags):
+        raise InvalidTags('태그는 문자열 목록이어야 합니다.')
+    normalized = list(dict.fromkeys(
+        tag.strip().lower() for tag in tags if tag.strip()
+    ))
+    if len(normalized) > MAX_TAGS:
+        raise InvalidTags(f'태그는 최대 {MAX_TAGS}개까지 입력할 수 있습니다.')
+    if any(len(tag) > MAX_TAG_LENGTH for tag in normalized):
+        raise InvalidTags(f'태그는 {MAX_TAG_LENGTH}자 이하로 입력해주세요.')
+    return normalized
+
+
+def tag_deltas(old_tags, new_tags):
+    """태그 변경에 따른 {태그: +1/-1}"""
+    old, new = set(old_tags or ()), set(new_tags or ())
+    deltas = {tag: 1 for tag in new - old}
+    deltas.update({tag: -1 for tag in old - new})
+    return deltas
+
+
+def encode_cursor(post):
+    raw = json.dumps([post.created_at.isoformat(), str(post.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(created_at, ObjectId) 반환 (잘못되면 InvalidCursor)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, post_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), ObjectId(post_id)
+    except (ValueError, TypeError, InvalidId):
+        raise InvalidCursor(cursor)
@@ -1,10 +1,38 @@
+import time
 import unittest
 from rest_framework.test import APIClient
 from django.urls import reverse
-from .documents import Post
+from .documents import ArchivedPost, IdempotencyRecord, Post, PostRevision
 from api.users.models import User
 from django.contrib.auth.hashers import make_password
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from unittest.mock import MagicMock, patch
+from .throttles import PostWriteUserThrottle
+from .views import PostAPIView, PostBatchAPIView, PostDetailAPIView
+from api.core.budgets import assert_query_budget
+from .slowlog import (SLOW_LOG_COLLECTION, SlowCommandListener,
+                      query_shape, summarize_explain)
+from pymongo.errors import OperationFailure
+from datetime import datetime
+from django.test import override_settings
+from .storage import PostNotFound, RevisionNotFound, get_post_repository
+from .storage.memory import MemoryPostRepository
+from .storage.mongo import (MongoPostRepository, WATERMARK_COLLECTION,
+                            WATERMARK_ID)
+from types import SimpleNamespace
+from .counters import ViewCounter
+from .cleanup import PENDING_PURGE_COLLECTION, OpsRateLimiter
+from api.core.tasks import background
+from django.core.management import call_command
+from io import StringIO
+from mongoengine.connection import get_db
+from . import idempotency
+from .trending import trending_pipeline, trending_score
+from .revisions import RevisionConflict, apply_delta, make_delta
+from datetime import timedelta
+from django.core.cache.backends.locmem import LocMemCache
 
 
 class PostTestCase(unittest.TestCase):
@@ -25,6 +53,7 @@ class PostTestCase(unittest.TestCase):
 
     def tearDown(self):
         User.objects.all().delete()
+        background.drain()
         Post.objects.delete()
 
     def test_create_post(self):
@@ -99,6 +128,7 @@ class PostParamterTestCase(unittest.TestCase):
 
     def tearDown(self):
         User.objects.all().delete()
+        background.drain()
         Post.objects.delete()
 
     def test_get_post_pagination(self):
@@ -169,6 +199,14 @@ class PostParamterTestCase(unittest.TestCase):
         self.assertEqual(response.data['results'][0]['content'],
                          'test content user2')
 
+    def test_get_post_with_invalid_author_id(self):
+        """
+        정수가 아닌 author_id 는 400 을 반환하는지 테스트
+        """
+        response = self.client.get(self.post_url, {'author_id': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('author_id', response.data['errors'])
+
 
 class PostDetailTestCase(unittest.TestCase):
     def setUp(self):
@@ -188,6 +226,7 @@ class PostDetailTestCase(unittest.TestCase):
 
     def tearDown(self):
         User.objects.all().delete()
+        background.drain()
         Post.objects.delete()
 
     def test_get_post_detail(self):
@@ -291,3 +330,1075 @@ class PostDetailTestCase(unittest.TestCase):
             content='test content').count() == 1)
         self.assertTrue(Post.objects.filter(
             author_id=self.user.id).count() == 1)
+
+
+class PostWriteThrottleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.post_url = reverse('posts')
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access_token = str(self.refresh.access_token)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.access_token}'
+        )
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        Post.objects.delete()
+        cache.clear()
+
+    @patch.object(PostWriteUserThrottle, 'rate', '2/min', create=True)
+    def test_post_write_throttled_per_user(self):
+        """
+        사용자별 쓰기 한도 초과 시 게시글을 만들지 않고 429 를 반환하는지 테스트
+        """
+        data = {
+            'title': 'test title',
+            'content': 'test content'
+        }
+        for _ in range(2):
+            response = self.client.post(self.post_url, data, format='json')
+            self.assertEqual(response.status_code, 201)
+
+        response = self.client.post(self.post_url, data, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(Post.objects.count(), 2)
+
+        response = self.client.get(self.post_url)
+        self.assertEqual(response.status_code, 200)
+
+
+class SlowCommandLogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.records = []
+        self.listener = SlowCommandListener(threshold_ms=100,
+                                            explain_sample_rate=0)
+        self.listener.write = lambda record, explain_command: \
+            self.records.append(record)
+
+    def _run_command(self, command, duration_ms):
+        command_name = next(iter(command))
+        started = SimpleNamespace(command=command, command_name=command_name,
+                                  connection_id=('db', 27017),
+                                  request_id=1)
+        finished = SimpleNamespace(command_name=command_name,
+                                   connection_id=('db', 27017),
+                                   request_id=1, database_name='test_db',
+                                   duration_micros=duration_ms * 1000)
+        self.listener.started(started)
+        self.listener.succeeded(finished)
+        self.listener._queue.join()
+
+    def test_query_shape(self):
+        """
+        쿼리 값이 타입 이름으로 치환되는지 테스트
+        """
+        self.assertEqual(
+            query_shape({'author_id': {'$in': [1, 2, 3]},
+                         'created_at': {'$gt': datetime(2024, 1, 1)}}),
+            {'author_id': {'$in': ['int']},
+             'created_at': {'$gt': 'datetime'}}
+        )
+
+    def test_only_slow_posts_commands_are_recorded(self):
+        """
+        posts 컬렉션의 임계값 초과 커맨드만 기록되는지 테스트
+        """
+        self._run_command({'find': 'posts', 'filter': {'author_id': 1}}, 5)
+        self._run_command({'find': 'users', 'filter': {'id': 1}}, 500)
+        self._run_command({'find': 'posts', 'filter': {'author_id': 1},
+                           'sort': {'created_at': -1}}, 500)
+        self.assertEqual(len(self.records), 1)
+        self.assertEqual(self.records[0]['filter_shape'],
+                         {'author_id': 'int'})
+        self.assertEqual(self.records[0]['sort'], {'created_at': -1})
+        self.assertEqual(self.records[0]['duration_ms'], 500)
+
+    def test_summarize_explain(self):
+        """
+        explain 결과에서 winning plan 과 검사/반환 비율을 요약하는지 테스트
+        """
+        summary = summarize_explain({
+            'queryPlanner': {'winningPlan': {
+                'stage': 'FETCH',
+                'inputStage': {'stage': 'IXSCAN',
+                               'indexName': 'author_id_1'}
+            }},
+            'executionStats': {'nReturned': 10, 'totalDocsExamined': 40,
+                               'totalKeysExamined': 40,
+                               'executionTimeMillis': 3}
+        })
+        self.assertEqual(summary['winning_plan'],
+                         'FETCH <- IXSCAN(author_id_1)')
+        self.assertEqual(summary['docs_examined_per_returned'], 4.0)
+
+    def test_record_is_written_when_explain_fails(self):
+        """
+        explain 이 실패해도 느린 커맨드를 로그와 컬렉션에 기록하는지 테스트
+        """
+        listener = SlowCommandListener(threshold_ms=100)
+        listener._collection_ready = True
+        db = MagicMock()
+        db.command.side_effect = OperationFailure('$merge is not supported')
+        record = {'command': 'aggregate', 'collection': 'posts'}
+        with patch('mongoengine.connection.get_db', return_value=db), \
+                self.assertLogs('api.posts.slowlog', 'WARNING'):
+            listener.write(record, {'aggregate': 'posts', 'pipeline': []})
+        self.assertIsNone(record['explain'])
+        self.assertIn('$merge', record['explain_error'])
+        db[SLOW_LOG_COLLECTION].insert_one.assert_called_once_with(record)
+
+
+class PostRepositoryConformanceMixin:
+    """
+    모든 게시글 저장소 백엔드가 통과해야 하는 공통 테스트
+    """
+    def make_repository(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.repository = self.make_repository()
+        self.repository.clear()
+
+    def tearDown(self):
+        self.repository.clear()
+
+    def test_create_and_get(self):
+        post = self.repository.create(title='title', content='content',
+                                      author_id=1)
+        fetched = self.repository.get(str(post.id))
+        self.assertEqual(fetched.id, post.id)
+        self.assertEqual(fetched.title, 'title')
+        self.assertEqual(fetched.content, 'content')
+        self.assertEqual(fetched.author_id, 1)
+        self.assertIsNotNone(fetched.created_at)
+
+    def test_get_missing_or_invalid_id(self):
+        with self.assertRaises(PostNotFound):
+            self.repository.get('0' * 24)
+        with self.assertRaises(PostNotFound):
+            self.repository.get('invalid')
+
+    def test_filter_invalid_author_id(self):
+        with self.assertRaises(ValidationError) as context:
+            self.repository.filter(author_id='abc')
+        self.assertIn('author_id', context.exception.message_dict)
+
+    def test_filter_order_count_and_slice(self):
+        for i in range(15):
+            self.repository.create(title=f'title {i}', content='content',
+                                   author_id=i % 3)
+        posts = self.repository.filter()
+        self.assertEqual(posts.count(), 15)
+        self.assertEqual([post.title for post in posts[10:15]],
+                         [f'title {i}' for i in range(10, 15)])
+
+        by_author = self.repository.filter(author_id='1')
+        self.assertEqual(by_author.count(), 5)
+        self.assertEqual([post.title for post in by_author[0:2]],
+                         ['title 1', 'title 4'])
+
+    def test_update(self):
+        post = self.repository.create(title='title', content='content',
+                                      author_id=1)
+        self.repository.update(post, title='updated')
+        fetched = self.repository.get(str(post.id))
+        self.assertEqual(fetched.title, 'updated')
+        self.assertEqual(fetched.content, 'content')
+
+    def test_delete(self):
+        post = self.repository.create(title='title', content='content',
+                                      author_id=1)
+        self.repository.delete(post)
+        with self.assertRaises(PostNotFound):
+            self.repository.get(str(post.id))
+        self.assertEqual(self.repository.filter().count(), 0)
+        self.assertEqual(self.repository.filter(author_id=1).count(), 0)
+
+    def test_get_many(self):
+        first = self.repository.create(title='first', content='content',
+                                       author_id=1)
+        second = self.repository.create(title='second', content='content',
+                                        author_id=1)
+        posts = self.repository.get_many([str(second.id), str(first.id),
+                                          '0' * 24])
+        self.assertEqual(set(posts), {str(first.id), str(second.id)})
+        self.assertEqual(posts[str(second.id)].title, 'second')
+
+    def test_author_ids_and_delete_by_author(self):
+        for author_id in (3, 1, 2, 3, 3):
+            self.repository.create(title='title', content='content',
+                                   author_id=author_id)
+        self.assertEqual(self.repository.author_ids(limit=2), [1, 2])
+        self.assertEqual(self.repository.author_ids(after=2), [3])
+
+        self.assertEqual(self.repository.delete_by_author(3, limit=2), 2)
+        self.assertEqual(self.repository.delete_by_author(3, limit=2), 1)
+        self.assertEqual(self.repository.delete_by_author(3, limit=2), 0)
+        self.assertEqual(self.repository.author_ids(), [1, 2])
+
+    def test_increment_views(self):
+        post = self.repository.create(title='title', content='content',
+                                      author_id=1)
+        self.repository.increment_views({str(post.id): 3, '0' * 24: 1})
+        self.repository.increment_views({str(post.id): 2})
+        self.assertEqual(self.repository.get(str(post.id)).views, 5)
+
+    def test_tags_and_tag_counts(self):
+        first = self.repository.create(title='first', content='content',
+                                       author_id=1, tags=['python', 'db'])
+        second = self.repository.create(title='second', content='content',
+                                        author_id=2, tags=['python'])
+        self.repository.create(title='third', content='content',
+                               author_id=3)
+        self.assertEqual(self.repository.get(str(first.id)).tags,
+                         ['python', 'db'])
+        self.assertEqual(self.repository.tag_counts(),
+                         [('python', 2), ('db', 1)])
+
+        any_posts = self.repository.filter_by_tags(['db', 'python'])
+        self.assertEqual([post.title for post in any_posts],
+                         ['first', 'second'])
+        all_posts = self.repository.filter_by_tags(['db', 'python'],
+                                                   match='all')
+        self.assertEqual([post.title for post in all_posts], ['first'])
+
+        self.repository.update(first, tags=['db', 'mongo'])
+        self.repository.delete(second)
+        self.assertEqual(dict(self.repository.tag_counts()),
+                         {'db': 1, 'mongo': 1})
+        self.assertEqual(self.repository.filter_by_tags(['python']), [])
+        self.repository.delete_by_author(1)
+        self.assertEqual(self.repository.tag_counts(), [])
+
+    def test_filter_by_tags_keyset(self):
+        for i in range(5):
+            self.repository.create(title=f'title {i}', content='content',
+                                   author_id=1, tags=['a', 'b'][:i % 2 + 1])
+        page = self.repository.filter_by_tags(['a', 'b'], limit=2)
+        self.assertEqual([post.title for post in page],
+                         ['title 0', 'title 1'])
+        last = page[-1]
+        page = self.repository.filter_by_tags(
+            ['a', 'b'], after=(last.created_at, last.id), limit=10
+        )
+        self.assertEqual([post.title for post in page],
+                         ['title 2', 'title 3', 'title 4'])
+
+    def test_archive(self):
+        for i in range(2):
+            self.repository.create(title=f'old {i}', content='content',
+                                   author_id=1, tags=['a'])
+            # Mongo 는 ms 단위로 저장하므로 같은 created_at 이 되지 않도록
+            time.sleep(0.01)
+        before = datetime.now()
+        time.sleep(0.01)
+        recent = self.repository.create(title='recent', content='content',
+                                        author_id=2, tags=['a'])
+
+        self.assertEqual(self.repository.archive(before, limit=1), 1)
+        self.assertEqual(self.repository.archive(before, limit=1), 1)
+        self.assertEqual(self.repository.archive(before, limit=1), 0)
+
+        posts = self.repository.filter()
+        self.assertEqual(posts.count(), 3)
+        self.assertEqual([post.title for post in posts[1:3]],
+                         ['old 1', 'recent'])
+        self.assertEqual(
+            [post.title for post in self.repository.filter_by_tags(['a'])],
+            ['old 0', 'old 1', 'recent']
+        )
+        old = posts[0]
+        self.assertEqual(self.repository.get(str(old.id)).title, 'old 0')
+        self.assertEqual(
+            set(self.repository.get_many([str(old.id), str(recent.id)])),
+            {str(old.id), str(recent.id)}
+        )
+        self.repository.increment_views({str(old.id): 2})
+        self.assertEqual(self.repository.get(str(old.id)).views, 2)
+        self.assertEqual(self.repository.author_ids(), [1, 2])
+        self.assertEqual(self.repository.delete_by_author(1), 2)
+        self.assertEqual(self.repository.filter().count(), 1)
+
+    @override_settings(POST_REVISION_SNAPSHOT_INTERVAL=3)
+    def test_revisions(self):
+        versions = [(f'title {i}', ''.join(
+            f'line {j} {"edited" if j == i else ""}\n' for j in range(10)
+        )) for i in range(8)]
+        post = self.repository.create(title=versions[0][0],
+                                      content=versions[0][1], author_id=1)
+        for title, content in versions[1:]:
+            self.repository.update(post, editor_id=2, title=title,
+                                   content=content)
+        self.repository.update(post, tags=['a'])
+        post = self.repository.get(str(post.id))
+        self.assertEqual(post.revision, 7)
+
+        for number in range(1, 8):
+            revision = self.repository.revision(post, number)
+            self.assertEqual((revision['title'], revision['content']),
+                             versions[number - 1])
+            self.assertEqual(revision['editor_id'], 2)
+        for number in (0, 8):
+            with self.assertRaises(RevisionNotFound):
+                self.repository.revision(post, number)
+
+        page = self.repository.revisions(post, limit=3)
+        self.assertEqual([revision['number'] for revision in page],
+                         [7, 6, 5])
+        self.assertNotIn('content', page[0])
+        page = self.repository.revisions(post, before=page[-1]['number'])
+        self.assertEqual([revision['number'] for revision in page],
+                         [4, 3, 2, 1])
+
+        self.repository.delete(post)
+        self.assertEqual(self.repository.revisions(post), [])
+
+
+class MongoPostRepositoryTestCase(PostRepositoryConformanceMixin,
+                                  unittest.TestCase):
+    def make_repository(self):
+        return MongoPostRepository()
+
+    def test_concurrent_revision_conflict(self):
+        post = self.repository.create(title='title', content='content',
+                                      author_id=1)
+        # 다른 요청이 같은 번호의 리비전을 먼저 쓴 상황
+        PostRevision._get_collection().insert_one({'post_id': post.id,
+                                                   'number': 1})
+        with self.assertRaises(RevisionConflict):
+            self.repository.update(post, content='updated')
+        self.assertEqual(self.repository.get(str(post.id)).content,
+                         'content')
+        self.assertEqual(post.revision, 0)
+
+
+class MemoryPostRepositoryTestCase(PostRepositoryConformanceMixin,
+                                   unittest.TestCase):
+    def make_repository(self):
+        return MemoryPostRepository()
+
+
+class MemoryBackendAPITestCase(unittest.TestCase):
+    def setUp(self):
+        self.settings_override = override_settings(
+            POSTS_STORAGE_BACKEND='memory'
+        )
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.post_url = reverse('posts')
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer '
+            f'{RefreshToken.for_user(self.user).access_token}'
+        )
+
+    def tearDown(self):
+        get_post_repository().clear()
+        self.settings_override.disable()
+        User.objects.all().delete()
+        background.drain()
+        cache.clear()
+
+    def test_crud_without_mongo(self):
+        """
+        memory 백엔드로 게시글 API 가 동작하는지 테스트
+        """
+        response = self.client.post(self.post_url, {
+            'title': 'test title',
+            'content': 'test content'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        detail_url = reverse('post-detail', args=[response.data['id']])
+
+        response = self.client.get(self.post_url,
+                                   {'author_id': self.user.id})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['title'], 'test title')
+
+        response = self.client.put(detail_url, {'title': 'updated'},
+                                   format='json')
+        self.assertEqual(response.data['title'], 'updated')
+        self.assertEqual(Post.objects.count(), 0)
+
+        response = self.client.delete(detail_url)
+        self.assertEqual(response.status_code, 204)
+        response = self.client.get(detail_url)
+        self.assertEqual(response.status_code, 404)
+
+
+class PostQueryBudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.post_url = reverse('posts')
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer '
+            f'{RefreshToken.for_user(self.user).access_token}'
+        )
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        get_post_repository().clear()
+        cache.clear()
+
+    def test_post_endpoints_within_budget(self):
+        """
+        게시글 API 가 선언된 쿼리 예산 이내인지 테스트
+        """
+        with assert_query_budget(self, PostAPIView, 'POST'):
+            response = self.client.post(self.post_url, {
+                'title': 'test title',
+                'content': 'test content',
+                'tags': ['python', 'django']
+            }, format='json')
+        detail_url = reverse('post-detail', args=[response.data['id']])
+
+        with assert_query_budget(self, PostAPIView, 'GET'):
+            self.client.get(self.post_url)
+        with assert_query_budget(self, PostDetailAPIView, 'GET'):
+            self.client.get(detail_url)
+        with assert_query_budget(self, PostBatchAPIView, 'GET'):
+            self.client.get(reverse('post-batch'),
+                            {'ids': response.data['id']})
+        with assert_query_budget(self, PostAPIView, 'GET'):
+            self.client.get(self.post_url, {'tags': 'python'})
+        # 리비전 insert, 태그 변경, 사라진 태그 정리가 모두 일어나는 수정
+        with assert_query_budget(self, PostDetailAPIView, 'PUT'):
+            response = self.client.put(detail_url, {
+                'title': 'updated', 'tags': ['python']
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        with assert_query_budget(self, PostDetailAPIView, 'DELETE'):
+            response = self.client.delete(detail_url)
+        self.assertEqual(response.status_code, 204)
+
+
+class ViewCounterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.repository = MemoryPostRepository()
+        self.counter = ViewCounter(flush_interval=60,
+                                   repository=self.repository)
+
+    def tearDown(self):
+        self.counter.stop()
+
+    def test_increments_are_coalesced_per_flush(self):
+        post = self.repository.create(title='title', content='content',
+                                      author_id=1)
+        with patch.object(self.repository, 'increment_views',
+                          wraps=self.repository.increment_views) as inc:
+            for _ in range(10):
+                self.counter.incr(str(post.id))
+            self.assertEqual(post.views, 0)
+            self.assertEqual(self.counter.flush(), 1)
+            self.assertEqual(self.counter.flush(), 0)
+        inc.assert_called_once_with({str(post.id): 10})
+        self.assertEqual(post.views, 10)
+
+    def test_failed_flush_keeps_pending_counts(self):
+        post_id = '0' * 24
+        self.counter.incr(post_id, 2)
+        with patch.object(self.repository, 'increment_views',
+                          side_effect=RuntimeError), \
+                self.assertLogs('api.posts.counters', 'ERROR'):
+            self.assertEqual(self.counter.flush(), 0)
+        self.counter.incr(post_id)
+        self.assertEqual(self.counter.pending(), {post_id: 3})
+
+
+class TrendingPostTestCase(unittest.TestCase):
+    def setUp(self):
+        self.settings_override = override_settings(
+            POSTS_STORAGE_BACKEND='memory', TRENDING_SIZE=2,
+            TRENDING_WINDOW_HOURS=24, TRENDING_GRAVITY=1.5
+        )
+        self.settings_override.enable()
+        self.repository = get_post_repository()
+        self.now = datetime.now()
+
+    def tearDown(self):
+        self.repository.clear()
+        Post.objects.delete()
+        self.settings_override.disable()
+
+    def _create(self, title, hours_ago, views):
+        with patch('api.posts.storage.memory.datetime') as clock:
+            clock.now.return_value = self.now - timedelta(hours=hours_ago)
+            post = self.repository.create(title=title, content='content',
+                                          author_id=1)
+        self.repository.increment_views({str(post.id): views})
+        return post
+
+    def test_refresh_ranks_recent_engaged_posts(self):
+        self._create('old popular', hours_ago=48, views=1000)
+        self._create('fresh', hours_ago=1, views=0)
+        self._create('recent popular', hours_ago=5, views=50)
+        self._create('recent quiet', hours_ago=20, views=1)
+
+        self.assertEqual(self.repository.refresh_trending(self.now), 2)
+        response = APIClient().get(reverse('post-trending'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post['title'] for post in response.data],
+                         ['recent popular', 'fresh'])
+
+        response = APIClient().get(reverse('post-trending'), {'limit': 1})
+        self.assertEqual(len(response.data), 1)
+
+    def test_pipeline_score_matches_python_score(self):
+        created_at = self.now - timedelta(hours=3)
+        Post(title='title', content='content', author_id=1,
+             created_at=created_at, views=7).save()
+        Post(title='old', content='content', author_id=1,
+             created_at=self.now - timedelta(hours=30)).save()
+
+        pipeline = trending_pipeline(self.now, timedelta(hours=24), 10, 1.5)
+        self.assertIn('$merge', pipeline[-1])
+        # mongomock 은 $merge 를 지원하지 않으므로 직전 단계까지 실행
+        rows = list(Post._get_collection().aggregate(pipeline[:-1]))
+        self.assertEqual(len(rows), 1)
+        self.assertAlmostEqual(
+            rows[0]['score'],
+            trending_score(7, (self.now - created_at).total_seconds(), 1.5),
+            places=5
+        )
+
+
+class PostBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.batch_url = reverse('post-batch')
+        self.posts = [
+            Post(title=f'title {i}', content='content', author_id=1).save()
+            for i in range(3)
+        ]
+        self.ids = [str(post.id) for post in self.posts]
+
+    def tearDown(self):
+        Post.objects.delete()
+
+    def test_get_batch_in_request_order(self):
+        """
+        요청 순서대로 반환하고 없는 게시글은 found=False 로 표시하는지 테스트
+        """
+        missing = '0' * 24
+        ids = [self.ids[2], missing, self.ids[0], self.ids[2]]
+        response = self.client.get(self.batch_url, {'ids': ','.join(ids)})
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([result['id'] for result in results], ids)
+        self.assertEqual([result['found'] for result in results],
+                         [True, False, True, True])
+        self.assertEqual(results[0]['title'], 'title 2')
+
+    def test_post_batch(self):
+        response = self.client.post(self.batch_url, {'ids': self.ids},
+                                    format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['title'] for result in
+                          response.data['results']],
+                         ['title 0', 'title 1', 'title 2'])
+
+    def test_invalid_ids(self):
+        response = self.client.get(self.batch_url,
+                                   {'ids': f'{self.ids[0]},invalid'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('invalid', response.data['errors']['ids'][0])
+
+        response = self.client.get(self.batch_url)
+        self.assertEqual(response.status_code, 400)
+
+        with override_settings(POSTS_BATCH_MAX_IDS=2):
+            response = self.client.post(self.batch_url, {'ids': self.ids},
+                                        format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class IdempotencyKeyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.post_url = reverse('posts')
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer '
+            f'{RefreshToken.for_user(self.user).access_token}'
+        )
+        self.data = {'title': 'test title', 'content': 'test content'}
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        Post.objects.delete()
+        IdempotencyRecord.objects.delete()
+        cache.clear()
+
+    def _post(self, key, data=None):
+        return self.client.post(self.post_url, data or self.data,
+                                format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self):
+        """
+        같은 키로 다시 요청하면 게시글을 만들지 않고 첫 응답을 반환하는지 테스트
+        """
+        first = self._post('key-1')
+        self.assertEqual(first.status_code, 201)
+        second = self._post('key-1')
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(Post.objects.count(), 1)
+
+        self._post('key-2')
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_same_key_with_different_body(self):
+        self._post('key-1')
+        response = self._post('key-1', {'title': 'other',
+                                        'content': 'other'})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_in_flight_duplicate(self):
+        record = idempotency.begin(
+            self.user.id, 'key-1', idempotency.request_fingerprint(self.data)
+        )
+        response = self._post('key-1')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Post.objects.count(), 0)
+
+        # 처리하던 워커가 사라져 오래된 기록은 다음 요청이 이어받음
+        record.modify(set__locked_at=record.locked_at - timedelta(hours=1))
+        response = self._post('key-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Post.objects.count(), 1)
+        self.assertEqual(self._post('key-1').data['id'], response.data['id'])
+
+    def test_invalid_key(self):
+        response = self._post('x' * 256)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Post.objects.count(), 0)
+
+
+class OrphanPostCleanupTestCase(unittest.TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        get_db()[PENDING_PURGE_COLLECTION].delete_many({})
+        self.orphan_ids = [self.user.id + 1000, self.user.id + 2000]
+        for author_id in [self.user.id] + self.orphan_ids:
+            for _ in range(3):
+                Post(title='title', content='content',
+                     author_id=author_id).save()
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        Post.objects.delete()
+        ArchivedPost.objects.delete()
+        get_db()['maintenance_checkpoints'].delete_many({})
+        get_db()[PENDING_PURGE_COLLECTION].delete_many({})
+        cache.clear()
+
+    def _purge(self, *args):
+        out = StringIO()
+        call_command('purge_orphan_posts', '--ops-per-sec', '0',
+                     '--chunk-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_purge_is_resumable(self):
+        """
+        배치 단위로 중단/재개하며 MySQL 에 없는 작성자의 게시글만 삭제하는지 테스트
+        """
+        self._purge('--batch-size', '2', '--max-batches', '1')
+        self.assertEqual(Post.objects(author_id=self.orphan_ids[0]).count(),
+                         0)
+        self.assertEqual(Post.objects(author_id=self.orphan_ids[1]).count(),
+                         3)
+
+        output = self._purge('--batch-size', '2')
+        self.assertIn(f'{self.orphan_ids[0]} 다음부터', output)
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(Post.objects(author_id=self.user.id).count(), 3)
+        self.assertIsNone(get_db()['maintenance_checkpoints'].find_one())
+
+    def test_author_id_seeks_are_paced(self):
+        """
+        작성자 id 를 찾는 seek 마다 속도 제한을 거치는지 테스트
+        """
+        waits = []
+        author_ids = get_post_repository().author_ids(
+            limit=500, wait=lambda: waits.append(1)
+        )
+        self.assertEqual(len(author_ids), 3)
+        # 작성자 3명 + 더 없음을 확인하는 seek 1번
+        self.assertEqual(len(waits), 4)
+
+    def test_dry_run(self):
+        output = self._purge('--dry-run')
+        self.assertIn(f'고아 작성자: {self.orphan_ids[0]}', output)
+        self.assertEqual(Post.objects.count(), 9)
+
+    def test_user_delete_queues_cleanup(self):
+        """
+        사용자 삭제는 작성자만 기록하고, 게시글은 명령에서 삭제하는지 테스트
+        """
+        author_id = self.user.id
+        self.user.delete()
+        self.assertEqual(Post.objects(author_id=author_id).count(), 3)
+        self.assertIsNotNone(
+            get_db()[PENDING_PURGE_COLLECTION].find_one({'_id': author_id})
+        )
+
+        output = self._purge('--pending-only')
+        self.assertIn('삭제된 사용자 1명의 게시글 3개', output)
+        self.assertEqual(Post.objects(author_id=author_id).count(), 0)
+        self.assertEqual(Post.objects.count(), 6)
+        self.assertIsNone(get_db()[PENDING_PURGE_COLLECTION].find_one())
+
+    def test_purge_deletes_archived_posts(self):
+        """
+        posts 와 posts_archive 에 나뉘어 있는 작성자의 게시글을 모두 삭제하는지
+        테스트
+        """
+        author_id = self.user.id
+        created_at = datetime.now() - timedelta(days=400)
+        for _ in range(5):
+            ArchivedPost(title='title', content='content',
+                         author_id=author_id, created_at=created_at).save()
+        get_db()[WATERMARK_COLLECTION].insert_one(
+            {'_id': WATERMARK_ID, 'watermark': created_at}
+        )
+        self.user.delete()
+
+        output = self._purge('--pending-only')
+        self.assertIn('삭제된 사용자 1명의 게시글 8개', output)
+        self.assertEqual(Post.objects(author_id=author_id).count(), 0)
+        self.assertEqual(ArchivedPost.objects(author_id=author_id).count(),
+                         0)
+
+    def test_ops_rate_limiter(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = OpsRateLimiter(4, clock=lambda: now[0], sleep=sleep)
+        for _ in range(3):
+            limiter.wait()
+        self.assertEqual(sleeps, [0.25, 0.25])
+
+
+class PostTagTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.post_url = reverse('posts')
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer '
+            f'{RefreshToken.for_user(self.user).access_token}'
+        )
+        repository = get_post_repository()
+        for i in range(5):
+            repository.create(title=f'title {i}', content='content',
+                              author_id=self.user.id,
+                              tags=['python', 'django'][:i % 2 + 1])
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        get_post_repository().clear()
+        cache.clear()
+
+    def test_create_and_update_tags(self):
+        """
+        태그를 정규화해 저장하고 잘못된 태그는 400 을 반환하는지 테스트
+        """
+        response = self.client.post(self.post_url, {
+            'title': 'title', 'content': 'content',
+            'tags': [' Python ', 'python', 'Mongo']
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['tags'], ['python', 'mongo'])
+
+        detail_url = reverse('post-detail',
+                             kwargs={'post_id': response.data['id']})
+        response = self.client.put(detail_url, {'tags': ['db']},
+                                   format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tags'], ['db'])
+
+        response = self.client.put(detail_url, {'tags': 'db'},
+                                   format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('tags', response.data['errors'])
+
+    def test_list_by_tags_with_cursor(self):
+        """
+        tags_match=any|all 필터와 다음 페이지 커서를 테스트
+        """
+        response = self.client.get(self.post_url, {
+            'tags': 'python,django', 'tags_match': 'all', 'page_size': 1
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post['title'] for post in response.data['results']],
+                         ['title 1'])
+
+        titles = []
+        url = f'{self.post_url}?tags=Python&page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            titles += [post['title'] for post in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(titles, [f'title {i}' for i in range(5)])
+
+        response = self.client.get(self.post_url,
+                                   {'tags': 'python', 'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.post_url,
+                                   {'tags': 'python', 'tags_match': 'none'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_concurrent_tag_updates_keep_counts(self):
+        """
+        같은 게시글을 이전 태그가 같은 두 요청이 동시에 수정해도 실제로
+        덮어쓴 태그 기준으로 태그 수를 바꾸는지 테스트
+        """
+        repository = MongoPostRepository()
+        post = repository.create(title='title', content='content',
+                                 author_id=self.user.id, tags=['mongo'])
+        first = repository.get(str(post.id))
+        second = repository.get(str(post.id))
+        repository.update(first, tags=['redis'])
+        repository.update(second, tags=['db'])
+        counts = dict(repository.tag_counts())
+        self.assertNotIn('mongo', counts)
+        self.assertNotIn('redis', counts)
+        self.assertEqual(counts['db'], 1)
+
+    def test_tag_counts(self):
+        response = self.client.get(reverse('post-tag-counts'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{'tag': 'python', 'count': 5},
+                                         {'tag': 'django', 'count': 2}])
+
+
+class PostArchiveTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.repository = MongoPostRepository()
+        self.repository.clear()
+        now = datetime.now().replace(microsecond=0)
+        self.posts = []
+        for i in range(6):
+            post = Post(title=f'title {i}', content='content', author_id=1,
+                        tags=['python'],
+                        created_at=now - timedelta(days=400 - i * 50))
+            self.posts.append(post.save())
+
+    def tearDown(self):
+        self.repository.clear()
+        cache.clear()
+
+    def _archive(self, *args):
+        out = StringIO()
+        call_command('archive_posts', '--older-than-days', '180',
+                     '--ops-per-sec', '0', *args, stdout=out)
+        return out.getvalue()
+
+    def test_archive_moves_old_posts(self):
+        """
+        오래된 게시글만 posts_archive 로 옮기고 목록/상세는 그대로 조회되는지
+        테스트
+        """
+        output = self._archive('--batch-size', '2')
+        self.assertIn('게시글 5개', output)
+        self.assertEqual(Post.objects.count(), 1)
+        self.assertEqual(ArchivedPost.objects.count(), 5)
+
+        response = self.client.get(reverse('posts'), {'page_size': 4,
+                                                      'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual([post['title'] for post in
+                          response.data['results']],
+                         ['title 4', 'title 5'])
+
+        response = self.client.get(reverse(
+            'post-detail', kwargs={'post_id': str(self.posts[0].id)}
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'title 0')
+
+    def test_archive_resumes_after_partial_copy(self):
+        """
+        복사만 되고 삭제되지 않은 상태에서 다시 실행해도 중복 없이 옮기는지
+        테스트
+        """
+        rows = list(Post._get_collection().find().sort('created_at', 1)
+                    .limit(2))
+        ArchivedPost._get_collection().insert_many(rows)
+        self._archive()
+        self.assertEqual(ArchivedPost.objects.count(), 5)
+        self.assertEqual(self.repository.filter().count(), 6)
+
+    def test_recent_reads_skip_archive(self):
+        """
+        보관 경계 이후 범위의 조회는 posts_archive 를 조회하지 않는지 테스트
+        """
+        self._archive()
+        recent = self.posts[-1]
+        with patch.object(ArchivedPost, 'objects') as archived:
+            self.assertEqual(self.repository.get(str(recent.id)).title,
+                             'title 5')
+            # 보관된 마지막 게시글(title 4) 하루 뒤부터
+            posts = self.repository.filter_by_tags(
+                ['python'],
+                after=(self.posts[4].created_at + timedelta(days=1),
+                       self.posts[4].id)
+            )
+        archived.assert_not_called()
+        self.assertEqual([post.title for post in posts], ['title 5'])
+
+    def test_reads_see_archive_moved_by_another_process(self):
+        """
+        다른 프로세스가 캐시를 거치지 않고 처음 보관해도 상세/목록에서
+        보관된 게시글을 바로 조회하는지 테스트
+        """
+        self.assertEqual(self.repository.filter().count(), 6)
+        oldest = self.posts[0]
+        ArchivedPost._get_collection().insert_one(
+            Post._get_collection().find_one({'_id': oldest.id})
+        )
+        Post._get_collection().delete_one({'_id': oldest.id})
+        self.assertEqual(self.repository.get(str(oldest.id)).title,
+                         'title 0')
+        self.assertIn(str(oldest.id),
+                      self.repository.get_many([str(oldest.id)]))
+
+        get_db()[WATERMARK_COLLECTION].insert_one(
+            {'_id': WATERMARK_ID, 'watermark': oldest.created_at}
+        )
+        self.assertEqual(self.repository.filter().count(), 6)
+
+    def test_archived_count_is_cached_until_archive_changes(self):
+        """
+        목록의 posts_archive count 를 캐시하고 보관된 게시글 삭제 시
+        다시 세는지 테스트
+        """
+        self._archive()
+        self.assertEqual(self.repository.filter().count(), 6)
+        # 저장소를 거치지 않은 삭제는 캐시된 개수에 반영되지 않음
+        ArchivedPost._get_collection().delete_one({'_id': self.posts[0].id})
+        self.assertEqual(self.repository.filter().count(), 6)
+
+        self.repository.delete(self.repository.get(str(self.posts[1].id)))
+        self.assertEqual(self.repository.filter().count(), 4)
+
+    def test_archived_count_after_archive_in_another_process(self):
+        """
+        다른 프로세스(별도 캐시)에서 보관해도 캐시된 posts_archive count 를
+        쓰지 않는지 테스트
+        """
+        before = datetime.now() - timedelta(days=180)
+        self.repository.archive(before, limit=2)
+        self.assertEqual(self.repository.filter().count(), 6)
+
+        with patch('api.posts.storage.mongo.cache', LocMemCache(
+                'another-process', {})):
+            self.assertEqual(self.repository.archive(before), 3)
+        self.assertEqual(Post.objects.count(), 1)
+        self.assertEqual(self.repository.filter().count(), 6)
+        self.assertEqual(len(self.repository.filter()[:]), 6)
+
+
+class PostRevisionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer '
+            f'{RefreshToken.for_user(self.user).access_token}'
+        )
+        self.post = get_post_repository().create(
+            title='title', content='first\nsecond\n', author_id=self.user.id
+        )
+        self.detail_url = reverse('post-detail',
+                                  kwargs={'post_id': str(self.post.id)})
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        get_post_repository().clear()
+        cache.clear()
+
+    def test_delta_round_trip(self):
+        source = ''.join(f'line {i}\n' for i in range(1000))
+        target = source.replace('line 500\n', 'changed\n')
+        delta = make_delta(source, target)
+        self.assertEqual(apply_delta(source, delta), target)
+        # 바뀐 줄만 내용으로 저장
+        self.assertEqual([op for op in delta if isinstance(op, str)],
+                         ['changed\n'])
+
+    def test_revision_endpoints(self):
+        """
+        수정할 때마다 이전 내용이 리비전으로 남고 목록/복원 조회되는지 테스트
+        """
+        for content in ('first\nupdated\n', 'third\n'):
+            response = self.client.put(self.detail_url,
+                                       {'content': content}, format='json')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['revision'], 2)
+
+        list_url = reverse('post-revisions',
+                           kwargs={'post_id': str(self.post.id)})
+        response = self.client.get(list_url, {'page_size': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['current'], 3)
+        self.assertEqual([revision['number'] for revision in
+                          response.data['results']], [2])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([revision['number'] for revision in
+                          response.data['results']], [1])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(reverse('post-revision', kwargs={
+            'post_id': str(self.post.id), 'number': 1
+        }))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['content'], 'first\nsecond\n')
+        self.assertEqual(response.data['editor_id'], self.user.id)
+
+        response = self.client.get(reverse('post-revision', kwargs={
+            'post_id': str(self.post.id), 'number': 3
+        }))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(list_url, {'before': 'x'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,29 @@
+from api.core.throttling import SlidingWindowRateThrottle
+
+
+class PostWriteUserThrottle(SlidingWindowRateThrottle):
+    """
+    사용자별 게시글 쓰기(생성/수정/삭제) 제한
+    """
+    scope = 'post_write_user'
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': request.user.pk
+        }
+
+
+class PostWriteGlobalThrottle(SlidingWindowRateThrottle):
+    """
+    전체 사용자 합산 게시글 쓰기 제한 (모든 워커가 같은 캐시 키 공유)
+    """
+    scope = 'post_write'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': 'global'
+        }
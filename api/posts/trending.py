@@ -0,0 +1,51 @@
+"""
+인기 게시글 (posts_trending)
+
+score = (views + 1) / (경과 시간(h) + 2) ** gravity
+
+최근 window 안에 작성된 게시글만 다시 점수를 매겨 상위 size 개를
+$merge 로 posts_trending 에 반영하고, 이번 갱신에 포함되지 않은
+(순위 밖으로 밀려났거나 삭제된) 문서는 지웁니다.
+"""
+from datetime import timedelta
+from django.conf import settings
+
+TRENDING_COLLECTION = 'posts_trending'
+
+
+def trending_options():
+    return {
+        'window': timedelta(hours=getattr(settings, 'TRENDING_WINDOW_HOURS',
+                                          72)),
+        'size': getattr(settings, 'TRENDING_SIZE', 200),
+        'gravity': getattr(settings, 'TRENDING_GRAVITY', 1.5),
+    }
+
+
+def trending_score(views, age_seconds, gravity):
+    return (views + 1) / (age_seconds / 3600 + 2) ** gravity
+
+
+def trending_pipeline(now, window, size, gravity,
+                      into=TRENDING_COLLECTION):
+    """trending_score 와 같은 식을 계산해 상위 size 개를 into 에 병합"""
+    views = {'$ifNull': ['$views', 0]}
+    age_hours = {'$divide': [{'$subtract': [now, '$created_at']}, 3600000]}
+    return [
+        {'$match': {'created_at': {'$gte': now - window}}},
+        {'$project': {
+            'title': 1,
+            'author_id': 1,
+            'created_at': 1,
+            'views': views,
+            'score': {'$divide': [
+                {'$add': [views, 1]},
+                {'$pow': [{'$add': [age_hours, 2]}, gravity]},
+            ]},
+            'refreshed_at': {'$literal': now},
+        }},
+        {'$sort': {'score': -1}},
+        {'$limit': size},
+        {'$merge': {'into': into, 'on': '_id',
+                    'whenMatched': 'replace', 'whenNotMatched': 'insert'}},
+    ]
@@ -1,8 +1,20 @@
 from django.urls import path
 from .views import (PostAPIView,
-                    PostDetailAPIView)
+                    PostDetailAPIView,
+                    PostBatchAPIView,
+                    PostTrendingAPIView,
+                    PostTagCountsAPIView,
+                    PostRevisionListAPIView,
+                    PostRevisionDetailAPIView)
 
 urlpatterns = [
     path('', PostAPIView.as_view(), name='posts'),
+    path('batch', PostBatchAPIView.as_view(), name='post-batch'),
+    path('trending', PostTrendingAPIView.as_view(), name='post-trending'),
+    path('tags', PostTagCountsAPIView.as_view(), name='post-tag-counts'),
     path('<str:post_id>', PostDetailAPIView.as_view(), name='post-detail'),
+    path('<str:post_id>/revisions', PostRevisionListAPIView.as_view(),
+         name='post-revisions'),
+    path('<str:post_id>/revisions/<int:number>',
+         PostRevisionDetailAPIView.as_view(), name='post-revision'),
 ]
@@ -2,11 +2,27 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from api.posts.documents import Post
+from api.posts.storage import (PostNotFound, RevisionNotFound,
+                               get_post_repository)
+from api.posts.revisions import RevisionConflict
+from api.posts.counters import view_counter
+from api.posts import idempotency
+from api.posts.tags import (MATCH_MODES, InvalidCursor, InvalidTags,
+                            decode_cursor, encode_cursor, normalize_tags)
 from rest_framework.pagination import PageNumberPagination
-from bson import ObjectId
+from rest_framework.utils.urls import replace_query_param
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework.exceptions import Throttled
+from django.conf import settings
+import logging
+from bson import ObjectId
+from api.core.audit import audit
+from api.core.budgets import QueryBudget
+from api.posts.throttles import PostWriteUserThrottle, PostWriteGlobalThrottle
+
+logger = logging.getLogger(__name__)
 
 
 class PostPagination(PageNumberPagination):
@@ -24,11 +40,92 @@ class PostPermissons():
         return super().get_permissions()
 
 
-class PostAPIView(PostPermissons, APIView):
+class PostThrottles():
+    """
+    쓰기 요청에만 사용자별/전체 쓰기 스로틀 적용
+    스로틀은 initial 단계에서 검사되므로 게시글 Document 생성 전에 거부됩니다.
+    """
+    def get_throttles(self):
+        if self.request.method in ['POST', 'PUT', 'DELETE']:
+            self.throttle_classes = [PostWriteUserThrottle,
+                                     PostWriteGlobalThrottle]
+        else:
+            self.throttle_classes = []
+        return super().get_throttles()
+
+    def check_throttles(self, request):
+        # 사용자별 한도에 걸린 요청이 전체 한도를 소모하지 않도록
+        # 첫 번째로 거부한 스로틀에서 멈춤
+        for throttle in self.get_throttles():
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
+
+    def throttled(self, request, wait):
+        raise Throttled(wait, detail='게시글 작성 요청이 너무 많습니다.')
+
+
+class PostAPIView(PostPermissons, PostThrottles, APIView):
     """
     게시글 API
     """
+    # mysql: 인증(토큰 세대 캐시 miss + 사용자 조회)
+    # mongo: 목록은 보관 경계(캐시 miss 시) + count + find
+    #        (보관된 게시글이 있으면 posts_archive count(캐시 miss 시)와
+    #        페이지가 두 컬렉션에 걸칠 때 find 가 추가됨)
+    #        태그 목록은 보관 경계 + posts_archive/posts 페이지 조회
+    #        생성은 insert + 태그 수 $inc
+    #        (Idempotency-Key 사용 시 기록 insert, 응답 저장 추가)
+    query_budgets = {
+        'GET': QueryBudget(mysql=2, mongo=5),
+        'POST': QueryBudget(mysql=2, mongo=4),
+    }
+    load_classes = {'GET': 'post_read', 'POST': 'post_write'}
+
     def post(self, request):
+        key = request.headers.get(idempotency.HEADER)
+        if key is None:
+            return self.create_post(request)
+        if not key or len(key) > idempotency.MAX_KEY_LENGTH:
+            return Response({
+                'msg': '유효하지 않은 Idempotency-Key 입니다.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            record = idempotency.begin(
+                request.user.id, key,
+                idempotency.request_fingerprint(request.data)
+            )
+        except idempotency.IdempotencyInProgress:
+            return Response({
+                'msg': '같은 요청을 처리 중입니다. 잠시 후 다시 시도해주세요.'
+            }, status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'})
+        except idempotency.IdempotencyMismatch:
+            return Response({
+                'msg': '같은 Idempotency-Key 로 다른 요청을 보낼 수 없습니다.'
+            }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if record.status == 'done':
+            return Response(record.response_body,
+                            status=record.response_status,
+                            headers={'Idempotent-Replayed': 'true'})
+
+        response = self.create_post(request)
+        try:
+            if response.status_code >= 500:
+                idempotency.release(record)
+            else:
+                idempotency.complete(record, response.status_code,
+                                     response.data)
+        except Exception:
+            logger.exception('Idempotency-Key 응답 저장 실패: %s', key)
+        return response
+
+    def create_post(self, request):
         try:
             data = request.data
             title = data.get('title')
@@ -39,23 +136,30 @@ class PostAPIView(PostPermissons, APIView):
                 return Response({
                     'msg': '제목과 내용을 모두 입력해주세요.'
                 }, status=status.HTTP_400_BAD_REQUEST)
+            tags = normalize_tags(data.get('tags'))
 
-            post = Post(
+            post = get_post_repository().create(
                 title=title,
                 content=content,
-                author_id=author_id
+                author_id=author_id,
+                tags=tags
             )
-
-            post.save()
+            audit('post.create', user_id=author_id, post_id=str(post.id))
 
             return Response({
                 'id': str(post.id),
                 'title': post.title,
                 'content': post.content,
                 'author_id': post.author_id,
-                'created_at': post.created_at
+                'created_at': post.created_at,
+                'tags': post.tags
             }, status=status.HTTP_201_CREATED)
 
+        except InvalidTags as e:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'tags': [str(e)]}
+            }, status=status.HTTP_400_BAD_REQUEST)
         except ValidationError as e:
             return Response({
                 'msg': '유효하지 않은 데이터입니다.',
@@ -72,14 +176,13 @@ class PostAPIView(PostPermissons, APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def get(self, request):
+        if 'tags' in request.query_params:
+            return self.list_by_tags(request)
         try:
             paginator = PostPagination()
             author_params = request.query_params.get('author_id')
 
-            if author_params:
-                posts = Post.objects(author_id=author_params)
-            else:
-                posts = Post.objects()
+            posts = get_post_repository().filter(author_id=author_params)
 
             result_page = paginator.paginate_queryset(posts,
                                                       request,
@@ -91,7 +194,8 @@ class PostAPIView(PostPermissons, APIView):
                         'title': post.title,
                         'content': post.content,
                         'author_id': str(post.author_id),
-                        'created_at': post.created_at
+                        'created_at': post.created_at,
+                        'tags': post.tags
                     } for post in result_page
                 ]
                 return paginator.get_paginated_response(data)
@@ -102,7 +206,8 @@ class PostAPIView(PostPermissons, APIView):
                     'title': post.title,
                     'content': post.content,
                     'author_id': str(post.author_id),
-                    'created_at': post.created_at
+                    'created_at': post.created_at,
+                    'tags': post.tags
                 } for post in posts
             ], status=status.HTTP_200_OK)
 
@@ -117,24 +222,113 @@ class PostAPIView(PostPermissons, APIView):
                 'errors': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def list_by_tags(self, request):
+        """
+        태그 목록 조회 (?tags=a,b&tags_match=any|all&cursor=...)
+        (tags, created_at, _id) 인덱스를 타는 keyset 페이지라 count 쿼리 없이
+        다음 페이지 커서만 돌려줍니다.
+        """
+        params = request.query_params
+        match = params.get('tags_match', 'any')
+        try:
+            tags = normalize_tags(params.get('tags', '').split(','))
+            if not tags:
+                raise InvalidTags('태그를 입력해주세요.')
+            if match not in MATCH_MODES:
+                return Response({
+                    'msg': '유효하지 않은 데이터입니다.',
+                    'errors': {'tags_match': [
+                        'any 또는 all 만 사용할 수 있습니다.'
+                    ]}
+                }, status=status.HTTP_400_BAD_REQUEST)
+            page_size = min(
+                int(params.get('page_size', PostPagination.page_size)),
+                PostPagination.max_page_size
+            )
+            cursor = params.get('cursor')
+            after = decode_cursor(cursor) if cursor else None
+        except InvalidTags as e:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'tags': [str(e)]}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except InvalidCursor:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'cursor': ['유효하지 않은 페이지 정보입니다.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'page_size': ['정수를 입력해주세요.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page_size = max(page_size, 1)
+            posts = get_post_repository().filter_by_tags(
+                tags, match=match, after=after, limit=page_size + 1
+            )
+            next_url = None
+            if len(posts) > page_size:
+                posts = posts[:page_size]
+                next_url = replace_query_param(
+                    request.build_absolute_uri(), 'cursor',
+                    encode_cursor(posts[-1])
+                )
+            return Response({
+                'next': next_url,
+                'results': [
+                    {
+                        'id': str(post.id),
+                        'title': post.title,
+                        'content': post.content,
+                        'author_id': str(post.author_id),
+                        'created_at': post.created_at,
+                        'tags': post.tags
+                    } for post in posts
+                ]
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 
-class PostDetailAPIView(PostPermissons, APIView):
+class PostDetailAPIView(PostPermissons, PostThrottles, APIView):
     """
     게시글 상세 조회, 수정, 삭제 API
     """
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        # 조회는 posts 에 없으면 posts_archive 를 한 번 더 확인
+        'GET': QueryBudget(mysql=2, mongo=2),
+        # 수정은 조회 + 리비전 insert 와 게시글 update (한 번에 씀)
+        # 태그가 바뀌면 리비전 insert, 이전 태그를 받는 find_one_and_update,
+        # 태그 수 $inc, 0 이 된 태그 삭제로 나눠 씀
+        'PUT': QueryBudget(mysql=2, mongo=6),
+        # 조회 + 게시글/리비전 삭제 + 태그 수 $inc, 0 이 된 태그 삭제
+        'DELETE': QueryBudget(mysql=2, mongo=6),
+    }
+    load_classes = {'GET': 'post_read', 'PUT': 'post_write',
+                    'DELETE': 'post_write'}
 
     def get(self, request, post_id):
         try:
-            post = Post.objects.get(id=ObjectId(post_id))
+            post = get_post_repository().get(post_id)
+            # 조회수는 모아서 주기적으로 반영 (응답 값은 약간 늦을 수 있음)
+            view_counter.incr(str(post.id))
             return Response({
                 'id': str(post.id),
                 'title': post.title,
                 'content': post.content,
                 'author_id': post.author_id,
-                'created_at': post.created_at
+                'created_at': post.created_at,
+                'views': post.views,
+                'tags': post.tags,
+                'revision': post.revision
             }, status=status.HTTP_200_OK)
-        except Post.DoesNotExist:
+        except PostNotFound:
             return Response({
                 'msg': '존재하지 않는 게시글입니다.'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -151,24 +345,43 @@ class PostDetailAPIView(PostPermissons, APIView):
 
     def put(self, request, post_id):
         try:
-            post = Post.objects.get(id=ObjectId(post_id))
+            repository = get_post_repository()
+            post = repository.get(post_id)
             data = request.data
 
-            post.title = data.get('title', post.title)
-            post.content = data.get('content', post.content)
-            post.save()
+            fields = {
+                'title': data.get('title', post.title),
+                'content': data.get('content', post.content),
+            }
+            if 'tags' in data:
+                fields['tags'] = normalize_tags(data.get('tags'))
+            repository.update(post, editor_id=request.user.id, **fields)
+            audit('post.update', user_id=request.user.id,
+                  post_id=str(post.id))
 
             return Response({
                 'id': str(post.id),
                 'title': post.title,
                 'content': post.content,
                 'author_id': post.author_id,
-                'created_at': post.created_at
+                'created_at': post.created_at,
+                'tags': post.tags,
+                'revision': post.revision
             }, status=status.HTTP_200_OK)
-        except Post.DoesNotExist:
+        except PostNotFound:
             return Response({
                 'msg': '존재하지 않는 게시글입니다.'
             }, status=status.HTTP_404_NOT_FOUND)
+        except RevisionConflict:
+            return Response({
+                'msg': '다른 요청이 먼저 게시글을 수정했습니다. '
+                       '다시 시도해주세요.'
+            }, status=status.HTTP_409_CONFLICT)
+        except InvalidTags as e:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'tags': [str(e)]}
+            }, status=status.HTTP_400_BAD_REQUEST)
         except ValidationError as e:
             return Response({
                 'msg': '유효하지 않은 데이터입니다.',
@@ -186,10 +399,13 @@ class PostDetailAPIView(PostPermissons, APIView):
 
     def delete(self, request, post_id):
         try:
-            post = Post.objects.get(id=ObjectId(post_id))
-            post.delete()
+            repository = get_post_repository()
+            post = repository.get(post_id)
+            repository.delete(post)
+            audit('post.delete', user_id=request.user.id,
+                  post_id=str(post.id))
             return Response(status=status.HTTP_204_NO_CONTENT)
-        except Post.DoesNotExist:
+        except PostNotFound:
             return Response({
                 'msg': '존재하지 않는 게시글입니다.'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -207,3 +423,249 @@ class PostDetailAPIView(PostPermissons, APIView):
                 'msg': '서버 오류가 발생했습니다.',
                 'errors': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PostBatchAPIView(APIView):
+    """
+    게시글 일괄 조회 API
+    GET /posts/batch?ids=a,b,c 또는 POST {"ids": [...]} (긴 목록용)
+    한 번의 $in 쿼리로 조회하고, 요청한 순서대로 결과를 반환합니다.
+    """
+    permission_classes = [AllowAny]
+    query_budgets = {
+        # 한 번의 $in 쿼리 (posts 에 없는 id 는 posts_archive 에서 한 번 더)
+        'GET': QueryBudget(mysql=2, mongo=2),
+        'POST': QueryBudget(mysql=2, mongo=2),
+    }
+    load_classes = {'GET': 'bulk', 'POST': 'bulk'}
+
+    def get(self, request):
+        ids = request.query_params.get('ids', '')
+        return self._fetch([post_id for post_id in ids.split(',')
+                            if post_id])
+
+    def post(self, request):
+        ids = request.data.get('ids')
+        if not isinstance(ids, list):
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'ids': ['게시글 id 목록을 입력해주세요.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return self._fetch(ids)
+
+    def _fetch(self, ids):
+        if not ids:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'ids': ['게시글 id 목록을 입력해주세요.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.POSTS_BATCH_MAX_IDS:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'ids': [
+                    f'최대 {settings.POSTS_BATCH_MAX_IDS}개까지 조회할 수 '
+                    '있습니다.'
+                ]}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        invalid = [post_id for post_id in ids
+                   if not isinstance(post_id, str)
+                   or not ObjectId.is_valid(post_id)]
+        if invalid:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'ids': [f'유효하지 않은 게시글 id: {post_id}'
+                                   for post_id in invalid]}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = [post_id.lower() for post_id in ids]
+        try:
+            posts = get_post_repository().get_many(
+                list(dict.fromkeys(ids))
+            )
+            results = []
+            for post_id in ids:
+                post = posts.get(post_id)
+                if post is None:
+                    results.append({'id': post_id, 'found': False})
+                    continue
+                results.append({
+                    'id': post_id,
+                    'found': True,
+                    'title': post.title,
+                    'content': post.content,
+                    'author_id': post.author_id,
+                    'created_at': post.created_at,
+                    'views': post.views,
+                    'tags': post.tags
+                })
+            return Response({'results': results},
+                            status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PostTrendingAPIView(APIView):
+    """
+    인기 게시글 API
+    refresh_trending 명령이 미리 계산한 posts_trending 에서 점수 순으로 조회
+    """
+    permission_classes = [AllowAny]
+    query_budgets = {
+        'GET': QueryBudget(mysql=2, mongo=1),
+    }
+    load_classes = {'GET': 'post_read'}
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', 20)),
+                        settings.TRENDING_SIZE)
+        except ValueError:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'limit': ['정수를 입력해주세요.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            posts = get_post_repository().trending(max(limit, 1))
+            return Response([
+                {
+                    'id': str(post.id),
+                    'title': post.title,
+                    'author_id': str(post.author_id),
+                    'created_at': post.created_at,
+                    'views': post.views,
+                    'score': post.score
+                } for post in posts
+            ], status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PostTagCountsAPIView(APIView):
+    """
+    태그별 게시글 수 API
+    post_tag_counts 에 미리 반영된 값을 조회하고 잠시 캐시합니다.
+    """
+    permission_classes = [AllowAny]
+    query_budgets = {
+        'GET': QueryBudget(mysql=2, mongo=1),
+    }
+    load_classes = {'GET': 'post_read'}
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', 100)), 100)
+        except ValueError:
+            return Response({
+                'msg': '유효하지 않은 데이터입니다.',
+                'errors': {'limit': ['정수를 입력해주세요.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = max(limit, 1)
+            key = f'posts:tag_counts:{limit}'
+            counts = cache.get(key)
+            if counts is None:
+                counts = [
+                    {'tag': tag, 'count': count} for tag, count in
+                    get_post_repository().tag_counts(limit)
+                ]
+                cache.set(key, counts, settings.TAG_COUNTS_CACHE_SECONDS)
+            return Response(counts, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PostRevisionListAPIView(APIView):
+    """
+    게시글 수정 이력 목록 API
+    본문 없이 최신순으로 조회하며, 다음 페이지는 before 리비전 번호로 넘깁니다.
+    """
+    permission_classes = [AllowAny]
+    query_budgets = {
+        'GET': QueryBudget(mysql=2, mongo=2),
+    }
+    load_classes = {'GET': 'post_read'}
+
+    def get(self, request, post_id):
+        params = request.query_params
+        for name in ('page_size', 'before'):
+            if name in params and not params[name].isdigit():
+                return Response({
+                    'msg': '유효하지 않은 데이터입니다.',
+                    'errors': {name: ['정수를 입력해주세요.']}
+                }, status=status.HTTP_400_BAD_REQUEST)
+        page_size = min(
+            int(params.get('page_size', PostPagination.page_size)),
+            PostPagination.max_page_size
+        )
+        before = int(params['before']) if 'before' in params else None
+
+        try:
+            page_size = max(page_size, 1)
+            repository = get_post_repository()
+            post = repository.get(post_id)
+            revisions = repository.revisions(post, before=before,
+                                             limit=page_size + 1)
+            next_url = None
+            if len(revisions) > page_size:
+                revisions = revisions[:page_size]
+                next_url = replace_query_param(
+                    request.build_absolute_uri(), 'before',
+                    revisions[-1]['number']
+                )
+            return Response({
+                'current': post.revision + 1,
+                'next': next_url,
+                'results': revisions
+            }, status=status.HTTP_200_OK)
+        except PostNotFound:
+            return Response({
+                'msg': '존재하지 않는 게시글입니다.'
+            }, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PostRevisionDetailAPIView(APIView):
+    """
+    게시글 리비전 조회 API
+    가까운 snapshot 부터 delta 를 적용해 복원합니다.
+    """
+    permission_classes = [AllowAny]
+    query_budgets = {
+        'GET': QueryBudget(mysql=2, mongo=2),
+    }
+    load_classes = {'GET': 'post_read'}
+
+    def get(self, request, post_id, number):
+        try:
+            repository = get_post_repository()
+            post = repository.get(post_id)
+            return Response(repository.revision(post, number),
+                            status=status.HTTP_200_OK)
+        except PostNotFound:
+            return Response({
+                'msg': '존재하지 않는 게시글입니다.'
+            }, status=status.HTTP_404_NOT_FOUND)
+        except RevisionNotFound:
+            return Response({
+                'msg': '존재하지 않는 리비전입니다.'
+            }, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,3 +1,19 @@
 from django.contrib import admin
+from .models import User
+from .tokens import revoke_sessions
 
-# Register your models here.
+
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    list_display = ('id', 'email', 'is_staff', 'token_generation',
+                    'created_at')
+    search_fields = ('email',)
+    readonly_fields = ('token_generation', 'last_login', 'created_at')
+    exclude = ('password',)
+    actions = ['revoke_all_sessions']
+
+    @admin.action(description='선택한 사용자의 모든 세션 폐기')
+    def revoke_all_sessions(self, request, queryset):
+        revoked = revoke_sessions(queryset.values_list('pk', flat=True))
+        self.message_user(request,
+                          f'{revoked}개의 리프레시 토큰을 폐기했습니다.')
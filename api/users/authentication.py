@@ -0,0 +1,26 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from backend.routers import replica_reads
+from .tokens import GENERATION_CLAIM, get_token_generation
+
+
+class GenerationJWTAuthentication(JWTAuthentication):
+    """
+    토큰 세대(gen) 검사가 추가된 JWT 인증
+    전체 세션 폐기 이전에 발급된 access_token 을 거부합니다.
+    사용자 조회는 읽기 복제본에서 하고, 폐기 여부가 걸린 세대 조회는
+    primary 에서 합니다.
+    """
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None and validated_token.get(
+                GENERATION_CLAIM, 0) < get_token_generation(user_id):
+            raise InvalidToken('폐기된 토큰입니다.')
+        return validated_token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        with replica_reads(sticky_key=f'user:{user_id}'):
+            return super().get_user(validated_token)
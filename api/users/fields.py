@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class FixedBinaryField(models.BinaryField):
+    """
+    고정 길이 바이너리 필드
+
+    MySQL 에서는 BLOB 대신 BINARY(n) 으로 생성되어 unique 인덱스를
+    prefix 없이 걸 수 있고, 인덱스 엔트리 크기가 n 바이트로 고정됩니다.
+    """
+    def __init__(self, *args, length=32, **kwargs):
+        self.length = length
+        kwargs['max_length'] = length
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['length'] = self.length
+        kwargs.pop('max_length', None)
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        if connection.vendor == 'mysql':
+            return f'binary({self.length})'
+        return super().db_type(connection)
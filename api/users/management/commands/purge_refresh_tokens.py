@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.users.models import RefreshTokenModel
+
+
+class Command(BaseCommand):
+    help = '만료된 리프레시 토큰을 작은 배치 단위로 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='한 번의 DELETE 로 지울 최대 행 수')
+        parser.add_argument('--sleep', type=float, default=0.05,
+                            help='배치 사이 대기 시간(초)')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='실행할 최대 배치 수 (기본: 제한 없음)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        deleted = batches = 0
+
+        while options['max_batches'] is None \
+                or batches < options['max_batches']:
+            # expires_at 인덱스로 PK 만 먼저 읽고, PK 범위로 짧게 삭제해
+            # 한 트랜잭션이 잡는 락의 범위를 배치 크기로 제한
+            ids = list(
+                RefreshTokenModel.objects.expired(now)
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted += RefreshTokenModel.objects.filter(
+                pk__in=ids
+            ).delete()[0]
+            batches += 1
+            if len(ids) < batch_size:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(f'{deleted}개의 만료된 토큰을 삭제했습니다. '
+                          f'({batches} batches)')
@@ -1,6 +1,10 @@
+import hashlib
+from datetime import datetime, timezone as dt_timezone
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.hashers import make_password, check_password
+from .fields import FixedBinaryField
 
 
 class UserManager(BaseUserManager):
@@ -17,6 +21,8 @@ class UserManager(BaseUserManager):
     def create_superuser(self, email, password=None):
         """슈퍼 사용자 생성"""
         user = self.create_user(email, password)
+        user.is_staff = True
+        user.save(using=self._db, update_fields=['is_staff'])
         return user
 
 
@@ -29,6 +35,9 @@ class User(AbstractBaseUser):
     last_login = models.DateTimeField(blank=True, null=True,
                                       db_column='last_login')
     created_at = models.DateTimeField(auto_now_add=True)
+    is_staff = models.BooleanField(default=False)
+    # 전체 세션 폐기 시 증가. 토큰의 gen 클레임이 이보다 작으면 거부
+    token_generation = models.PositiveIntegerField(default=0)
 
     objects = UserManager()
 
@@ -41,17 +50,62 @@ class User(AbstractBaseUser):
     def check_password(self, raw_password):
         return check_password(raw_password, self.password)
 
+    def has_perm(self, perm, obj=None):
+        return self.is_staff
+
+    def has_module_perms(self, app_label):
+        return self.is_staff
+
     class Meta:
         db_table = 'user'
 
 
+def digest_token(refresh_token):
+    """리프레시 토큰 문자열의 SHA-256 digest (32 bytes)"""
+    return hashlib.sha256(refresh_token.encode()).digest()
+
+
+class RefreshTokenQuerySet(models.QuerySet):
+    def for_token(self, refresh_token):
+        """토큰 원문 대신 digest 로 조회"""
+        return self.filter(token_digest=digest_token(refresh_token))
+
+    def expired(self, now=None):
+        return self.filter(expires_at__lte=now or timezone.now())
+
+
+class RefreshTokenManager(models.Manager.from_queryset(RefreshTokenQuerySet)):
+    def build_for_token(self, user_id, refresh):
+        """
+        발급한 RefreshToken 을 digest 와 만료 시각으로 만든 (저장 전) 행
+        (User 인스턴스 없이 id 만으로 만들어 추가 조회가 없도록 함)
+        """
+        return self.model(
+            user_id=user_id,
+            token_digest=digest_token(str(refresh)),
+            expires_at=datetime.fromtimestamp(refresh['exp'],
+                                              tz=dt_timezone.utc)
+        )
+
+    def create_for_token(self, user_id, refresh):
+        token = self.build_for_token(user_id, refresh)
+        token.save(force_insert=True, using=self.db)
+        return token
+
+
 class RefreshTokenModel(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    refresh_token = models.CharField(max_length=255, unique=True)
+    # 토큰 원문(JWT) 대신 SHA-256 digest 만 저장해 unique 인덱스를 32바이트로 고정
+    token_digest = FixedBinaryField(length=32, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+    objects = RefreshTokenManager()
 
     class Meta:
         db_table = 'refresh_token'
+        indexes = [
+            # 사용자 단위 일괄 삭제(전체 세션 폐기)용 인덱스
+            models.Index(fields=['user', 'expires_at'],
+                         name='refresh_token_user_exp_idx'),
+        ]
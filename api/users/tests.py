@@ -1,10 +1,35 @@
+import shutil
+import tempfile
 import unittest
 from rest_framework.test import APIClient
 from django.urls import reverse
 from .models import User, RefreshTokenModel
+from .tokens import issue_refresh_token
 from django.contrib.auth.hashers import make_password
 from rest_framework_simplejwt.tokens import RefreshToken
 from datetime import timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from io import StringIO
+from unittest.mock import patch
+from api.core.throttling import SlidingWindowCounter, throttle_stats
+from .throttles import LoginEmailThrottle, LoginIPThrottle
+from .views import (UserLoginAPIView, UserTokenRefreshAPIView,
+                    UserLogoutAPIView, UserRevokeSessionsAPIView,
+                    email_sticky_key)
+from django.core.exceptions import ImproperlyConfigured
+from api.core.budgets import assert_query_budget
+from api.core.tasks import background
+from .authentication import GenerationJWTAuthentication
+from backend import routers
+from django.db import IntegrityError, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from api.core.checks import check_shared_cache, shared_cache_features
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from backend.warmup import prime_application
 
 
 class UserSignUpTestCase(unittest.TestCase):
@@ -18,6 +43,7 @@ class UserSignUpTestCase(unittest.TestCase):
 
     def tearDown(self):
         User.objects.all().delete()
+        background.drain()
 
     def test_user_signup(self):
         data = {
@@ -78,6 +104,8 @@ class UserLoginTestCase(unittest.TestCase):
 
     def tearDown(self):
         User.objects.all().delete()
+        background.drain()
+        cache.clear()
 
     def test_user_login(self):
         """
@@ -112,6 +140,23 @@ class UserLoginTestCase(unittest.TestCase):
         response = self.client.post(reverse('login'), data, format='json')
         self.assertEqual(response.status_code, 400)
 
+    def test_user_login_stores_token_digest(self):
+        """
+        로그인 시 리프레시 토큰이 digest 로 저장되는지 테스트
+        """
+        data = {
+            'email': 'test@example.com',
+            'password': 'test_password'
+        }
+        response = self.client.post(reverse('login'), data, format='json')
+        self.assertEqual(response.status_code, 200)
+        # 토큰 INSERT 는 백그라운드에서 실행됨
+        background.drain()
+        token_obj = RefreshTokenModel.objects.for_token(
+            response.data['refresh_token']).get()
+        self.assertEqual(len(bytes(token_obj.token_digest)), 32)
+        self.assertGreater(token_obj.expires_at, timezone.now())
+
     def test_user_login_with_wrong_password(self):
         """
         잘못된 비밀번호로 로그인 테스트
@@ -128,6 +173,109 @@ class UserLoginTestCase(unittest.TestCase):
         )
 
 
+class UserLoginThrottleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.login_url = reverse('login')
+        throttle_stats.reset()
+
+    def tearDown(self):
+        cache.clear()
+        throttle_stats.reset()
+
+    @patch.object(LoginEmailThrottle, 'rate', '3/min', create=True)
+    def test_login_throttled_by_email(self):
+        """
+        같은 이메일로 반복 로그인 시 DB 조회 전에 429 를 반환하는지 테스트
+        """
+        data = {
+            'email': 'nobody@example.com',
+            'password': 'wrong_password'
+        }
+        for _ in range(3):
+            response = self.client.post(self.login_url, data, format='json')
+            self.assertEqual(response.status_code, 401)
+
+        with patch.object(User.objects, 'get') as get:
+            response = self.client.post(self.login_url, data, format='json')
+            get.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(throttle_stats.snapshot()['login_email'],
+                         {'allowed': 3, 'rejected': 1})
+
+        data['email'] = 'other@example.com'
+        response = self.client.post(self.login_url, data, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    @patch.object(LoginIPThrottle, 'rate', '2/min', create=True)
+    def test_login_ip_throttle_ignores_forwarded_for(self):
+        """
+        X-Forwarded-For 를 바꿔 보내도 IP 단위 제한을 우회할 수 없는지 테스트
+        """
+        statuses = [
+            self.client.post(self.login_url, {
+                'email': f'user{i}@example.com',
+                'password': 'wrong_password'
+            }, format='json', HTTP_X_FORWARDED_FOR=f'10.0.0.{i}').status_code
+            for i in range(3)
+        ]
+        self.assertEqual(statuses, [401, 401, 429])
+
+
+class SlidingWindowCounterTestCase(unittest.TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_previous_window_is_weighted(self):
+        """
+        직전 윈도우의 횟수가 경과 비율만큼 줄어들어 반영되는지 테스트
+        """
+        counter = SlidingWindowCounter(cache, limit=4, window=60)
+        for _ in range(4):
+            self.assertTrue(counter.hit('test', now=59)[0])
+        allowed, wait = counter.hit('test', now=59)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+
+        # 다음 윈도우 절반 지점: 4 * 0.5 = 2 만큼만 반영
+        self.assertTrue(counter.hit('test', now=90)[0])
+        self.assertTrue(counter.hit('test', now=90)[0])
+        self.assertFalse(counter.hit('test', now=90)[0])
+
+    def test_concurrent_hits_do_not_exceed_limit(self):
+        """
+        다른 워커의 요청이 판단 도중에 끼어들어도 한도를 넘겨 허용하지 않고,
+        거절한 요청은 횟수에 포함하지 않는지 테스트
+        """
+        shared = LocMemCache('throttle-race', {})
+        counter = SlidingWindowCounter(shared, limit=1, window=60)
+        results = []
+        get = shared.get
+        interleaved = []
+
+        def get_with_concurrent_hit(key, default=None):
+            if not interleaved:
+                interleaved.append(key)
+                results.append(counter.hit('test', now=10)[0])
+            return get(key, default)
+
+        with patch.object(shared, 'get', get_with_concurrent_hit):
+            results.append(counter.hit('test', now=10)[0])
+        self.assertEqual(sorted(results), [False, True])
+        self.assertEqual(shared.get('test:0'), 1)
+
+    def test_throttles_require_shared_cache(self):
+        self.assertIn('스로틀 카운터', shared_cache_features())
+        rates = dict.fromkeys(
+            settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+        )
+        with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates
+        }):
+            self.assertNotIn('스로틀 카운터', shared_cache_features())
+
+
 class UserTokenRefreshTestCase(unittest.TestCase):
     def setUp(self):
         """
@@ -141,13 +289,12 @@ class UserTokenRefreshTestCase(unittest.TestCase):
         )
         self.refresh = RefreshToken.for_user(self.user)
         self.refresh_token = str(self.refresh)
-        RefreshTokenModel.objects.create(
-            user=self.user,
-            refresh_token=self.refresh_token
-        )
+        RefreshTokenModel.objects.create_for_token(self.user.id,
+                                                   self.refresh)
 
     def tearDown(self):
         User.objects.all().delete()
+        background.drain()
         RefreshTokenModel.objects.all().delete()
 
     def test_token_refresh(self):
@@ -207,13 +354,12 @@ class UserLogoutTestCase(unittest.TestCase):
         )
         self.refresh = RefreshToken.for_user(self.user)
         self.refresh_token = str(self.refresh)
-        RefreshTokenModel.objects.create(
-            user=self.user,
-            refresh_token=self.refresh_token
-        )
+        RefreshTokenModel.objects.create_for_token(self.user.id,
+                                                   self.refresh)
 
     def tearDown(self):
         User.objects.all().delete()
+        background.drain()
         RefreshTokenModel.objects.all().delete()
 
     def test_user_logout(self):
@@ -226,8 +372,8 @@ class UserLogoutTestCase(unittest.TestCase):
         response = self.client.post(self.logout_url, data, format='json')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['msg'], '로그아웃 되었습니다.')
-        self.assertFalse(RefreshTokenModel.objects.filter(
-            refresh_token=self.refresh_token).exists())
+        self.assertFalse(RefreshTokenModel.objects.for_token(
+            self.refresh_token).exists())
 
     def test_user_logout_with_invalid_token(self):
         """
@@ -248,3 +394,322 @@ class UserLogoutTestCase(unittest.TestCase):
         response = self.client.post(self.logout_url, data, format='json')
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['msg'], '토큰이 제공되지 않았습니다.')
+
+
+class UserRevokeSessionsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.logout_all_url = reverse('logout-all')
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+        self.refresh_tokens = []
+        for _ in range(3):
+            refresh = issue_refresh_token(self.user)
+            RefreshTokenModel.objects.create_for_token(self.user.id, refresh)
+            self.refresh_tokens.append(refresh)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.refresh_tokens[0].access_token}'
+        )
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        RefreshTokenModel.objects.all().delete()
+        cache.clear()
+
+    def test_revoke_all_sessions(self):
+        """
+        전체 세션 폐기 시 모든 리프레시 토큰이 삭제되는지 테스트
+        """
+        with assert_query_budget(self, UserRevokeSessionsAPIView, 'POST'):
+            response = self.client.post(self.logout_all_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['revoked'], 3)
+        self.assertFalse(
+            RefreshTokenModel.objects.filter(user=self.user).exists()
+        )
+
+    def test_revoked_access_token_is_rejected(self):
+        """
+        폐기 이전에 발급된 access_token 이 거부되는지 테스트
+        """
+        self.client.post(self.logout_all_url)
+        response = self.client.post(self.logout_all_url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_revoke_all_sessions_with_no_credentials(self):
+        """
+        인증 없이 전체 세션 폐기 테스트
+        """
+        self.client.credentials()
+        response = self.client.post(self.logout_all_url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_process_local_cache_fails_at_startup(self):
+        """
+        토큰 세대를 워커별 캐시에 두는 설정은 기동 시 거부되는지 테스트
+        """
+        self.assertEqual(check_shared_cache(None), [])
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }}):
+            errors = check_shared_cache(None)
+            with self.assertRaises(ImproperlyConfigured):
+                prime_application()
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+        self.assertIn('토큰 세대', errors[0].msg)
+
+
+class PurgeRefreshTokenTestCase(unittest.TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        RefreshTokenModel.objects.all().delete()
+
+    def test_purge_expired_tokens(self):
+        """
+        만료된 토큰만 배치 단위로 삭제되는지 테스트
+        """
+        for _ in range(5):
+            expired = RefreshToken.for_user(self.user)
+            expired.set_exp(lifetime=timedelta(seconds=-1))
+            RefreshTokenModel.objects.create_for_token(self.user.id, expired)
+        valid = RefreshToken.for_user(self.user)
+        RefreshTokenModel.objects.create_for_token(self.user.id, valid)
+
+        out = StringIO()
+        call_command('purge_refresh_tokens', batch_size=2, sleep=0,
+                     stdout=out)
+        self.assertIn('5개', out.getvalue())
+        self.assertEqual(RefreshTokenModel.objects.count(), 1)
+        self.assertTrue(
+            RefreshTokenModel.objects.for_token(str(valid)).exists()
+        )
+
+
+class UserQueryBudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        RefreshTokenModel.objects.all().delete()
+        cache.clear()
+
+    def test_login_refresh_logout_within_budget(self):
+        """
+        로그인, 토큰 갱신, 로그아웃이 선언된 쿼리 예산 이내인지 테스트
+        """
+        with assert_query_budget(self, UserLoginAPIView, 'POST'):
+            response = self.client.post(reverse('login'), {
+                'email': 'test@example.com',
+                'password': 'test_password'
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        data = {'refresh_token': response.data['refresh_token']}
+
+        with assert_query_budget(self, UserTokenRefreshAPIView, 'POST'):
+            response = self.client.post(reverse('refresh'), data,
+                                        format='json')
+        self.assertEqual(response.status_code, 200)
+        data = {'refresh_token': response.data['refresh_token']}
+
+        with assert_query_budget(self, UserLogoutAPIView, 'POST'):
+            response = self.client.post(reverse('logout'), data,
+                                        format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class RefreshTokenRotationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+
+    def tearDown(self):
+        User.objects.all().delete()
+        background.drain()
+        RefreshTokenModel.objects.all().delete()
+        cache.clear()
+
+    def test_refresh_right_after_login(self):
+        """
+        로그인 응답을 받은 즉시 토큰이 저장되어 있어 바로 갱신할 수 있는지 테스트
+        """
+        response = self.client.post(reverse('login'), {
+            'email': 'test@example.com',
+            'password': 'test_password'
+        }, format='json')
+        self.assertTrue(RefreshTokenModel.objects.for_token(
+            response.data['refresh_token']
+        ).exists())
+        response = self.client.post(reverse('refresh'), {
+            'refresh_token': response.data['refresh_token']
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(RefreshTokenModel.objects.for_token(
+            response.data['refresh_token']
+        ).exists())
+
+    def test_failed_insert_keeps_previous_token(self):
+        """
+        새 토큰 저장이 실패하면 사용한 토큰 삭제도 되돌려지는지 테스트
+        """
+        refresh = issue_refresh_token(self.user)
+        RefreshTokenModel.objects.create_for_token(self.user.id, refresh)
+        with patch.object(RefreshTokenModel.objects, 'create_for_token',
+                          side_effect=IntegrityError):
+            response = self.client.post(reverse('refresh'), {
+                'refresh_token': str(refresh)
+            }, format='json')
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(
+            RefreshTokenModel.objects.for_token(str(refresh)).exists()
+        )
+
+
+class ReplicaRouterTestCase(unittest.TestCase):
+    """
+    default 와 같은 DB 를 가리키는 replica 별칭으로 읽기 라우팅 테스트
+    """
+    def setUp(self):
+        connections.settings['replica'] = dict(connections.settings['default'])
+        # primary 고정 표시는 워커 간 공유 캐시에 저장해야 함
+        self.cache_dir = tempfile.mkdtemp()
+        self.settings = override_settings(
+            DATABASE_REPLICAS=['replica'],
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': self.cache_dir,
+            }}
+        )
+        self.settings.enable()
+        self.lag = 0
+        self.monitor = patch.object(
+            routers, 'lag_monitor',
+            routers.ReplicaLagMonitor(measure=lambda alias: self.lag)
+        )
+        self.monitor.start()
+        self.client = APIClient()
+        self.user = User.objects.create(
+            email='test@example.com',
+            password=make_password('test_password')
+        )
+
+    def tearDown(self):
+        self.monitor.stop()
+        User.objects.all().delete()
+        background.drain()
+        self.settings.disable()
+        shutil.rmtree(self.cache_dir)
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        routers.reset_routing_state()
+        cache.clear()
+
+    def _login(self, email='test@example.com', password='test_password'):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.post(reverse('login'), {
+                'email': email, 'password': password
+            }, format='json')
+        return response, len(primary), len(replica)
+
+    def test_login_reads_from_replica(self):
+        # 사용자 조회만 복제본, 리프레시 토큰 INSERT 는 primary
+        response, primary, replica = self._login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((primary, replica), (1, 1))
+
+    def test_login_right_after_signup_reads_from_primary(self):
+        response = self.client.post(reverse('signup'), {
+            'email': 'new@example.com', 'password': 'new_password'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        response, primary, replica = self._login('new@example.com',
+                                                 'new_password')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((primary, replica), (2, 0))
+
+    def test_sticky_email_key_is_normalized(self):
+        response = self.client.post(reverse('signup'), {
+            'email': 'New@Example.com', 'password': 'new_password'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(routers.is_sticky(
+            email_sticky_key(' new@EXAMPLE.com ')
+        ))
+
+    def test_process_local_cache_fails_at_startup(self):
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }}):
+            with self.assertRaises(ImproperlyConfigured):
+                routers.ReplicaRoutingMiddleware(lambda request: None)
+
+    def test_lagging_replica_is_skipped(self):
+        self.lag = 60
+        with self.assertLogs('backend.routers', 'WARNING'):
+            _, primary, replica = self._login()
+        self.assertEqual((primary, replica), (2, 0))
+
+    def test_jwt_user_fetch_and_sticky_window(self):
+        token = RefreshToken.for_user(self.user).access_token
+        authentication = GenerationJWTAuthentication()
+        routers.reset_routing_state()
+        with CaptureQueriesContext(connections['replica']) as replica:
+            self.assertEqual(authentication.get_user(token).pk, self.user.pk)
+        self.assertEqual(len(replica), 1)
+
+        # 쓰기가 있었던 인증 요청 뒤에는 같은 사용자를 primary 에서 조회
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.client.post(reverse('logout-all'))
+        routers.reset_routing_state()
+        with CaptureQueriesContext(connections['replica']) as replica:
+            authentication.get_user(token)
+        self.assertEqual(len(replica), 0)
+
+    def test_reads_after_write_use_primary(self):
+        router = routers.ReplicaRouter()
+        routers.reset_routing_state()
+        with routers.replica_reads():
+            self.assertEqual(router.db_for_read(User), 'replica')
+            self.assertEqual(router.db_for_write(User), 'default')
+            self.assertEqual(router.db_for_read(User), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'users'))
+
+    def test_lag_monitor_caches_checks(self):
+        now = [0.0]
+        measured = []
+
+        def measure(alias):
+            measured.append(alias)
+            return None  # 복제 중단
+
+        monitor = routers.ReplicaLagMonitor(measure=measure,
+                                            clock=lambda: now[0])
+        with override_settings(REPLICA_LAG_CHECK_INTERVAL=5), \
+                self.assertLogs('backend.routers', 'WARNING'):
+            self.assertFalse(monitor.healthy('replica'))
+            now[0] = 4
+            self.assertFalse(monitor.healthy('replica'))
+            now[0] = 6
+            monitor.healthy('replica')
+        self.assertEqual(measured, ['replica', 'replica'])
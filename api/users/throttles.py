@@ -0,0 +1,30 @@
+from api.core.throttling import SlidingWindowRateThrottle
+
+
+class LoginEmailThrottle(SlidingWindowRateThrottle):
+    """
+    이메일 단위 로그인 시도 제한
+    """
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not email or not isinstance(email, str):
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.hash_ident(email.strip().lower())
+        }
+
+
+class LoginIPThrottle(SlidingWindowRateThrottle):
+    """
+    클라이언트 IP 단위 로그인 시도 제한
+    """
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
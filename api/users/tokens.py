@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import User, RefreshTokenModel
+
+GENERATION_CLAIM = 'gen'
+GENERATION_CACHE_KEY = 'users:token_gen:{}'
+GENERATION_CACHE_TIMEOUT = 60 * 60
+
+
+def issue_refresh_token(user):
+    """
+    사용자의 현재 토큰 세대(gen)를 클레임에 담아 RefreshToken 발급
+    access_token 은 이 클레임을 그대로 복사합니다.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh[GENERATION_CLAIM] = user.token_generation
+    return refresh
+
+
+def rotate_refresh_token(token, refresh):
+    """
+    사용한 리프레시 토큰 행을 지우고 새 토큰 행을 저장
+    (둘 중 하나만 반영되어 세션을 잃거나 이전 토큰이 남지 않도록 한 트랜잭션)
+    """
+    with transaction.atomic():
+        token.delete()
+        # token.user 를 참조하면 User 를 추가로 조회하므로 id 사용
+        RefreshTokenModel.objects.create_for_token(token.user_id, refresh)
+
+
+def get_token_generation(user_id):
+    """
+    캐시된 토큰 세대 조회 (캐시 miss 시에만 DB 조회)
+    """
+    key = GENERATION_CACHE_KEY.format(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = User.objects.filter(pk=user_id).values_list(
+            'token_generation', flat=True
+        ).first() or 0
+        cache.set(key, generation, GENERATION_CACHE_TIMEOUT)
+    return generation
+
+
+def revoke_sessions(user_ids):
+    """
+    사용자들의 모든 리프레시 토큰을 한 번의 DELETE 로 삭제하고
+    토큰 세대를 증가시켜 이미 발급된 access_token 도 무효화
+    """
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        deleted, _ = RefreshTokenModel.objects.filter(
+            user_id__in=user_ids
+        ).delete()
+        User.objects.filter(pk__in=user_ids).update(
+            token_generation=F('token_generation') + 1
+        )
+        generations = {
+            GENERATION_CACHE_KEY.format(user_id): generation
+            for user_id, generation in User.objects.filter(
+                pk__in=user_ids
+            ).values_list('pk', 'token_generation')
+        }
+    cache.set_many(generations, GENERATION_CACHE_TIMEOUT)
+    return deleted
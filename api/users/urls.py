@@ -2,11 +2,14 @@ from django.urls import path
 from .views import (UserSignUpAPIView,
                     UserLoginAPIView,
                     UserTokenRefreshAPIView,
-                    UserLogoutAPIView)
+                    UserLogoutAPIView,
+                    UserRevokeSessionsAPIView)
 
 urlpatterns = [
     path('signup', UserSignUpAPIView.as_view(), name='signup'),
     path('login', UserLoginAPIView.as_view(), name='login'),
     path('refresh', UserTokenRefreshAPIView.as_view(), name='refresh'),
     path('logout', UserLogoutAPIView.as_view(), name='logout'),
+    path('logout-all', UserRevokeSessionsAPIView.as_view(),
+         name='logout-all'),
 ]
@@ -2,16 +2,36 @@ from django.contrib.auth.hashers import check_password
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import Throttled
 from .models import User, RefreshTokenModel
+from api.core.budgets import QueryBudget
 from .serializers import UserSerializer
+from .throttles import LoginEmailThrottle, LoginIPThrottle
+from .tokens import (issue_refresh_token, revoke_sessions,
+                     rotate_refresh_token)
+from api.core.audit import audit
+from backend.routers import replica_reads, stick_to_primary
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.core.exceptions import ValidationError
 
 
+def email_sticky_key(email):
+    """
+    가입 직후 로그인을 primary 로 보낼 sticky 키
+    (MySQL 의 대소문자 무시 비교와 같도록 공백 제거 + 소문자)
+    """
+    return f'email:{str(email).strip().lower()}'
+
+
 class UserSignUpAPIView(APIView):
     """
     회원가입 API
     """
+    # 이메일 중복 조회, 시리얼라이저 unique 검사, INSERT
+    query_budgets = {'POST': QueryBudget(mysql=3)}
+    load_classes = {'POST': 'auth'}
+
     def post(self, request):
         try:
             user = User.objects.get(email=request.data.get('email'))
@@ -22,7 +42,8 @@ class UserSignUpAPIView(APIView):
             data = request.data
             serializer = UserSerializer(data=data)
             if serializer.is_valid():
-                serializer.save()
+                user = serializer.save()
+                stick_to_primary(email_sticky_key(user.email))
                 return Response(serializer.data,
                                 status=status.HTTP_201_CREATED)
             return Response(serializer.errors,
@@ -33,6 +54,15 @@ class UserLoginAPIView(APIView):
     """
     로그인 API
     """
+    # 스로틀은 인증/조회/비밀번호 해시 이전(initial 단계)에 검사됩니다.
+    throttle_classes = [LoginEmailThrottle, LoginIPThrottle]
+    # 사용자 조회, 리프레시 토큰 INSERT
+    query_budgets = {'POST': QueryBudget(mysql=2)}
+    load_classes = {'POST': 'auth'}
+
+    def throttled(self, request, wait):
+        raise Throttled(wait, detail='로그인 시도가 너무 많습니다.')
+
     def post(self, request):
         try:
             email = request.data.get('email')
@@ -43,21 +73,21 @@ class UserLoginAPIView(APIView):
                     'msg': '이메일과 비밀번호를 모두 입력해주세요.'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            user = User.objects.get(email=email)
+            # 가입 직후에는 primary 에서 조회 (UserSignUpAPIView)
+            with replica_reads(sticky_key=email_sticky_key(email)):
+                user = User.objects.get(email=email)
 
             if not check_password(password, user.password):
                 return Response({
                     'msg': '비밀번호가 일치하지 않습니다.'
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
-            refresh = RefreshToken.for_user(user)
+            refresh = issue_refresh_token(user)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
 
-            RefreshTokenModel.objects.create(
-                user=user,
-                refresh_token=refresh_token
-            )
+            RefreshTokenModel.objects.create_for_token(user.id, refresh)
+            audit('user.login', user_id=user.id)
 
             return Response({
                 'access_token': access_token,
@@ -84,6 +114,11 @@ class UserTokenRefreshAPIView(APIView):
     """
     토큰 갱신 API
     """
+    # 토큰 조회, 삭제, INSERT
+    # (SQLite 는 트랜잭션 시작 BEGIN 도 쿼리로 집계되어 1 을 더함)
+    query_budgets = {'POST': QueryBudget(mysql=4)}
+    load_classes = {'POST': 'auth'}
+
     def post(self, request):
         try:
             refresh_token = request.data.get('refresh_token')
@@ -92,8 +127,8 @@ class UserTokenRefreshAPIView(APIView):
                     'msg': '토큰이 제공되지 않았습니다.'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            refresh_token_obj = RefreshTokenModel.objects.filter(
-                refresh_token=refresh_token
+            refresh_token_obj = RefreshTokenModel.objects.for_token(
+                refresh_token
             ).first()
 
             if refresh_token_obj is None:
@@ -101,15 +136,11 @@ class UserTokenRefreshAPIView(APIView):
                     'msg': '유효하지 않은 토큰입니다.'
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
-            refresh_token_obj.delete()
             refresh = RefreshToken(refresh_token)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
 
-            RefreshTokenModel.objects.create(
-                user=refresh_token_obj.user,
-                refresh_token=refresh_token
-            )
+            rotate_refresh_token(refresh_token_obj, refresh)
 
             return Response({
                 'access_token': access_token,
@@ -132,6 +163,9 @@ class UserLogoutAPIView(APIView):
     """
     로그아웃 API
     """
+    query_budgets = {'POST': QueryBudget(mysql=2)}
+    load_classes = {'POST': 'auth'}
+
     def post(self, request):
         try:
             refresh_token = request.data.get('refresh_token')
@@ -140,8 +174,8 @@ class UserLogoutAPIView(APIView):
                     'msg': '토큰이 제공되지 않았습니다.'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            refresh_token_obj = RefreshTokenModel.objects.filter(
-                refresh_token=refresh_token
+            refresh_token_obj = RefreshTokenModel.objects.for_token(
+                refresh_token
             ).first()
 
             if refresh_token_obj is None:
@@ -162,3 +196,29 @@ class UserLogoutAPIView(APIView):
                 'msg': '서버 오류가 발생했습니다.',
                 'errors': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class UserRevokeSessionsAPIView(APIView):
+    """
+    전체 세션 폐기(모든 기기에서 로그아웃) API
+    """
+    permission_classes = [IsAuthenticated]
+    # 인증(토큰 세대 캐시 miss + 사용자 조회), DELETE, UPDATE, 세대 재조회
+    # (SQLite 는 트랜잭션 시작 BEGIN 도 쿼리로 집계되어 1 을 더함)
+    query_budgets = {'POST': QueryBudget(mysql=6)}
+    load_classes = {'POST': 'auth'}
+
+    def post(self, request):
+        try:
+            revoked = revoke_sessions([request.user.id])
+            audit('user.revoke_sessions', user_id=request.user.id,
+                  revoked=revoked)
+            return Response({
+                'msg': '모든 세션이 로그아웃 되었습니다.',
+                'revoked': revoked
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'msg': '서버 오류가 발생했습니다.',
+                'errors': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
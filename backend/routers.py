@@ -0,0 +1,214 @@
+"""
+MySQL 읽기 복제본 라우팅
+
+settings.DATABASE_REPLICAS 에 나열한 별칭으로 replica_reads() 블록 안의
+읽기만 보냅니다. 그 밖의 읽기와 모든 쓰기는 primary(default)로 갑니다.
+
+    with replica_reads(sticky_key=f'user:{user_id}'):
+        user = User.objects.get(pk=user_id)
+
+- 같은 요청에서 이미 쓴 뒤의 읽기는 primary 로 보냅니다.
+- stick_to_primary(key) 로 표시한 키는 REPLICA_STICKY_SECONDS 동안
+  primary 에서 읽습니다. (가입 직후 로그인, 수정 직후 인증 등)
+  ReplicaRoutingMiddleware 가 쓰기가 있었던 인증 요청의 사용자를 표시합니다.
+- 복제 지연이 REPLICA_MAX_LAG_SECONDS 를 넘거나 복제가 멈춘 복제본은
+  REPLICA_LAG_CHECK_INTERVAL 초마다 다시 확인할 때까지 건너뜁니다.
+
+sticky 표시는 캐시에 저장되므로 다른 워커/서버도 볼 수 있도록 공유 캐시가
+필요합니다. 복제본을 설정했는데 프로세스별 캐시면 시작할 때 실패합니다.
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from api.core import metrics
+from api.core.checks import require_shared_cache
+
+logger = logging.getLogger(__name__)
+
+STICKY_CACHE_KEY = 'db:sticky:{}'
+
+replica_reads_total = metrics.registry.register(metrics.Counter(
+    'db_replica_reads_total', '복제본 대상 읽기를 보낸 DB 별칭 수',
+    ('alias',)
+))
+
+
+class RoutingState:
+    __slots__ = ('replica_reads', 'wrote')
+
+    def __init__(self):
+        self.replica_reads = False
+        self.wrote = False
+
+
+_state = contextvars.ContextVar('db_routing_state', default=None)
+
+
+def routing_state():
+    state = _state.get()
+    if state is None:
+        state = RoutingState()
+        _state.set(state)
+    return state
+
+
+def reset_routing_state():
+    """요청 시작 시 라우팅 상태 초기화"""
+    state = RoutingState()
+    _state.set(state)
+    return state
+
+
+def stick_to_primary(key):
+    """key 의 읽기를 REPLICA_STICKY_SECONDS 동안 primary 로 고정"""
+    cache.set(STICKY_CACHE_KEY.format(key), True,
+              settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(key):
+    return cache.get(STICKY_CACHE_KEY.format(key)) is not None
+
+
+@contextmanager
+def replica_reads(sticky_key=None):
+    """블록 안의 읽기를 복제본으로 (sticky_key 를 최근에 썼으면 primary)"""
+    state = routing_state()
+    previous = state.replica_reads
+    state.replica_reads = bool(settings.DATABASE_REPLICAS) and not (
+        sticky_key is not None and is_sticky(sticky_key)
+    )
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+
+
+def replica_lag(alias):
+    """
+    복제 지연(초)
+    복제가 멈췄으면 None, 복제 설정이 없는 DB(로컬 별칭, SQLite)는 0
+    """
+    connection = connections[alias]
+    if connection.vendor != 'mysql':
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute('SHOW REPLICA STATUS')
+        row = cursor.fetchone()
+        if row is None:
+            return 0
+        columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, row)).get('Seconds_Behind_Source')
+
+
+class ReplicaLagMonitor:
+    """복제본별 지연 확인 결과를 REPLICA_LAG_CHECK_INTERVAL 초 동안 재사용"""
+    def __init__(self, measure=replica_lag, clock=time.monotonic):
+        self._measure = measure
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._status = {}
+
+    def healthy(self, alias):
+        now = self._clock()
+        with self._lock:
+            status = self._status.get(alias)
+            if status is not None and \
+                    now - status[0] < settings.REPLICA_LAG_CHECK_INTERVAL:
+                return status[1]
+            # 확인하는 동안 다른 요청은 이전 결과(처음이면 primary)를 사용
+            self._status[alias] = (now, status[1] if status else False)
+
+        try:
+            lag = self._measure(alias)
+        except Exception:
+            logger.exception('복제본 지연 확인 실패: %s', alias)
+            lag = None
+        healthy = lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if not healthy:
+            logger.warning('복제본 %s 제외 (지연: %s초)', alias, lag)
+        with self._lock:
+            self._status[alias] = (now, healthy)
+        return healthy
+
+    def healthy_replicas(self):
+        return [alias for alias in settings.DATABASE_REPLICAS
+                if self.healthy(alias)]
+
+    def snapshot(self):
+        with self._lock:
+            return {alias: healthy
+                    for alias, (_, healthy) in self._status.items()}
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+@metrics.registry.register_collector
+def collect_replicas():
+    snapshot = lag_monitor.snapshot()
+    if not snapshot:
+        return
+    yield '# HELP db_replica_healthy 복제본 사용 가능 여부 (지연 확인 결과)'
+    yield '# TYPE db_replica_healthy gauge'
+    for alias, healthy in snapshot.items():
+        yield f'db_replica_healthy{{alias="{alias}"}} {int(healthy)}'
+
+
+class ReplicaRouter:
+    """
+    replica_reads() 블록 안의 읽기만 지연이 허용 범위인 복제본으로 보냄
+    복제본이 없거나 모두 제외되면 primary 에서 읽습니다.
+    """
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.wrote \
+                or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        replicas = lag_monitor.healthy_replicas()
+        alias = random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+        replica_reads_total.inc((alias,))
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # 같은 요청의 이후 읽기는 방금 쓴 내용을 볼 수 있도록 primary 로
+        routing_state().wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 복제본은 primary 에서 복제되므로 직접 마이그레이션하지 않음
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    요청마다 라우팅 상태를 초기화하고, 쓰기가 있었던 인증 요청의 사용자를
+    REPLICA_STICKY_SECONDS 동안 primary 로 고정
+    """
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        require_shared_cache(['DATABASE_REPLICAS'])
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = reset_routing_state()
+        response = self.get_response(request)
+        user = getattr(request, 'user', None)
+        if state.wrote and user is not None and user.is_authenticated:
+            stick_to_primary(f'user:{user.pk}')
+        return response
@@ -10,9 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
-from mongoengine import connect
+from mongoengine import register_connection
+from pymongo import monitoring
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -41,16 +43,21 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 
     # Apps
+    'api.core',
     'api.users',
     'api.posts',
 
     # Third-Party
     'rest_framework',
     'rest_framework_simplejwt',
-    'drf_yasg',
 ]
 
 MIDDLEWARE = [
+    'api.core.profiling.ProfilingMiddleware',
+    'api.core.middleware.MetricsMiddleware',
+    'api.core.budgets.QueryBudgetMiddleware',
+    'api.core.concurrency.ConcurrencyLimitMiddleware',
+    'backend.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -95,11 +102,168 @@ DATABASES = {
     },
 }
 
+# MySQL 읽기 복제본 (backend.routers)
+# DATABASES 에 복제본 별칭을 추가하고 DATABASE_REPLICAS 에 나열하면
+# 로그인 사용자 조회와 JWT 인증 사용자 조회를 복제본에서 읽습니다.
+# 쓰기 직후 REPLICA_STICKY_SECONDS 동안은 같은 사용자/이메일을 primary 에서
+# 읽고, 지연이 REPLICA_MAX_LAG_SECONDS 를 넘는 복제본은
+# REPLICA_LAG_CHECK_INTERVAL 초마다 다시 확인할 때까지 건너뜁니다.
+# primary 고정 표시는 캐시에 저장하므로 공유 캐시(CACHES)가 필요합니다.
+#     DATABASES['replica'] = {**DATABASES['default'], 'HOST': 'mysql-replica'}
+#     DATABASE_REPLICAS = ['replica']
+DATABASE_ROUTERS = ['backend.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_STICKY_SECONDS = 10
+REPLICA_MAX_LAG_SECONDS = 5
+REPLICA_LAG_CHECK_INTERVAL = 5
+
 MONGODB_SETTINGS = {
     'db': 'test_db',
     'host': 'mongodb://mongo_user:mongo_password@db_mongo:27017/',
 }
-connect(**MONGODB_SETTINGS)
+
+# 게시글 저장소 백엔드 ('mongo' | 'memory')
+# 'memory' 는 MongoDB 없이 view/직렬화 비용만 측정할 때 사용합니다.
+POSTS_STORAGE_BACKEND = 'mongo'
+
+# /posts/batch 한 번에 조회할 수 있는 최대 게시글 수
+POSTS_BATCH_MAX_IDS = 100
+
+# 게시글 생성 Idempotency-Key
+# 응답은 IDEMPOTENCY_KEY_TTL 초 동안 보관되고, 처리 중 기록은
+# IDEMPOTENCY_LOCK_TIMEOUT 초가 지나면 다음 재시도가 이어받습니다.
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+IDEMPOTENCY_LOCK_TIMEOUT = 30
+
+# 게시글 조회수 flush 주기(초)
+# 상세 조회수는 프로세스 안에서 합산한 뒤 이 주기마다 bulk_write 로 반영합니다.
+POST_VIEW_FLUSH_INTERVAL = 5.0
+
+# 인기 게시글 (/posts/trending)
+# refresh_trending 명령이 최근 TRENDING_WINDOW_HOURS 시간 동안 작성된 게시글의
+# 점수 (views + 1) / (경과 시간 + 2) ** TRENDING_GRAVITY 를 계산해
+# 상위 TRENDING_SIZE 개를 posts_trending 컬렉션에 반영합니다.
+TRENDING_WINDOW_HOURS = 72
+TRENDING_SIZE = 200
+TRENDING_GRAVITY = 1.5
+
+# 태그별 게시글 수 (/posts/tags) 캐시 시간(초)
+TAG_COUNTS_CACHE_SECONDS = 30
+
+# 게시글 수정 이력
+# 리비전 번호가 이 값의 배수일 때만 전체 내용을 저장하고 나머지는 delta 로
+# 저장합니다. 리비전 하나를 복원할 때 읽는 문서 수의 상한이기도 합니다.
+POST_REVISION_SNAPSHOT_INTERVAL = 10
+
+# 오래된 게시글 보관 (archive_posts 명령)
+# 작성 후 POSTS_ARCHIVE_AFTER_DAYS 일이 지난 게시글을 posts_archive 로 옮겨
+# posts 컬렉션과 인덱스를 최근 게시글 크기로 유지합니다.
+# 보관 경계는 캐시에 POSTS_ARCHIVE_WATERMARK_CACHE_SECONDS 초 동안 보관하고,
+# 목록의 posts_archive count 는 보관/삭제 시 바뀌는 보관 경계 문서(MongoDB)의
+# version 별로 POSTS_ARCHIVE_COUNT_CACHE_SECONDS 초 동안 보관합니다.
+POSTS_ARCHIVE_AFTER_DAYS = 180
+POSTS_ARCHIVE_BATCH_SIZE = 1000
+POSTS_ARCHIVE_OPS_PER_SEC = 5
+POSTS_ARCHIVE_WATERMARK_CACHE_SECONDS = 60
+POSTS_ARCHIVE_COUNT_CACHE_SECONDS = 600
+
+# 백그라운드 작업 (api.core.tasks)
+# 감사 로그 등 응답에 필요 없는 작업을 스레드 풀에서 실행합니다.
+# 같은 종류의 작업은 BATCH_WAIT 초 동안 최대 BATCH_SIZE 개까지 모아 한 번에 처리하며,
+# 큐가 가득 차면 요청 스레드에서 바로 실행합니다. WORKERS = 0 이면 항상 바로 실행합니다.
+BACKGROUND_TASK_WORKERS = 2
+BACKGROUND_TASK_QUEUE_SIZE = 1000
+BACKGROUND_TASK_BATCH_SIZE = 100
+BACKGROUND_TASK_BATCH_WAIT = 0.02
+
+# 적응형 동시 처리 제한 (api.core.concurrency, 워커 프로세스별 적용)
+# view 의 load_classes 로 등급을 선언하며, 등급별 한도는 지연 시간이
+# target_ms 를 넘으면 줄고 여유가 있으면 늘어납니다 (initial ~ min/max).
+# share 는 CONCURRENCY_GLOBAL_LIMIT 중 해당 등급이 쓸 수 있는 비율로,
+# 작을수록 부하가 오를 때 먼저 거절됩니다. 초과 요청은 503 + Retry-After.
+# 워커가 동시에 처리하는 요청은 gunicorn 스레드 수를 넘지 않으므로 한도도
+# 스레드 수(gunicorn.conf.py 와 같은 GUNICORN_THREADS)에 맞춥니다.
+# 클라이언트가 보낸 값을 덮어쓰는 프록시 뒤에서만 CONCURRENCY_QUEUE_TIME_HEADER
+# (예: HTTP_X_REQUEST_START)를 설정해 그 시각부터 기다린 시간도 지연 시간에
+# 포함합니다. CONCURRENCY_MAX_QUEUE_SECONDS 보다 긴 값은 무시합니다.
+WORKER_THREADS = int(os.environ.get('GUNICORN_THREADS', 4))
+CONCURRENCY_LIMIT_ENABLED = True
+CONCURRENCY_QUEUE_TIME_HEADER = \
+    os.environ.get('CONCURRENCY_QUEUE_TIME_HEADER') or None
+CONCURRENCY_MAX_QUEUE_SECONDS = 30
+CONCURRENCY_GLOBAL_LIMIT = WORKER_THREADS
+CONCURRENCY_LIMITS = {
+    'auth': {'initial': WORKER_THREADS, 'maximum': WORKER_THREADS,
+             'target_ms': 500, 'share': 1.0},
+    'post_read': {'initial': WORKER_THREADS, 'maximum': WORKER_THREADS,
+                  'target_ms': 200, 'share': 1.0},
+    'post_write': {'initial': WORKER_THREADS, 'maximum': WORKER_THREADS,
+                   'target_ms': 300, 'share': 0.75},
+    'bulk': {'initial': max(WORKER_THREADS // 4, 1),
+             'maximum': max(WORKER_THREADS // 2, 1),
+             'target_ms': 500, 'share': 0.5},
+}
+
+# 탈퇴한 사용자의 게시글 정리 (purge_orphan_posts)
+# 한 번에 CHUNK_SIZE 개씩, 초당 OPS_PER_SEC 회 이하로 삭제합니다.
+ORPHAN_POSTS_CHUNK_SIZE = 1000
+ORPHAN_POSTS_OPS_PER_SEC = 20
+
+# 요청 단위 지표 (/metrics)
+# False 이면 미들웨어와 Mongo 커맨드 리스너가 등록되지 않아 오버헤드가 없습니다.
+METRICS_ENABLED = True
+
+# posts 컬렉션에서 이 시간(ms) 이상 걸린 커맨드를 posts_slow_log 에 기록
+# 기록 중 일부(sample rate)는 explain(executionStats) 결과를 첨부합니다.
+MONGO_SLOW_COMMAND_MS = 100
+MONGO_SLOW_EXPLAIN_SAMPLE_RATE = 0.1
+
+# view 별 DB 호출 예산(query_budgets) 초과를 경고 로그로 기록
+# DEBUG 가 아니어도 True 이면 QueryBudgetMiddleware 가 활성화됩니다.
+QUERY_BUDGET_ENFORCE = False
+
+# 관리자 토큰과 함께 `X-Profile: 1` 헤더(또는 ?_profile=1)를 보낸 요청만
+# cProfile/스택 샘플링으로 실행하고 결과를 PROFILE_DIR 에 저장합니다.
+PROFILING_ENABLED = True
+PROFILE_DIR = BASE_DIR / 'profiles'
+
+# /swagger/ 경로 노출 여부
+# 스키마는 `build_openapi_schema` 로 OPENAPI_SCHEMA_DIR 에 미리 생성해 두고
+# /swagger.json, /swagger.yaml 에서 ETag/Cache-Control 과 함께 제공합니다.
+SWAGGER_ENABLED = True
+OPENAPI_SCHEMA_DIR = BASE_DIR / 'openapi'
+OPENAPI_SCHEMA_MAX_AGE = 60 * 60 * 24
+if SWAGGER_ENABLED:
+    INSTALLED_APPS.append('drf_yasg')
+
+# 리스너는 MongoClient 생성 전에 등록해야 적용됩니다.
+# Mongo 커맨드 집계는 /metrics 와 쿼리 예산 검사에 함께 사용됩니다.
+if METRICS_ENABLED or DEBUG or QUERY_BUDGET_ENFORCE:
+    from api.core.metrics import MongoCommandMetrics
+    monitoring.register(MongoCommandMetrics())
+
+if MONGO_SLOW_COMMAND_MS is not None:
+    from api.posts.slowlog import SlowCommandListener
+    monitoring.register(SlowCommandListener(
+        threshold_ms=MONGO_SLOW_COMMAND_MS,
+        explain_sample_rate=MONGO_SLOW_EXPLAIN_SAMPLE_RATE
+    ))
+
+# 접속 정보만 등록하고 MongoClient 는 첫 쿼리에서 생성합니다.
+# (connect=False: 클라이언트 생성 시에도 첫 커맨드 전까지 연결하지 않음)
+register_connection('default', connect=False, **MONGODB_SETTINGS)
+
+# Cache
+# 토큰 세대 등 워커 간 공유가 필요한 값이 저장되므로 공유 캐시(Redis)를
+# 사용합니다. LocMemCache 등 프로세스 로컬 캐시는 기동 시 거부됩니다.
+# (api.core.checks)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://redis:6379/0'),
+    },
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -121,9 +285,27 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.users.authentication.GenerationJWTAuthentication',
     ),
+    # IP 단위 스로틀은 앞단 프록시 수만큼만 X-Forwarded-For 를 신뢰합니다.
+    # (0 이면 REMOTE_ADDR 만 사용해 클라이언트가 보낸 헤더로 우회할 수 없음)
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    # 스로틀 카운터는 default 캐시에 저장되므로 공유 캐시가 필요합니다.
+    # (스로틀이 켜져 있으면 LocMemCache 등은 기동 시 거부됩니다.)
+    # 현재 값은 /throttle-stats (관리자 전용) 에서 확인할 수 있습니다.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_email': '10/min',
+        'login_ip': '60/min',
+        'post_write_user': '30/min',
+        'post_write': '3000/min',
+    },
 }
+# 벤치마크 대상 서버처럼 한 IP 에서 많은 로그인을 보내는 경우
+# THROTTLES_DISABLED=1 로 실행하면 모든 스로틀을 끕니다. (운영에서는 사용 금지)
+if os.environ.get('THROTTLES_DISABLED') == '1':
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = dict.fromkeys(
+        REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+    )
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
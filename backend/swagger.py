@@ -0,0 +1,153 @@
+"""
+OpenAPI 스키마 / Swagger UI
+
+스키마는 요청마다 생성하지 않고 `build_openapi_schema` 명령(이미지 빌드,
+컨테이너 기동 시 실행)에서 OPENAPI_SCHEMA_DIR 에 JSON/YAML 파일로 만들어 둔
+것을 ETag 와 함께 제공합니다. 서버는 파일이 없을 때만 생성합니다.
+(serializer 필드나 docstring 변경은 URLconf 로 알 수 없으므로 명령은 항상
+다시 생성)
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from django.conf import settings
+from django.http import HttpResponse
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FILES = {
+    'json': ('openapi.json', 'application/json'),
+    'yaml': ('openapi.yaml', 'application/yaml'),
+}
+META_FILE = 'openapi.meta.json'
+
+
+def _api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title='API',
+        default_version='v1',
+        description='API Documentation',
+        terms_of_service='https://www.google.com/policies/terms/',
+        contact=openapi.Contact(email='crane@naver.com'),
+        license=openapi.License(name='BSD License')
+    )
+
+
+def build_schema():
+    """전체 view 를 순회해 {형식: bytes} 스키마 문서를 생성"""
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    schema = OpenAPISchemaGenerator(_api_info()).get_schema(
+        request=None, public=True
+    )
+    return {
+        'json': OpenAPICodecJson(validators=[]).encode(schema),
+        'yaml': OpenAPICodecYaml(validators=[]).encode(schema),
+    }
+
+
+def read_meta(directory):
+    try:
+        return json.loads((Path(directory) / META_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_schema(directory, force=True):
+    """
+    스키마 파일 생성. force 가 아니면 파일이 모두 있을 때 건너뜀
+
+    (생성 여부, 메타 정보) 반환
+    """
+    directory = Path(directory)
+    meta = read_meta(directory)
+    if (not force and meta
+            and all((directory / name).exists()
+                    for name, _ in SCHEMA_FILES.values())):
+        return False, meta
+
+    documents = build_schema()
+    directory.mkdir(parents=True, exist_ok=True)
+    meta = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'etags': {},
+    }
+    for fmt, body in documents.items():
+        name, _ = SCHEMA_FILES[fmt]
+        _atomic_write(directory / name, body)
+        meta['etags'][fmt] = hashlib.sha256(body).hexdigest()[:32]
+    _atomic_write(directory / META_FILE, json.dumps(meta).encode())
+    return True, meta
+
+
+def _atomic_write(path, body):
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+
+@lru_cache(maxsize=None)
+def load_schema():
+    """프로세스당 한 번 스키마 파일을 읽어 {형식: (bytes, etag)} 반환"""
+    directory = Path(settings.OPENAPI_SCHEMA_DIR)
+    written, meta = write_schema(directory, force=False)
+    if written:
+        logger.warning('OpenAPI 스키마 파일이 없어 생성했습니다: %s',
+                       directory)
+    return {
+        fmt: ((directory / name).read_bytes(), meta['etags'][fmt])
+        for fmt, (name, _) in SCHEMA_FILES.items()
+    }
+
+
+def _schema_etag(request, fmt):
+    return load_schema()[fmt][1]
+
+
+@require_GET
+@condition(etag_func=_schema_etag)
+def schema_file_view(request, fmt):
+    body, _ = load_schema()[fmt]
+    response = HttpResponse(body, content_type=SCHEMA_FILES[fmt][1])
+    patch_cache_control(response, public=True,
+                        max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+    return response
+
+
+_SWAGGER_UI = '''<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>API</title>
+  <link rel="stylesheet" href="{css}">
+</head>
+<body>
+  <div id="swagger-ui"></div>
+  <script src="{js}"></script>
+  <script>SwaggerUIBundle({{url: "{url}", dom_id: "#swagger-ui"}});</script>
+</body>
+</html>
+'''
+
+
+@require_GET
+def swagger_view(request):
+    response = HttpResponse(_SWAGGER_UI.format(
+        css=static('drf-yasg/swagger-ui-dist/swagger-ui.css'),
+        js=static('drf-yasg/swagger-ui-dist/swagger-ui-bundle.js'),
+        url=reverse('schema-file', kwargs={'fmt': 'json'}),
+    ))
+    patch_cache_control(response, public=True,
+                        max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+    return response
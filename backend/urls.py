@@ -14,30 +14,22 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title='API',
-        default_version='v1',
-        description='API Documentation',
-        terms_of_service='https://www.google.com/policies/terms/',
-        contact=openapi.Contact(email='crane@naver.com'),
-        license=openapi.License(name='BSD License')
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,)
-)
+from django.urls import path, re_path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('users/', include('api.users.urls')),
     path('posts/', include('api.posts.urls')),
-    path('swagger/',
-         schema_view.with_ui('swagger', cache_timeout=0),
-         name='schema-swagger-ui'),
+    path('', include('api.core.urls')),
 ]
+
+if settings.SWAGGER_ENABLED:
+    from backend.swagger import schema_file_view, swagger_view
+
+    urlpatterns += [
+        re_path(r'^swagger\.(?P<fmt>json|yaml)$', schema_file_view,
+                name='schema-file'),
+        path('swagger/', swagger_view, name='schema-swagger-ui'),
+    ]
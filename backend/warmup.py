@@ -0,0 +1,89 @@
+"""
+워커가 트래픽을 받기 전에 실행하는 워밍업
+
+- prime_application: 공유 캐시 설정 검사, URL 해석, view 모듈 import,
+  JWT 키/알고리즘 준비, OpenAPI 스키마 파일 로드
+  (preload_app 사용 시 마스터에서 한 번 실행해 워커가 공유)
+- reset_connections: fork 전에 열린 DB 연결/클라이언트 정리 (워커에서)
+- prime_connections: MySQL 연결과 Mongo 커넥션 풀 생성 (워커에서)
+"""
+import logging
+import time
+from django.urls import get_resolver, URLPattern, URLResolver
+
+logger = logging.getLogger(__name__)
+
+
+def iter_routes(patterns, prefix=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns,
+                                   prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix + str(pattern.pattern), pattern
+
+
+def prime_application():
+    start = time.perf_counter()
+    # gunicorn 은 시스템 검사를 실행하지 않으므로 여기서 확인
+    from api.core.checks import require_shared_cache
+
+    require_shared_cache()
+
+    resolver = get_resolver()
+    # reverse 용 사전과 모든 하위 URLconf/view 모듈을 미리 로드
+    resolver.reverse_dict
+    routes = list(iter_routes(resolver.url_patterns))
+    for _, pattern in routes:
+        pattern.callback
+
+    # JWT 설정 로드와 서명/검증 경로를 한 번 실행
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    token = AccessToken()
+    token['user_id'] = 0
+    AccessToken(str(token))
+
+    # 미리 생성된 OpenAPI 스키마 파일을 읽어 둠 (파일이 없을 때만 생성하며,
+    # 배포 시 build_openapi_schema 가 항상 다시 생성)
+    from django.conf import settings
+
+    if settings.SWAGGER_ENABLED:
+        from backend.swagger import load_schema
+
+        load_schema()
+
+    logger.info('application warmup: %d routes, %.1fms', len(routes),
+                (time.perf_counter() - start) * 1000)
+
+
+def reset_connections():
+    """fork 이전에 만들어진 연결은 프로세스 간에 공유되면 안 되므로 정리"""
+    from django.db import connections
+    from mongoengine.connection import disconnect_all
+
+    for connection in connections.all():
+        connection.close()
+    disconnect_all()
+
+
+def prime_connections():
+    from django.conf import settings
+    from django.db import connections
+    from mongoengine import connect
+    from mongoengine.connection import get_db
+
+    start = time.perf_counter()
+    for connection in connections.all():
+        connection.ensure_connection()
+
+    connect(**settings.MONGODB_SETTINGS)
+    get_db().command('ping')
+
+    logger.info('connection warmup: %.1fms',
+                (time.perf_counter() - start) * 1000)
+
+
+def warmup():
+    prime_application()
+    prime_connections()
@@ -0,0 +1,64 @@
+"""
+운영 서버 설정
+
+    gunicorn -c gunicorn.conf.py backend.wsgi:application
+
+모든 값은 환경 변수로 조정할 수 있습니다.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = _env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 4)
+worker_class = 'gthread'
+
+# 마스터에서 앱을 한 번 로드하고 fork 해 워커 기동 시간과 메모리를 줄임
+preload_app = True
+
+# 메모리 누수/단편화 방지를 위해 N 요청마다 워커 재시작
+# (모든 워커가 동시에 재시작하지 않도록 jitter 적용)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 5000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 500)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    # preload 된 앱의 URL 해석/JWT 준비를 마스터에서 한 번 수행
+    from backend.warmup import prime_application
+
+    prime_application()
+
+
+def post_fork(server, worker):
+    # MongoClient/MySQL 연결은 fork-safe 하지 않으므로 워커마다 새로 생성
+    from backend.warmup import reset_connections
+
+    reset_connections()
+
+
+def post_worker_init(worker):
+    # 트래픽을 받기 전에 워커의 DB 연결과 커넥션 풀을 준비
+    from backend.warmup import prime_connections
+
+    prime_connections()
+
+
+def worker_exit(server, worker):
+    # 아직 반영되지 않은 게시글 조회수와 백그라운드 작업 처리
+    from api.core.tasks import background
+    from api.posts.counters import view_counter
+
+    view_counter.stop()
+    background.shutdown(timeout=graceful_timeout)